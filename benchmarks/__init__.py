@@ -0,0 +1 @@
+"""Benchmark suite and synthetic site generator for Engrave."""
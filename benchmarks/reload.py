@@ -0,0 +1,329 @@
+"""Measure edit-to-reload latency through the live preview pipeline.
+
+Usage
+-----
+    python -m benchmarks.reload --pages 200 --repeat 10 --output reload.json
+
+The harness generates a synthetic site, builds it, starts the FastAPI app from
+``server.create_fastapi`` under an in-process Uvicorn server, connects an SSE
+client to the live-reload endpoint, and then performs scripted edits:
+
+- ``html``: rewrite one public page.
+- ``layout``: rewrite the base layout shared by every page.
+- ``markdown``: rewrite one shared Markdown include.
+- ``asset``: rewrite one copied asset.
+
+For each edit it records four timestamps and reports the stages between them:
+
+- ``detect``: file write until ``watchfiles.awatch`` yields the batch
+  (debounce and filesystem notification).
+- ``process``: batch yield until ``server.publish_queue_put`` is called
+  (``core.watch.run`` processing and ``watch_to_queue`` serialization).
+- ``deliver``: publish until the SSE client parses the ``change`` event.
+- ``total``: file write until the SSE client parses the event.
+
+Every stage reports ``p50``/``p95``/``p99`` seconds.
+"""
+
+# lib: built-in
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Dict, List
+from unittest.mock import patch
+
+# lib: external
+import httpx
+import uvicorn
+
+# lib: local
+from engrave import server
+from engrave.core import watch
+from engrave.core.build import run as build_run
+from engrave.core.deps import DependencyIndex
+from engrave.util.dataclass import ServerConfig
+
+from .run import percentile
+from .sitegen import ASSET_COPY_REGEX, SiteInfo, SiteShape, generate_site
+
+
+EDITS = ["html", "layout", "markdown", "asset"]
+STAGES = ["detect", "process", "deliver", "total"]
+
+
+@dataclass
+class Timeline:
+    """Timestamps captured by the instrumented watch and publish hooks."""
+
+    detected: List[float] = field(default_factory=list)
+    published: List[float] = field(default_factory=list)
+
+    def first_after(self, name: str, start: float) -> float | None:
+        for stamp in getattr(self, name):
+            if stamp >= start:
+                return stamp
+        return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def edit_path(site: SiteInfo, edit: str) -> Path:
+    if edit == "html":
+        return site.dir_src / site.pages[0]
+    if edit == "layout":
+        return site.dir_src / site.layouts[0]
+    if edit == "markdown":
+        return site.dir_src / site.markdown[0]
+    if edit == "asset":
+        return site.dir_src / site.assets[0]
+    raise ValueError(f"Unknown edit kind: {edit}")
+
+
+def apply_edit(path: Path, index: int) -> None:
+    if path.suffix == ".bin":
+        path.write_bytes(path.read_bytes()[:-8] + index.to_bytes(8, "big"))
+        return
+    text = path.read_text(encoding="utf-8")
+    marker = "\n<!-- reload-edit -->" if path.suffix == ".html" else "\n\nreload-edit"
+    text = text.split(marker)[0]
+    path.write_text(f"{text}{marker} {index}\n", encoding="utf-8")
+
+
+def summarize_stage(samples: List[float]) -> Dict[str, float]:
+    return {
+        "runs": len(samples),
+        "p50": percentile(samples, 0.50),
+        "p95": percentile(samples, 0.95),
+        "p99": percentile(samples, 0.99),
+    }
+
+
+async def read_events(response: httpx.Response, events: asyncio.Queue) -> None:
+    event_name = None
+    async for line in response.aiter_lines():
+        if line.startswith("event:"):
+            event_name = line.partition(":")[2].strip()
+        elif line.startswith("data:") and event_name == "change":
+            payload = json.loads(line.partition(":")[2])
+            await events.put((time.perf_counter(), payload))
+        elif not line:
+            event_name = None
+
+
+async def measure_edits(
+    site: SiteInfo,
+    server_config: ServerConfig,
+    timeline: Timeline,
+    samples: Dict[str, Dict[str, List[float]]],
+    edits: List[str],
+    repeat: int,
+    settle: float,
+    timeout: float,
+) -> None:
+    events: asyncio.Queue = asyncio.Queue()
+    url = f"http://{server_config.host}:{server_config.port}{server_config.sse_url}"
+    async with httpx.AsyncClient(timeout=None) as client:
+        async with client.stream("GET", url) as response:
+            task_reader = asyncio.create_task(read_events(response, events))
+            try:
+                while not server.set_queue_clients:
+                    await asyncio.sleep(0.01)
+                # Let the watchers finish their initial directory scan.
+                await asyncio.sleep(settle)
+
+                for edit in edits:
+                    path = edit_path(site, edit)
+                    for index in range(repeat):
+                        while not events.empty():
+                            events.get_nowait()
+                        time_edit = time.perf_counter()
+                        apply_edit(path, index)
+                        time_received, _payload = await asyncio.wait_for(
+                            events.get(), timeout=timeout
+                        )
+                        time_detected = timeline.first_after("detected", time_edit)
+                        time_published = timeline.first_after("published", time_edit)
+                        stage_samples = samples[edit]
+                        stage_samples["total"].append(time_received - time_edit)
+                        if time_detected is not None and time_published is not None:
+                            stage_samples["detect"].append(time_detected - time_edit)
+                            stage_samples["process"].append(
+                                time_published - time_detected
+                            )
+                            stage_samples["deliver"].append(
+                                time_received - time_published
+                            )
+                        await asyncio.sleep(settle)
+            finally:
+                task_reader.cancel()
+                try:
+                    await task_reader
+                except (asyncio.CancelledError, httpx.HTTPError):
+                    pass
+
+
+async def measure_reload(
+    site: SiteInfo,
+    server_config: ServerConfig,
+    dependency_index: DependencyIndex,
+    edits: List[str],
+    repeat: int,
+    settle: float,
+    timeout: float,
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    timeline = Timeline()
+    awatch_original = watch.awatch
+    publish_original = server.publish_queue_put
+
+    def timed_awatch(*args, **kw):
+        async def gen():
+            async for changes in awatch_original(*args, **kw):
+                timeline.detected.append(time.perf_counter())
+                yield changes
+
+        return gen()
+
+    async def timed_publish(data, set_queue_clients):
+        timeline.published.append(time.perf_counter())
+        await publish_original(data, set_queue_clients)
+
+    samples: Dict[str, Dict[str, List[float]]] = {
+        edit: {stage: [] for stage in STAGES} for edit in edits
+    }
+
+    with (
+        patch.object(watch, "awatch", timed_awatch),
+        patch.object(server, "publish_queue_put", timed_publish),
+    ):
+        uvicorn_server = uvicorn.Server(
+            uvicorn.Config(
+                server.create_fastapi(server_config, dependency_index=dependency_index),
+                host=server_config.host,
+                port=server_config.port,
+                log_level="warning",
+            )
+        )
+        task_server = asyncio.create_task(uvicorn_server.serve())
+        try:
+            while not uvicorn_server.started:
+                await asyncio.sleep(0.01)
+            await measure_edits(
+                site, server_config, timeline, samples, edits, repeat, settle, timeout
+            )
+        finally:
+            uvicorn_server.should_exit = True
+            await task_server
+
+    return {
+        edit: {
+            stage: summarize_stage(stage_samples)
+            for stage, stage_samples in samples[edit].items()
+            if stage_samples
+        }
+        for edit in edits
+    }
+
+
+def run(
+    shape: SiteShape,
+    edits: List[str],
+    repeat: int,
+    settle: float = 0.5,
+    timeout: float = 30.0,
+) -> Dict[str, object]:
+    """Run the edit-to-reload harness and return a JSON-serializable report.
+
+    Parameters
+    ----------
+    shape : SiteShape
+        Synthetic site dimensions.
+    edits : list of str
+        Edit kinds to perform, in order.
+    repeat : int
+        Number of edits per kind.
+    settle : float, optional
+        Seconds to wait between edits so batches do not overlap.
+    timeout : float, optional
+        Seconds to wait for an SSE event before failing.
+    """
+    cwd = Path.cwd()
+    dir_root = Path(tempfile.mkdtemp(prefix="engrave-reload-"))
+    try:
+        # ``watch_add`` watchers observe the working directory; keep it small.
+        os.chdir(dir_root)
+        site = generate_site(dir_root / "src", shape)
+        server_config = ServerConfig(
+            dir_src=str(site.dir_src),
+            dir_dest=str(dir_root / "dist"),
+            copy=[ASSET_COPY_REGEX],
+            port=free_port(),
+        )
+        dependency_index = build_run(server_config)
+        results = asyncio.run(
+            measure_reload(
+                site, server_config, dependency_index, edits, repeat, settle, timeout
+            )
+        )
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(dir_root, ignore_errors=True)
+
+    return {
+        "shape": asdict(shape),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for shape_field in fields(SiteShape):
+        parser.add_argument(
+            f"--{shape_field.name.replace('_', '-')}",
+            type=int,
+            default=50 if shape_field.name == "pages" else shape_field.default,
+        )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--edit",
+        action="append",
+        choices=EDITS,
+        help="Edit kind to perform; repeatable. Defaults to all edit kinds.",
+    )
+    parser.add_argument("--settle", type=float, default=0.5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Write JSON results to this file.")
+    args = parser.parse_args(argv)
+
+    shape = SiteShape(
+        **{shape_field.name: getattr(args, shape_field.name) for shape_field in fields(SiteShape)}
+    )
+    report = run(
+        shape,
+        edits=args.edit or EDITS,
+        repeat=args.repeat,
+        settle=args.settle,
+        timeout=args.timeout,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
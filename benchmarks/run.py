@@ -0,0 +1,249 @@
+"""Run Engrave benchmarks against a synthetic site and emit JSON results.
+
+Usage
+-----
+    python -m benchmarks.run --pages 2000 --repeat 5 --output bench.json
+
+Measured scenarios:
+
+- ``full_build``: ``core.build.run`` into an empty destination directory.
+- ``noop_rebuild``: ``core.build.run`` again over an unchanged source tree.
+- ``markdown_edit``: one shared Markdown include is modified and the change is
+  fed to ``core.watch.handle_async_list_build_change`` until its batch is
+  yielded.
+- ``server_request``: ``GET`` latency of page requests against
+  ``server.create_fastapi`` without starting the background watcher.
+
+Every scenario reports ``min``/``median``/``mean``/``p95``/``max`` seconds over
+``--repeat`` runs so results can be tracked across releases.
+"""
+
+# lib: built-in
+import argparse
+import asyncio
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, fields
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Dict, List
+
+# lib: external
+from watchfiles import Change
+
+# lib: local
+from engrave.core.build import run as build_run
+from engrave.core.deps import DependencyIndex
+from engrave.core.watch import handle_async_list_build_change
+from engrave.util.dataclass import BuildConfig, WatchConfig
+
+from .sitegen import ASSET_COPY_REGEX, SiteInfo, SiteShape, generate_site
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize timing samples in seconds."""
+    return {
+        "runs": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "p95": percentile(samples, 0.95),
+        "max": max(samples),
+    }
+
+
+def measure(func: Callable[[], object], repeat: int) -> List[float]:
+    """Time ``func`` ``repeat`` times with ``time.perf_counter``."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_full_build(build_config: BuildConfig, repeat: int) -> List[float]:
+    dir_dest = Path(build_config.dir_dest)
+
+    def full_build():
+        shutil.rmtree(dir_dest, ignore_errors=True)
+        build_run(build_config)
+
+    return measure(full_build, repeat)
+
+
+def bench_noop_rebuild(build_config: BuildConfig, repeat: int) -> List[float]:
+    build_run(build_config)
+    return measure(lambda: build_run(build_config), repeat)
+
+
+def bench_markdown_edit(
+    watch_config: WatchConfig,
+    site: SiteInfo,
+    dependency_index: DependencyIndex,
+    repeat: int,
+) -> List[float]:
+    path_markdown = (site.dir_src / site.markdown[0]).resolve()
+    original = path_markdown.read_text(encoding="utf-8")
+
+    async def one_change():
+        yield {(Change.modified, str(path_markdown))}
+
+    async def markdown_edit() -> List[float]:
+        samples = []
+        for index in range(repeat):
+            path_markdown.write_text(f"{original}\nEdit {index}\n", encoding="utf-8")
+            start = time.perf_counter()
+            async for _batch in handle_async_list_build_change(
+                watch_config, one_change(), dependency_index
+            ):
+                pass
+            samples.append(time.perf_counter() - start)
+        path_markdown.write_text(original, encoding="utf-8")
+        return samples
+
+    return asyncio.run(markdown_edit())
+
+
+def bench_server_request(
+    watch_config: WatchConfig,
+    site: SiteInfo,
+    repeat: int,
+) -> List[float]:
+    # lib: external
+    from fastapi.testclient import TestClient
+
+    # lib: local
+    from engrave.server import create_fastapi
+    from engrave.util.dataclass import ServerConfig
+
+    server_config = ServerConfig(
+        dir_src=watch_config.dir_src,
+        dir_dest=watch_config.dir_dest,
+        copy=watch_config.copy,
+    )
+    # Without entering the client context the lifespan watcher never starts.
+    client = TestClient(create_fastapi(server_config))
+    pages = [path.as_posix() for path in site.pages[: max(1, min(10, len(site.pages)))]]
+
+    def request_pages():
+        for page in pages:
+            response = client.get(f"/{page}")
+            response.raise_for_status()
+
+    return [sample / len(pages) for sample in measure(request_pages, repeat)]
+
+
+def run(shape: SiteShape, repeat: int, scenarios: List[str]) -> Dict[str, object]:
+    """Generate a site for ``shape`` and run the selected scenarios.
+
+    Parameters
+    ----------
+    shape : SiteShape
+        Synthetic site dimensions.
+    repeat : int
+        Number of timed runs per scenario.
+    scenarios : list of str
+        Scenario names to run, in order.
+
+    Returns
+    -------
+    dict
+        JSON-serializable benchmark report.
+    """
+    dir_root = Path(tempfile.mkdtemp(prefix="engrave-bench-"))
+    try:
+        site = generate_site(dir_root / "src", shape)
+        build_config = BuildConfig(
+            dir_src=str(site.dir_src),
+            dir_dest=str(dir_root / "dist"),
+            copy=[ASSET_COPY_REGEX],
+        )
+        watch_config = WatchConfig(
+            dir_src=build_config.dir_src,
+            dir_dest=build_config.dir_dest,
+            copy=build_config.copy,
+        )
+        results: Dict[str, Dict[str, float]] = {}
+
+        for scenario in scenarios:
+            if scenario == "full_build":
+                samples = bench_full_build(build_config, repeat)
+            elif scenario == "noop_rebuild":
+                samples = bench_noop_rebuild(build_config, repeat)
+            elif scenario == "markdown_edit":
+                dependency_index = build_run(build_config)
+                samples = bench_markdown_edit(
+                    watch_config, site, dependency_index, repeat
+                )
+            elif scenario == "server_request":
+                samples = bench_server_request(watch_config, site, repeat)
+            else:
+                raise ValueError(f"Unknown benchmark scenario: {scenario}")
+            results[scenario] = summarize(samples)
+    finally:
+        shutil.rmtree(dir_root, ignore_errors=True)
+
+    try:
+        engrave_version = version("engrave")
+    except PackageNotFoundError:
+        engrave_version = "unknown"
+
+    return {
+        "engrave_version": engrave_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "shape": asdict(shape),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+SCENARIOS = ["full_build", "noop_rebuild", "markdown_edit", "server_request"]
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for shape_field in fields(SiteShape):
+        parser.add_argument(
+            f"--{shape_field.name.replace('_', '-')}",
+            type=int,
+            default=shape_field.default,
+        )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIOS,
+        help="Scenario to run; repeatable. Defaults to all scenarios.",
+    )
+    parser.add_argument("--output", help="Write JSON results to this file.")
+    args = parser.parse_args(argv)
+
+    shape = SiteShape(
+        **{shape_field.name: getattr(args, shape_field.name) for shape_field in fields(SiteShape)}
+    )
+    report = run(shape, repeat=args.repeat, scenarios=args.scenario or SCENARIOS)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Synthetic site generator for Engrave benchmarks.
+
+``generate_site()`` writes a deterministic source tree whose shape is described
+by ``SiteShape``:
+
+- ``_layouts/layout_<n>.html``: a chain of ``layout_depth`` layouts where each
+  layout extends the previous one and adds a block.
+- ``_partials/partial_<n>.html``: partials included by every page.
+- ``_shared/shared_<n>.md``: Markdown includes shared across pages; page
+  ``n`` includes ``markdown_per_page`` consecutive includes starting at ``n``.
+- ``section_<n>/page_<n>.html``: public pages spread over ``sections``
+  directories, each extending the deepest layout.
+- ``assets/asset_<n>.bin``: binary assets of ``asset_size`` bytes, matched by
+  ``ASSET_COPY_REGEX``.
+"""
+
+# lib: built-in
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+
+ASSET_COPY_REGEX = r"assets/.*"
+
+
+@dataclass
+class SiteShape:
+    """Shape of a synthetic site."""
+
+    pages: int = 200
+    sections: int = 10
+    layout_depth: int = 3
+    partials: int = 5
+    markdown_includes: int = 20
+    markdown_per_page: int = 2
+    assets: int = 50
+    asset_size: int = 4096
+    seed: int = 0
+
+
+@dataclass
+class SiteInfo:
+    """Paths of a generated site."""
+
+    dir_src: Path
+    pages: List[Path] = field(default_factory=list)
+    layouts: List[Path] = field(default_factory=list)
+    partials: List[Path] = field(default_factory=list)
+    markdown: List[Path] = field(default_factory=list)
+    assets: List[Path] = field(default_factory=list)
+
+
+def _write(path: Path, content: str | bytes) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content, encoding="utf-8")
+    return path
+
+
+def generate_site(dir_src: str | Path, shape: SiteShape | None = None) -> SiteInfo:
+    """Write a synthetic site into ``dir_src``.
+
+    Parameters
+    ----------
+    dir_src : str or pathlib.Path
+        Directory to populate. Created when missing.
+    shape : SiteShape, optional
+        Site dimensions. Defaults to ``SiteShape()``.
+
+    Returns
+    -------
+    SiteInfo
+        Source-relative paths of every generated file, grouped by kind.
+    """
+    if shape is None:
+        shape = SiteShape()
+    dir_src = Path(dir_src)
+    rng = random.Random(shape.seed)
+    info = SiteInfo(dir_src=dir_src)
+
+    for index in range(max(shape.layout_depth, 1)):
+        path_rel = Path("_layouts") / f"layout_{index}.html"
+        if index == 0:
+            content = (
+                "<!DOCTYPE html>\n<html>\n<head><title>{% block title %}"
+                "{% endblock %}</title></head>\n<body>\n"
+                "{% block layout_0 %}{% endblock %}\n</body>\n</html>\n"
+            )
+        else:
+            content = (
+                f'{{% extends "_layouts/layout_{index - 1}.html" %}}\n'
+                f"{{% block layout_{index - 1} %}}<div class=\"layer-{index}\">\n"
+                f"{{% block layout_{index} %}}{{% endblock %}}\n</div>{{% endblock %}}\n"
+            )
+        info.layouts.append(path_rel)
+        _write(dir_src / path_rel, content)
+
+    for index in range(shape.partials):
+        path_rel = Path("_partials") / f"partial_{index}.html"
+        items = "".join(
+            f'<li><a href="/section_{n}/">Section {n}</a></li>'
+            for n in range(shape.sections)
+        )
+        info.partials.append(path_rel)
+        _write(dir_src / path_rel, f'<nav class="partial-{index}"><ul>{items}</ul></nav>\n')
+
+    for index in range(shape.markdown_includes):
+        path_rel = Path("_shared") / f"shared_{index}.md"
+        paragraphs = "\n\n".join(
+            f"Paragraph {n} of shared include {index} with **bold** and `code`."
+            for n in range(10)
+        )
+        info.markdown.append(path_rel)
+        _write(dir_src / path_rel, f"# Shared {index}\n\n{paragraphs}\n")
+
+    layout_last = f"layout_{max(shape.layout_depth, 1) - 1}"
+    for index in range(shape.pages):
+        path_rel = Path(f"section_{index % max(shape.sections, 1)}") / f"page_{index}.html"
+        includes = "".join(
+            f'{{% include "_partials/partial_{n}.html" %}}\n' for n in range(shape.partials)
+        )
+        markdown_calls = ""
+        if shape.markdown_includes:
+            markdown_calls = "".join(
+                '{{ markdown("../_shared/shared_%d.md") }}\n'
+                % ((index + offset) % shape.markdown_includes)
+                for offset in range(shape.markdown_per_page)
+            )
+        content = (
+            f'{{% extends "_layouts/{layout_last}.html" %}}\n'
+            f"{{% block title %}}Page {index}{{% endblock %}}\n"
+            f"{{% block {layout_last} %}}\n{includes}<article>\n{markdown_calls}"
+            f"</article>\n{{% endblock %}}\n"
+        )
+        info.pages.append(path_rel)
+        _write(dir_src / path_rel, content)
+
+    for index in range(shape.assets):
+        path_rel = Path("assets") / f"asset_{index}.bin"
+        info.assets.append(path_rel)
+        _write(dir_src / path_rel, rng.randbytes(shape.asset_size))
+
+    return info
@@ -1,13 +1,27 @@
 # lib: built-in
 from pathlib import Path
 from glob import iglob
+from typing import Literal
 import re
 import logging
 
 # lib: local
 from ..util import process
+from ..util.archive import ArchiveWriter
 from ..util.dataclass import BuildConfig, FileProcessInfo
+from ..util.log import ProgressReporter
+from ..util.profile import profiler
 from .deps import DependencyIndex
+from .manifest import (
+    GENERATED_SEARCH_INDEX,
+    GENERATED_SITEMAP,
+    OutputManifest,
+    OutputRecord,
+    diff_manifests,
+    get_manifest_path,
+    make_output_record,
+)
+from .shard import Shard, in_shard
 
 
 logger = logging.getLogger(__name__)
@@ -16,6 +30,9 @@ logger = logging.getLogger(__name__)
 def run(
     build_config: BuildConfig,
     dependency_index: DependencyIndex | None = None,
+    *,
+    manifest: OutputManifest | None = None,
+    shard: Shard | None = None,
 ) -> DependencyIndex:
     """
     Build files from the source directory into the destination directory.
@@ -28,53 +45,411 @@ def run(
     dependency_index : DependencyIndex, optional
         In-memory HTML/Markdown dependency graph to update while rendering HTML
         files. When omitted, a fresh dependency index is created.
+    manifest : OutputManifest, optional
+        Output manifest updated with the files written for each source path.
+        It is also saved to ``build_config.manifest_file`` (by default
+        ``.<dest>.engrave-manifest.json`` next to the destination directory,
+        so it is not deployed with the site).
+    shard : tuple of int, optional
+        One-based ``(index, count)`` shard to build. Only source paths whose
+        stable hash maps to ``index`` are processed, so ``count`` builds with
+        distinct indexes together cover the whole site exactly once.
 
     Returns
     -------
     DependencyIndex
         The dependency index updated while rendering HTML files.
+
+    Notes
+    -----
+    Sources recorded in the previous manifest that produced no output in this
+    build are orphans. With ``build_config.prune`` their outputs are deleted
+    (and emptied directories pruned) using the manifest alone, without walking
+    ``dir_dest``; otherwise their entries are kept so a later ``--prune`` run
+    still finds them.
+
+    With ``build_config.changes_file`` the outputs added, modified (by digest),
+    and deleted by this build are written as JSON, computed from the manifest
+    records instead of re-hashing ``dir_dest``.
+
+    With ``build_config.archive``, ``dir_dest`` names a ``.tar``, ``.tar.gz``
+    or ``.zip`` file that pages and assets are streamed into, in sorted path
+    order with fixed timestamps; no output tree, manifest, or change set is
+    written.
+
+    With ``build_config.search_index``, the text of every rendered page is
+    indexed and a sharded search index is written below ``dir_dest`` (or into
+    the archive), recorded in the manifest under the ``:search-index``
+    pseudo-source.
+
+    With ``build_config.site_url``, ``sitemap.xml`` (chunked beyond 50,000
+    pages) and the Atom feeds of ``build_config.feed`` directories are written
+    from the pages rendered by this build. They are recorded in the manifest
+    under the ``:sitemap`` pseudo-source, so the change set lists them, and
+    a feed no longer configured is deleted.
+
+    With ``build_config.check_links``, internal links of every output page
+    are checked across a process pool once the build finished.
+
+    Images matching ``build_config.image`` are collected during the scan and
+    their resized variants written before any page is rendered, generating
+    variants missing from ``build_config.image_cache`` across a process pool,
+    so ``srcset()`` sees every image. Their originals are copied only when
+    they also match ``build_config.copy``.
+
+    The pages found by the scan are indexed for the ``collection()`` template
+    global, whose front matter is read when a page first lists them.
     """
     if dependency_index is None:
         dependency_index = DependencyIndex()
+    if manifest is None:
+        manifest = OutputManifest()
 
     dir_src = Path(build_config.dir_src)
     dir_dest = Path(build_config.dir_dest)
 
-    # Create destination directory if it doesn't exist
-    dir_dest.mkdir(parents=True, exist_ok=True)
-    logger.info(f"Looking for files in: {dir_src}/")
-    logger.info(f"Output directory: {dir_dest}/")
+    logger.info("Looking for files in: %s/", dir_src)
+    if not build_config.archive:
+        # Create destination directory if it doesn't exist
+        dir_dest.mkdir(parents=True, exist_ok=True)
+        logger.info("Output directory: %s/", dir_dest)
+    else:
+        logger.info("Output archive: %s", dir_dest)
+        if build_config.prune or build_config.changes_file is not None:
+            logger.warning("--prune and --changes-file are ignored with --archive")
 
     list_copy_regex = [re.compile(regex) for regex in build_config.copy]
+    list_image_regex = [re.compile(regex) for regex in build_config.image]
     list_exclude_regex = [re.compile(regex) for regex in build_config.exclude]
+    render_options = process.get_render_options(build_config)
+    search_index = render_options["search_index"]
+    sitemap = render_options["sitemap"]
+    if shard is not None and (search_index is not None or sitemap is not None):
+        # A shard sees only part of the site; its index would be partial.
+        logger.warning("--search-index and --site-url are ignored with --shard")
+        search_index = render_options["search_index"] = None
+        sitemap = render_options["sitemap"] = None
+    # Pages are checked in one parallel pass after the build, not one by one.
+    link_checker = render_options["link_checker"]
+    render_options["link_checker"] = None
+    if link_checker is not None and (shard is not None or build_config.archive):
+        logger.warning("--check-links is ignored with --shard and --archive")
+        link_checker = None
+    if search_index is not None:
+        search_index.clear()
+    if sitemap is not None:
+        sitemap.clear()
+    elif build_config.feed:
+        logger.warning("--feed is ignored without --site-url")
+    path_manifest = get_manifest_path(dir_dest, build_config.manifest_file)
+    manifest_previous = (
+        OutputManifest() if build_config.archive else OutputManifest.load(path_manifest)
+    )
 
-    gen_path = (Path(path) for path in iglob(str(dir_src / "**/*"), recursive=True))
+    list_path = sorted(
+        (
+            path
+            for path in (Path(path) for path in iglob(str(dir_src / "**/*"), recursive=True))
+            if path.is_file() and in_shard(path.relative_to(dir_src), shard)
+        ),
+        key=lambda path: path.relative_to(dir_src).as_posix(),
+    )
+    if shard is not None:
+        logger.info("Building shard %d/%d: %d file(s)", *shard, len(list_path))
+    progress = ProgressReporter(len(list_path), logger=logger)
 
-    for path in gen_path:
-        if not path.is_file():
-            continue
+    collection_index = render_options["collection_index"]
+    if shard is None:
+        collection_index.reset(path.relative_to(dir_src) for path in list_path)
+    else:
+        # Collections list pages of every shard.
+        collection_index.invalidate()
 
-        path_rel = path.relative_to(dir_src)
-        file_process_info = FileProcessInfo(
-            path=path, dir_src=dir_src, dir_dest=dir_dest
+    list_image = [
+        path.relative_to(dir_src)
+        for path in list_path
+        if process.should_process_image(
+            path=path.relative_to(dir_src),
+            list_image_regex=list_image_regex,
+            list_exclude_regex=list_exclude_regex,
         )
+    ]
+    dict_image_output: dict[Path, list[Path]] = {}
 
-        if process.should_build_html(
-            path=path_rel,
-            list_exclude_regex=list_exclude_regex,
-        ):
-            logger.info(f"Processing HTML file: {file_process_info.path}")
-            dependencies = process.build_html(file_process_info)
-            dependency_index.update_html(path_rel, dependencies)
+    archive = ArchiveWriter(dir_dest) if build_config.archive else None
+    try:
+        if list_image:
+            with profiler.span("images", "image"):
+                dict_image_output = render_options["image_processor"].run(
+                    dir_src,
+                    dir_dest,
+                    list_image,
+                    workers=build_config.image_workers,
+                    archive=archive,
+                )
+            if archive is None:
+                for path_rel, list_output in dict_image_output.items():
+                    record_outputs(
+                        manifest,
+                        manifest_previous,
+                        dir_src,
+                        dir_dest,
+                        path_rel,
+                        "image",
+                        list_output,
+                    )
+            logger.info("Image variants written for %d image(s)", len(list_image))
+
+        for path in list_path:
+            path_rel = path.relative_to(dir_src)
+            file_process_info = FileProcessInfo(
+                path=path, dir_src=dir_src, dir_dest=dir_dest
+            )
+
+            if process.should_build_html(
+                path=path_rel,
+                list_exclude_regex=list_exclude_regex,
+            ):
+                logger.debug("Processing HTML file: %s", file_process_info.path)
+                with profiler.span(path_rel.as_posix(), "page"):
+                    dependencies = process.build_html(
+                        file_process_info, **render_options, archive=archive
+                    )
+                dependency_index.update_html(path_rel, dependencies)
+                if archive is None:
+                    record_output(
+                        manifest, manifest_previous, dir_src, dir_dest, path_rel, "html"
+                    )
+                progress.advance("html")
+                continue
+
+            if process.should_copy_path(
+                path=path_rel,
+                list_copy_regex=list_copy_regex,
+                list_exclude_regex=list_exclude_regex,
+            ):
+                logger.debug("Copying file: %s", file_process_info.path)
+                with profiler.span(path_rel.as_posix(), "copy"):
+                    process.copy_file(file_process_info, archive=archive)
+                if archive is None and path_rel in dict_image_output:
+                    # The original of a processed image, next to its variants.
+                    record_outputs(
+                        manifest,
+                        manifest_previous,
+                        dir_src,
+                        dir_dest,
+                        path_rel,
+                        "image",
+                        [path_rel, *dict_image_output[path_rel]],
+                    )
+                elif archive is None:
+                    record_output(
+                        manifest, manifest_previous, dir_src, dir_dest, path_rel, "copy"
+                    )
+                progress.advance("copy")
+                continue
+
+            if path_rel in dict_image_output:
+                progress.advance("image")
+                continue
+
+            progress.advance("skip")
+
+        if archive is not None and search_index is not None:
+            for path_index, text in search_index.iter_files(full=True):
+                if text is not None:
+                    archive.add_chunks(Path(build_config.search_index) / path_index, [text])
+        if archive is not None and sitemap is not None:
+            for path_sitemap, text in sitemap.iter_files(full=True):
+                if text is not None:
+                    archive.add_chunks(path_sitemap, [text])
+    except BaseException:
+        if archive is not None:
+            archive.abort()
+        raise
+
+    progress.finish()
+    if archive is not None:
+        archive.close()
+        logger.info("Archive written: %s", archive.path)
+        return dependency_index
+
+    list_deleted: list[OutputRecord] = []
+    if search_index is not None:
+        search_index.save()
+        logger.info(
+            "Search index: %d page(s) → %s/", len(search_index.documents), search_index.directory
+        )
+        list_deleted += record_generated(
+            manifest,
+            manifest_previous,
+            dir_dest,
+            GENERATED_SEARCH_INDEX,
+            [
+                Path(build_config.search_index) / path_index
+                for path_index in search_index.list_files()
+            ],
+        )
+    if sitemap is not None:
+        sitemap.save()
+        logger.info("Sitemap: %d page(s), %d feed(s)", len(sitemap.urls), len(sitemap.feeds))
+        list_deleted += record_generated(
+            manifest, manifest_previous, dir_dest, GENERATED_SITEMAP, sitemap.list_files()
+        )
+    list_deleted += reconcile_manifest(
+        build_config, manifest, manifest_previous, dir_dest, shard
+    )
+    manifest.save(path_manifest)
+    if link_checker is not None:
+        link_checker.check_all(build_config.check_links_workers)
+    if build_config.changes_file is not None:
+        change_set = diff_manifests(manifest_previous, manifest, list_deleted)
+        change_set.save(build_config.changes_file)
+        logger.info(
+            "Change set: %d added, %d modified, %d deleted, %d unchanged → %s",
+            len(change_set.added),
+            len(change_set.modified),
+            len(change_set.deleted),
+            change_set.unchanged,
+            build_config.changes_file,
+        )
+    if render_options["build_cache"] is not None:
+        render_options["build_cache"].evict()
+    return dependency_index
+
+
+def record_output(
+    manifest: OutputManifest,
+    manifest_previous: OutputManifest,
+    dir_src: Path,
+    dir_dest: Path,
+    path_rel: Path,
+    kind: Literal["html", "copy"],
+) -> None:
+    """Record the output written for ``path_rel`` in ``manifest``."""
+    record_outputs(
+        manifest, manifest_previous, dir_src, dir_dest, path_rel, kind, [path_rel]
+    )
+
+
+def record_outputs(
+    manifest: OutputManifest,
+    manifest_previous: OutputManifest,
+    dir_src: Path,
+    dir_dest: Path,
+    path_rel: Path,
+    kind: Literal["html", "copy", "image"],
+    list_path_output: list[Path],
+) -> None:
+    """Record the outputs written for ``path_rel`` and its source in ``manifest``."""
+    list_output: list[OutputRecord] = []
+    for path_output in list_path_output:
+        try:
+            list_output.append(
+                make_output_record(
+                    dir_dest,
+                    path_output,
+                    manifest_previous.get_output(path_rel, path_output),
+                )
+            )
+        except FileNotFoundError:
+            logger.debug("No output to record for: %s → %s", path_rel, path_output)
+    if not list_output:
+        return
+    entry_previous = manifest_previous.entries.get(path_rel)
+    try:
+        source = make_output_record(
+            dir_src,
+            path_rel,
+            entry_previous.source if entry_previous is not None else None,
+        )
+    except FileNotFoundError:
+        source = None
+    manifest.record(path_rel, kind, list_output, source)
+
+
+def record_generated(
+    manifest: OutputManifest,
+    manifest_previous: OutputManifest,
+    dir_dest: Path,
+    path_generator: Path,
+    list_path_output: list[Path],
+) -> list[OutputRecord]:
+    """
+    Record the files a generator wrote as outputs of its pseudo-source.
+
+    Outputs of the previous build that the generator no longer produces are
+    removed, as the generator owns them.
+
+    Returns
+    -------
+    list of OutputRecord
+        Previous outputs that no longer exist.
+    """
+    list_output: list[OutputRecord] = []
+    for path_output in list_path_output:
+        try:
+            list_output.append(
+                make_output_record(
+                    dir_dest,
+                    path_output,
+                    manifest_previous.get_output(path_generator, path_output),
+                )
+            )
+        except FileNotFoundError:
+            logger.debug("No output to record for: %s → %s", path_generator, path_output)
+    manifest.record(path_generator, "generated", list_output)
+
+    entry_previous = manifest_previous.entries.get(path_generator)
+    if entry_previous is None:
+        return []
+    set_path_output = set(list_path_output)
+    list_deleted: list[OutputRecord] = []
+    for output in entry_previous.outputs:
+        if output.path in set_path_output:
             continue
+        process.delete_output(dir_dest, output.path)
+        if not (dir_dest / output.path).exists():
+            list_deleted.append(output)
+    return list_deleted
 
-        if process.should_copy_path(
-            path=path_rel,
-            list_copy_regex=list_copy_regex,
-            list_exclude_regex=list_exclude_regex,
+
+def reconcile_manifest(
+    build_config: BuildConfig,
+    manifest: OutputManifest,
+    manifest_previous: OutputManifest,
+    dir_dest: Path,
+    shard: Shard | None,
+) -> list[OutputRecord]:
+    """
+    Carry over or prune previous manifest entries not rebuilt by this build.
+
+    Entries owned by other shards, and generated files (which shards do not
+    write), are always carried over by a shard build. Orphaned entries in
+    this build's scope are pruned when ``build_config.prune`` is set and
+    carried over otherwise.
+
+    Returns
+    -------
+    list of OutputRecord
+        Output files deleted.
+    """
+    list_deleted: list[OutputRecord] = []
+    for path_src, entry in manifest_previous.entries.items():
+        if path_src in manifest.entries:
+            continue
+        if (
+            not build_config.prune
+            or not in_shard(path_src, shard)
+            or (shard is not None and entry.kind == "generated")
         ):
-            logger.info(f"Copying file: {file_process_info.path}")
-            process.copy_file(file_process_info)
+            manifest.entries[path_src] = entry
+            continue
+        for output in entry.outputs:
+            if process.delete_output(dir_dest, output.path):
+                list_deleted.append(output)
+        logger.debug("Pruned outputs of removed source: %s", path_src)
 
-    logger.info("Build complete")
-    return dependency_index
+    if build_config.prune:
+        logger.info("Pruned %d orphaned output file(s)", len(list_deleted))
+    return list_deleted
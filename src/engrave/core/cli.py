@@ -1,22 +1,21 @@
 # lib: built-in
+import asyncio
 import logging
 import os
 from dataclasses import (
     asdict,
     dataclass,
 )
+from typing import Annotated
 from urllib.parse import urljoin
 
 # lib: external
 import dacite
-import uvicorn
 from cyclopts import (
     App,
     Parameter,
 )
 
-from ..server import create_fastapi
-
 # lib: local
 from ..util.dataclass import (
     BuildConfig as _BuildConfig,
@@ -27,9 +26,26 @@ from ..util.dataclass import (
 from ..util.dataclass import (
     ServerConfig as _ServerConfig,
 )
+from ..util.dataclass import (
+    CompileConfig as _CompileConfig,
+)
+from ..util.dataclass import (
+    MergeIndexConfig as _MergeIndexConfig,
+)
+from ..util.dataclass import (
+    CheckLinksConfig as _CheckLinksConfig,
+)
+from ..util.links import LinkChecker
 from ..util.log import setup_root_logger
+from ..util.metrics import metrics
+from ..util.profile import profiler
 from .build import run as build_run
-from .watch import run as watch_run
+from .manifest import OutputManifest
+from .shard import merge_index as shard_merge_index
+from .shard import parse_shard, write_index
+
+# Commands import their heavy dependencies (watchfiles/aiostream for watch mode,
+# FastAPI/uvicorn for the server) on demand so `engrave build` stays cheap.
 
 
 @Parameter(name="*")
@@ -50,6 +66,24 @@ class ServerConfig(_ServerConfig):
     pass
 
 
+@Parameter(name="*")
+@dataclass
+class CompileConfig(_CompileConfig):
+    pass
+
+
+@Parameter(name="*")
+@dataclass
+class MergeIndexConfig(_MergeIndexConfig):
+    pass
+
+
+@Parameter(name="*")
+@dataclass
+class CheckLinksConfig(_CheckLinksConfig):
+    pass
+
+
 app = App(
     help_format="rst",
     help="""
@@ -62,10 +96,41 @@ app = App(
 
 
 @app.command()
-async def build(build_config: BuildConfig):
+async def build(
+    build_config: BuildConfig,
+    *,
+    profile: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Directory to write a per-page profiling report (`profile.txt`) "
+                "and a Chrome trace-event file (`trace.json`)."
+            )
+        ),
+    ] = None,
+    shard: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Build only shard `i` of `N` (for example `2/4`). Paths are "
+                "assigned by a stable hash of their source-relative path."
+            )
+        ),
+    ] = None,
+    index: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Path to write the build index (dependency index and output "
+                "manifest) consumed by `engrave merge-index`."
+            )
+        ),
+    ] = None,
+):
     """
     Build the site once.
     """
+    build_shard = parse_shard(shard) if shard is not None else None
 
     log_level = os.environ.get("LOG_LEVEL", "INFO")
     if build_config.log_level is not None:
@@ -82,7 +147,77 @@ async def build(build_config: BuildConfig):
     if build_config.copy:
         logger.info(f"Copy pattern: {build_config.copy}")
 
-    build_run(build_config)
+    manifest = OutputManifest() if index is not None else None
+
+    if profile is not None:
+        profiler.enable()
+    try:
+        dependency_index = build_run(build_config, manifest=manifest, shard=build_shard)
+    finally:
+        if profile is not None:
+            profiler.disable()
+
+    if profile is not None:
+        path_report, path_trace = profiler.write(profile)
+        logger.info(f"Profile report: {path_report}")
+        logger.info(f"Profile trace: {path_trace}")
+
+    if index is not None:
+        path_index = write_index(index, dependency_index, manifest, shard=build_shard)
+        logger.info(f"Build index: {path_index}")
+
+
+@app.command(name="merge-index")
+def merge_index(merge_index_config: MergeIndexConfig):
+    """
+    Combine per-shard build indexes into the index of a single-node build.
+    """
+    log_level = os.environ.get("LOG_LEVEL", "INFO")
+    if merge_index_config.log_level is not None:
+        log_level = merge_index_config.log_level
+    setup_root_logger(log_level=log_level)
+
+    logger = logging.getLogger(__name__)
+
+    dependency_index, manifest = shard_merge_index(merge_index_config.inputs)
+    path_index = write_index(merge_index_config.output, dependency_index, manifest)
+    logger.info(
+        f"Merged {len(merge_index_config.inputs)} build index(es) into '{path_index}'"
+    )
+
+
+@app.command(name="check-links")
+def check_links(check_links_config: CheckLinksConfig):
+    """
+    Check internal links and asset references of a built site.
+
+    Exits with status 1 when a broken link is found.
+    """
+    log_level = os.environ.get("LOG_LEVEL", "INFO")
+    if check_links_config.log_level is not None:
+        log_level = check_links_config.log_level
+    setup_root_logger(log_level=log_level)
+
+    link_checker = LinkChecker(
+        check_links_config.dir_dest, site_url=check_links_config.site_url
+    )
+    if link_checker.check_all(check_links_config.workers):
+        raise SystemExit(1)
+
+
+@app.command(name="compile")
+def compile_templates(compile_config: CompileConfig):
+    """
+    Precompile templates into a bundle for `--compiled-templates`.
+    """
+    from .compile import run as compile_run
+
+    log_level = os.environ.get("LOG_LEVEL", "INFO")
+    if compile_config.log_level is not None:
+        log_level = compile_config.log_level
+    setup_root_logger(log_level=log_level)
+
+    compile_run(compile_config)
 
 
 @app.command()
@@ -90,6 +225,7 @@ async def watch(watch_config: WatchConfig):
     """
     Build once, then rebuild when files change.
     """
+    from .watch import run as watch_run
 
     log_level = os.environ.get("LOG_LEVEL", "INFO")
     if watch_config.log_level is not None:
@@ -98,6 +234,18 @@ async def watch(watch_config: WatchConfig):
 
     logger = logging.getLogger(__name__)
 
+    if watch_config.metrics_interval > 0 or watch_config.metrics_file:
+        metrics.enable()
+
+    if watch_config.compiled_templates is not None:
+        logger.warning(
+            "Ignoring --compiled-templates %s: %s renders templates from %s/",
+            watch_config.compiled_templates,
+            "watch mode",
+            watch_config.dir_src,
+        )
+        watch_config.compiled_templates = None
+
     build_config = dacite.from_dict(data_class=BuildConfig, data=asdict(watch_config))
     dependency_index = build_run(build_config)
 
@@ -113,15 +261,29 @@ Press CTRL+C to stop watching.
 """.strip()
     )
 
-    async for batch in watch_run(watch_config, dependency_index=dependency_index):
-        logger.info("Detected %d file change(s)", len(batch))
-        for change in batch:
+    task_metrics_log = None
+    if watch_config.metrics_interval > 0:
+        task_metrics_log = asyncio.create_task(
+            metrics.log_periodically(watch_config.metrics_interval)
+        )
+
+    try:
+        async for batch in watch_run(watch_config, dependency_index=dependency_index):
             logger.info(
-                "[%s] %s: %s",
-                change.type,
-                change.change.name,
-                change.path,
+                "Detected %d file change(s)", sum(change.count for change in batch)
             )
+            for change in batch:
+                logger.info(
+                    "[%s] %s: %s",
+                    change.type,
+                    change.change.name,
+                    change.path,
+                )
+            if watch_config.metrics_file:
+                metrics.dump(watch_config.metrics_file)
+    finally:
+        if task_metrics_log is not None:
+            task_metrics_log.cancel()
 
 
 @app.command()
@@ -129,6 +291,9 @@ def server(server_config: ServerConfig):
     """
     Build once, then start a local preview server with watch events.
     """
+    import uvicorn
+
+    from ..server import create_fastapi
 
     log_level = os.environ.get("LOG_LEVEL", "INFO")
     if server_config.log_level is not None:
@@ -137,6 +302,18 @@ def server(server_config: ServerConfig):
 
     logger = logging.getLogger(__name__)
 
+    if server_config.metrics:
+        metrics.enable()
+
+    if server_config.compiled_templates is not None:
+        logger.warning(
+            "Ignoring --compiled-templates %s: %s renders templates from %s/",
+            server_config.compiled_templates,
+            "the development server",
+            server_config.dir_src,
+        )
+        server_config.compiled_templates = None
+
     build_config = dacite.from_dict(data_class=BuildConfig, data=asdict(server_config))
     dependency_index = build_run(build_config)
 
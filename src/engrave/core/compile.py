@@ -0,0 +1,65 @@
+"""Ahead-of-time template compilation for deploy artifacts."""
+
+# lib: built-in
+from pathlib import Path
+import re
+import logging
+
+# lib: local
+from ..template import TemplateEngine
+from ..util import process
+from ..util.dataclass import CompileConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+def run(compile_config: CompileConfig) -> list[str]:
+    """
+    Compile every HTML template under ``dir_src`` into a module bundle.
+
+    The bundle is written with ``jinja2.Environment.compile_templates`` and can
+    be loaded by ``TemplateEngine`` through ``compiled_templates`` (CLI:
+    ``--compiled-templates``), which skips template parsing and compilation at
+    render time.
+
+    Parameters
+    ----------
+    compile_config : CompileConfig
+        Source directory, bundle target, archive mode, and exclude patterns.
+
+    Returns
+    -------
+    list of str
+        Source-relative names of the compiled templates.
+
+    Raises
+    ------
+    jinja2.TemplateSyntaxError
+        If a template cannot be compiled.
+    """
+    dir_src = Path(compile_config.dir_src)
+    path_target = Path(compile_config.target)
+    list_exclude_regex = [re.compile(regex) for regex in compile_config.exclude]
+
+    def filter_template(name: str) -> bool:
+        path = Path(name)
+        return path.suffix == ".html" and not process.is_excluded_path(
+            path=path, list_exclude_regex=list_exclude_regex
+        )
+
+    if compile_config.zip:
+        path_target.parent.mkdir(parents=True, exist_ok=True)
+
+    logger.info("Compiling templates from: %s/", dir_src)
+    template_env = TemplateEngine(dir_src=dir_src).template_env
+    list_name = template_env.list_templates(filter_func=filter_template)
+    template_env.compile_templates(
+        str(path_target),
+        filter_func=filter_template,
+        zip="deflated" if compile_config.zip else None,
+        log_function=logger.debug,
+        ignore_errors=False,
+    )
+    logger.info("Compiled %d template(s) into: %s", len(list_name), path_target)
+    return list_name
@@ -1,69 +1,90 @@
 """In-memory dependency indexing for incremental watch rebuilds."""
 
 from pathlib import Path
+from typing import Any, Dict, List
 
 from ..template import RenderDependencies
 
 
+def update_reverse_index(
+    reverse_index: dict[Path, set[Path]],
+    path_html: Path,
+    previous_paths: set[Path],
+    paths: set[Path],
+) -> None:
+    """Move ``path_html`` from the entries of ``previous_paths`` to those of ``paths``."""
+    for path_dependency in previous_paths - paths:
+        html_paths = reverse_index.get(path_dependency)
+        if html_paths is None:
+            continue
+        html_paths.discard(path_html)
+        if not html_paths:
+            del reverse_index[path_dependency]
+
+    for path_dependency in paths:
+        reverse_index.setdefault(path_dependency, set()).add(path_html)
+
+
 class DependencyIndex:
-    """Track HTML-to-Markdown and Markdown-to-HTML relationships."""
+    """Track HTML-to-Markdown and Markdown-to-HTML relationships.
+
+    Templates, site data files, listed collection directories and ``srcset()``
+    images are tracked the same way, so a change to any of them maps back to
+    the pages that used it.
+    """
 
     def __init__(self) -> None:
         self.html_to_markdown: dict[Path, set[Path]] = {}
         self.html_to_template: dict[Path, set[Path]] = {}
+        self.html_to_data: dict[Path, set[Path]] = {}
         self.markdown_to_html: dict[Path, set[Path]] = {}
         self.template_to_html: dict[Path, set[Path]] = {}
+        self.data_to_html: dict[Path, set[Path]] = {}
+        self.html_to_collection: dict[Path, set[Path]] = {}
+        self.collection_to_html: dict[Path, set[Path]] = {}
+        self.html_to_image: dict[Path, set[Path]] = {}
+        self.image_to_html: dict[Path, set[Path]] = {}
 
     def update_html(self, path_html: Path, dependencies: RenderDependencies) -> None:
         """Replace the dependency sets for one HTML page."""
-        previous_markdown_paths = self.html_to_markdown.get(path_html, set())
-        previous_template_paths = self.html_to_template.get(path_html, set())
-
-        for path_markdown in previous_markdown_paths - dependencies.markdown_paths:
-            html_paths = self.markdown_to_html.get(path_markdown)
-            if html_paths is None:
-                continue
-            html_paths.discard(path_html)
-            if not html_paths:
-                del self.markdown_to_html[path_markdown]
-
-        for path_markdown in dependencies.markdown_paths:
-            self.markdown_to_html.setdefault(path_markdown, set()).add(path_html)
-
-        for path_template in previous_template_paths - dependencies.template_paths:
-            html_paths = self.template_to_html.get(path_template)
-            if html_paths is None:
-                continue
-            html_paths.discard(path_html)
-            if not html_paths:
-                del self.template_to_html[path_template]
-
-        for path_template in dependencies.template_paths:
-            self.template_to_html.setdefault(path_template, set()).add(path_html)
-
-        self.html_to_markdown[path_html] = set(dependencies.markdown_paths)
-        self.html_to_template[path_html] = set(dependencies.template_paths)
+        for forward_index, reverse_index, paths in (
+            (self.html_to_markdown, self.markdown_to_html, dependencies.markdown_paths),
+            (self.html_to_template, self.template_to_html, dependencies.template_paths),
+            (self.html_to_data, self.data_to_html, dependencies.data_paths),
+            (
+                self.html_to_collection,
+                self.collection_to_html,
+                dependencies.collection_paths,
+            ),
+            (self.html_to_image, self.image_to_html, dependencies.image_paths),
+        ):
+            update_reverse_index(
+                reverse_index, path_html, forward_index.get(path_html, set()), paths
+            )
+            forward_index[path_html] = set(paths)
 
     def remove_html(self, path_html: Path) -> None:
         """Remove one HTML page and all of its reverse-index entries."""
-        previous_markdown_paths = self.html_to_markdown.pop(path_html, set())
-        previous_template_paths = self.html_to_template.pop(path_html, set())
-
-        for path_markdown in previous_markdown_paths:
-            html_paths = self.markdown_to_html.get(path_markdown)
-            if html_paths is None:
-                continue
-            html_paths.discard(path_html)
-            if not html_paths:
-                del self.markdown_to_html[path_markdown]
-
-        for path_template in previous_template_paths:
-            html_paths = self.template_to_html.get(path_template)
-            if html_paths is None:
-                continue
-            html_paths.discard(path_html)
-            if not html_paths:
-                del self.template_to_html[path_template]
+        for forward_index, reverse_index in (
+            (self.html_to_markdown, self.markdown_to_html),
+            (self.html_to_template, self.template_to_html),
+            (self.html_to_data, self.data_to_html),
+            (self.html_to_collection, self.collection_to_html),
+            (self.html_to_image, self.image_to_html),
+        ):
+            update_reverse_index(
+                reverse_index, path_html, forward_index.pop(path_html, set()), set()
+            )
+
+    def get_dependencies(self, path_html: Path) -> RenderDependencies:
+        """Return a copy of the recorded dependencies of one page."""
+        return RenderDependencies(
+            markdown_paths=set(self.html_to_markdown.get(path_html, set())),
+            template_paths=set(self.html_to_template.get(path_html, set())),
+            data_paths=set(self.html_to_data.get(path_html, set())),
+            collection_paths=set(self.html_to_collection.get(path_html, set())),
+            image_paths=set(self.html_to_image.get(path_html, set())),
+        )
 
     def get_markdown_dependents(self, path_markdown: Path) -> set[Path]:
         """Return HTML pages that depend on the given Markdown file."""
@@ -72,3 +93,115 @@ class DependencyIndex:
     def get_template_dependents(self, path_template: Path) -> set[Path]:
         """Return HTML pages that depend on the given template file."""
         return set(self.template_to_html.get(path_template, set()))
+
+    def get_data_dependents(self, path_data: Path) -> set[Path]:
+        """Return HTML pages that read a data file or listed a directory holding it."""
+        dependents: set[Path] = set()
+        for path in (path_data, *path_data.parents):
+            dependents |= self.data_to_html.get(path, set())
+        return dependents
+
+    def get_image_dependents(self, path_image: Path) -> set[Path]:
+        """Return HTML pages that passed the given image to ``srcset()``."""
+        return set(self.image_to_html.get(path_image, set()))
+
+    def get_collection_dependents(self, path_page: Path) -> set[Path]:
+        """Return HTML pages that listed a collection containing the given page."""
+        dependents: set[Path] = set()
+        for path in path_page.parents:
+            dependents |= self.collection_to_html.get(path, set())
+        return dependents
+
+    def iter_html(self) -> set[Path]:
+        """Return every indexed HTML page."""
+        return (
+            self.html_to_markdown.keys()
+            | self.html_to_template.keys()
+            | self.html_to_data.keys()
+            | self.html_to_collection.keys()
+            | self.html_to_image.keys()
+        )
+
+    def get_html_under(self, path_dir: Path) -> set[Path]:
+        """Return indexed HTML pages located under a source-relative directory."""
+        return {
+            path_html for path_html in self.iter_html() if path_html.is_relative_to(path_dir)
+        }
+
+    def pop_html_under(self, path_dir: Path) -> dict[Path, RenderDependencies]:
+        """Remove every page under ``path_dir`` and return its dependencies."""
+        popped: dict[Path, RenderDependencies] = {}
+        for path_html in self.get_html_under(path_dir):
+            popped[path_html] = self.get_dependencies(path_html)
+            self.remove_html(path_html)
+        return popped
+
+    def get_dependents_under(self, path_dir: Path) -> set[Path]:
+        """Return pages that use any Markdown, template, data or image file under ``path_dir``.
+
+        Pages listing a collection that contains ``path_dir`` are included too.
+        """
+        dependents: set[Path] = set()
+        for reverse_index in (
+            self.markdown_to_html,
+            self.template_to_html,
+            self.data_to_html,
+            self.image_to_html,
+        ):
+            for path_dependency, html_paths in reverse_index.items():
+                if path_dependency.is_relative_to(path_dir):
+                    dependents |= html_paths
+        for path_dependency, html_paths in self.collection_to_html.items():
+            if path_dependency.is_relative_to(path_dir) or path_dir.is_relative_to(
+                path_dependency
+            ):
+                dependents |= html_paths
+        return dependents
+
+    def merge(self, other: "DependencyIndex") -> None:
+        """Add every page of ``other`` into this index.
+
+        Pages present in both indexes take the dependency sets from ``other``.
+        """
+        for path_html in other.iter_html():
+            self.update_html(path_html, other.get_dependencies(path_html))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize forward page dependencies to JSON-compatible data.
+
+        Reverse indexes are rebuilt by ``from_dict`` and are not stored.
+        """
+        pages: Dict[str, Dict[str, List[str]]] = {}
+        for path_html in sorted(self.iter_html()):
+            dependencies = self.get_dependencies(path_html)
+            pages[path_html.as_posix()] = {
+                "markdown": sorted(path.as_posix() for path in dependencies.markdown_paths),
+                "templates": sorted(path.as_posix() for path in dependencies.template_paths),
+                "data": sorted(path.as_posix() for path in dependencies.data_paths),
+                "collections": sorted(
+                    path.as_posix() for path in dependencies.collection_paths
+                ),
+                "images": sorted(path.as_posix() for path in dependencies.image_paths),
+            }
+        return {"pages": pages}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DependencyIndex":
+        """Rebuild an index serialized by ``to_dict``."""
+        dependency_index = cls()
+        for str_html, dependencies in data.get("pages", {}).items():
+            dependency_index.update_html(
+                Path(str_html),
+                RenderDependencies(
+                    markdown_paths={Path(path) for path in dependencies["markdown"]},
+                    template_paths={Path(path) for path in dependencies["templates"]},
+                    # Indexes written before data files, collections and images
+                    # were tracked have none of them.
+                    data_paths={Path(path) for path in dependencies.get("data", [])},
+                    collection_paths={
+                        Path(path) for path in dependencies.get("collections", [])
+                    },
+                    image_paths={Path(path) for path in dependencies.get("images", [])},
+                ),
+            )
+        return dependency_index
@@ -0,0 +1,251 @@
+"""Output manifest recording which destination files each source produced."""
+
+# lib: built-in
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Literal
+
+# lib: local
+from ..util import process
+from ..util.fs import write_text_atomic
+
+MANIFEST_VERSION = 1
+# Appended to the destination directory name for the default manifest path.
+MANIFEST_SUFFIX = ".engrave-manifest.json"
+# Pseudo-sources of the files written once per build rather than per source.
+# A colon never appears in portable source paths.
+GENERATED_SEARCH_INDEX = Path(":search-index")
+GENERATED_SITEMAP = Path(":sitemap")
+
+
+@dataclass
+class OutputRecord:
+    """
+    One destination-relative output file with its size and content digest.
+    """
+
+    path: Path
+    size: int
+    digest: str
+    mtime_ns: int = 0
+
+
+@dataclass
+class ManifestEntry:
+    """
+    Outputs written for one source-relative path.
+    """
+
+    kind: Literal["html", "copy", "image", "generated"]
+    outputs: List[OutputRecord] = field(default_factory=list)
+    # The source file itself, described like an output, so watch mode can tell
+    # a renamed directory from a new one holding files of the same names.
+    source: OutputRecord | None = None
+
+
+def get_manifest_path(dir_dest: str | Path, manifest_file: str | None = None) -> Path:
+    """Return ``manifest_file`` or the default manifest path next to ``dir_dest``.
+
+    The default, ``.dist.engrave-manifest.json`` for a ``dist`` destination,
+    sits beside the destination directory so deploying that directory does
+    not publish the manifest.
+    """
+    if manifest_file is not None:
+        return Path(manifest_file)
+    path_dest = Path(dir_dest).resolve()
+    return path_dest.parent / f".{path_dest.name}{MANIFEST_SUFFIX}"
+
+
+def make_output_record(
+    dir_dest: Path,
+    path_output: Path,
+    previous: OutputRecord | None = None,
+) -> OutputRecord:
+    """
+    Describe one written output file, or the source file it came from.
+
+    The digest of ``previous`` is reused when size and modification time are
+    unchanged, so unchanged copied assets are not re-hashed on every build.
+    """
+    path_dest = dir_dest / path_output
+    stat = path_dest.stat()
+    if (
+        previous is not None
+        and previous.size == stat.st_size
+        and previous.mtime_ns == stat.st_mtime_ns
+    ):
+        digest = previous.digest
+    else:
+        digest = process.file_digest(path_dest)
+    return OutputRecord(
+        path=path_output,
+        size=stat.st_size,
+        digest=digest,
+        mtime_ns=stat.st_mtime_ns,
+    )
+
+
+class OutputManifest:
+    """Track source-relative paths and the destination-relative outputs they produced."""
+
+    def __init__(self) -> None:
+        self.entries: dict[Path, ManifestEntry] = {}
+
+    def record(
+        self,
+        path_src: Path,
+        kind: Literal["html", "copy", "image", "generated"],
+        outputs: List[OutputRecord],
+        source: OutputRecord | None = None,
+    ) -> None:
+        """Replace the entry for one source path."""
+        self.entries[path_src] = ManifestEntry(
+            kind=kind, outputs=list(outputs), source=source
+        )
+
+    def remove(self, path_src: Path) -> ManifestEntry | None:
+        """Drop the entry for one source path and return it when present."""
+        return self.entries.pop(path_src, None)
+
+    def get_output(self, path_src: Path, path_output: Path) -> OutputRecord | None:
+        """Return the recorded output ``path_output`` of ``path_src``, if any."""
+        entry = self.entries.get(path_src)
+        if entry is None:
+            return None
+        for output in entry.outputs:
+            if output.path == path_output:
+                return output
+        return None
+
+    def merge(self, other: "OutputManifest") -> None:
+        """Add every entry of ``other`` into this manifest."""
+        for path_src, entry in other.entries.items():
+            self.record(path_src, entry.kind, entry.outputs, entry.source)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize entries to JSON-compatible data sorted by source path."""
+
+        def record_to_dict(output: OutputRecord) -> Dict[str, Any]:
+            return {
+                "path": output.path.as_posix(),
+                "size": output.size,
+                "digest": output.digest,
+                "mtime_ns": output.mtime_ns,
+            }
+
+        sources: Dict[str, Any] = {}
+        for path_src, entry in sorted(self.entries.items()):
+            sources[path_src.as_posix()] = {
+                "kind": entry.kind,
+                "outputs": [record_to_dict(output) for output in entry.outputs],
+            }
+            if entry.source is not None:
+                sources[path_src.as_posix()]["source"] = record_to_dict(entry.source)
+        return {"sources": sources}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OutputManifest":
+        """Rebuild a manifest serialized by ``to_dict``."""
+
+        def record_from_dict(output: Dict[str, Any]) -> OutputRecord:
+            return OutputRecord(
+                path=Path(output["path"]),
+                size=output["size"],
+                digest=output["digest"],
+                mtime_ns=output.get("mtime_ns", 0),
+            )
+
+        manifest = cls()
+        for str_src, entry in data.get("sources", {}).items():
+            manifest.record(
+                Path(str_src),
+                entry["kind"],
+                [record_from_dict(output) for output in entry["outputs"]],
+                # Manifests written before sources were recorded have none.
+                record_from_dict(entry["source"]) if "source" in entry else None,
+            )
+        return manifest
+
+    def save(self, path: str | Path) -> None:
+        """Write the manifest through a temporary file renamed into place."""
+        data = {"version": MANIFEST_VERSION, **self.to_dict()}
+        write_text_atomic(Path(path), json.dumps(data, indent=2) + "\n")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "OutputManifest":
+        """Read a manifest written by ``save``.
+
+        A missing file or one from an incompatible version yields an empty
+        manifest, so the next build simply rewrites it.
+        """
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return cls()
+        if data.get("version") != MANIFEST_VERSION:
+            return cls()
+        return cls.from_dict(data)
+
+
+@dataclass
+class ChangeSet:
+    """
+    Outputs added, modified, or deleted by one build, for incremental uploads.
+    """
+
+    added: List[OutputRecord] = field(default_factory=list)
+    modified: List[OutputRecord] = field(default_factory=list)
+    deleted: List[OutputRecord] = field(default_factory=list)
+    unchanged: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to JSON-compatible data with outputs sorted by path."""
+
+        def records(list_output: List[OutputRecord]) -> List[Dict[str, Any]]:
+            return [
+                {"path": output.path.as_posix(), "size": output.size, "digest": output.digest}
+                for output in sorted(list_output, key=lambda output: output.path)
+            ]
+
+        return {
+            "version": MANIFEST_VERSION,
+            "added": records(self.added),
+            "modified": records(self.modified),
+            "deleted": records(self.deleted),
+            "unchanged": self.unchanged,
+        }
+
+    def save(self, path: str | Path) -> None:
+        """Write the change set through a temporary file renamed into place."""
+        write_text_atomic(Path(path), json.dumps(self.to_dict(), indent=2) + "\n")
+
+
+def diff_manifests(
+    manifest_previous: OutputManifest,
+    manifest: OutputManifest,
+    list_deleted: List[OutputRecord],
+) -> ChangeSet:
+    """
+    Compute the outputs a build added or modified by digest, plus deleted ones.
+
+    Parameters
+    ----------
+    manifest_previous : OutputManifest
+        Manifest saved by the previous build.
+    manifest : OutputManifest
+        Manifest of the current build.
+    list_deleted : list of OutputRecord
+        Outputs removed by the current build, such as pruned orphans.
+    """
+    change_set = ChangeSet(deleted=list(list_deleted))
+    for path_src, entry in manifest.entries.items():
+        for output in entry.outputs:
+            previous = manifest_previous.get_output(path_src, output.path)
+            if previous is None:
+                change_set.added.append(output)
+            elif previous.digest != output.digest:
+                change_set.modified.append(output)
+            else:
+                change_set.unchanged += 1
+    return change_set
@@ -0,0 +1,169 @@
+"""Deterministic build sharding and mergeable build indexes."""
+
+# lib: built-in
+import json
+import logging
+from hashlib import sha1
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# lib: local
+from ..util.fs import write_text_atomic
+from .deps import DependencyIndex
+from .manifest import OutputManifest
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+Shard = Tuple[int, int]
+
+
+def parse_shard(value: str) -> Shard:
+    """
+    Parse a ``i/N`` shard specification.
+
+    Parameters
+    ----------
+    value : str
+        One-based shard index and shard count, such as ``2/4``.
+
+    Returns
+    -------
+    tuple of int
+        ``(index, count)`` with ``1 <= index <= count``.
+
+    Raises
+    ------
+    ValueError
+        If the value is malformed or out of range.
+    """
+    str_index, sep, str_count = value.partition("/")
+    try:
+        if not sep:
+            raise ValueError
+        index, count = int(str_index), int(str_count)
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}': expected 'i/N', such as '1/4'") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}': index must be between 1 and {max(count, 1)}")
+    return index, count
+
+
+def shard_of(path_rel: Path, count: int) -> int:
+    """
+    Return the one-based shard that owns a source-relative path.
+
+    The assignment hashes the POSIX form of ``path_rel`` so it is identical
+    across machines, operating systems, and Python processes (unlike
+    ``hash()``, which is salted per process).
+    """
+    digest = sha1(path_rel.as_posix().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def in_shard(path_rel: Path, shard: Shard | None) -> bool:
+    """Check whether ``path_rel`` belongs to ``shard``; ``None`` owns every path."""
+    if shard is None:
+        return True
+    index, count = shard
+    return shard_of(path_rel, count) == index
+
+
+def write_index(
+    path: str | Path,
+    dependency_index: DependencyIndex,
+    manifest: OutputManifest,
+    shard: Shard | None = None,
+) -> Path:
+    """
+    Serialize a build's dependency index and output manifest to JSON.
+
+    The file is written to a temporary sibling and moved into place so a
+    concurrent reader never sees a partial index.
+    """
+    path = Path(path)
+    data = {
+        "version": INDEX_VERSION,
+        "shard": list(shard) if shard is not None else None,
+        "dependencies": dependency_index.to_dict(),
+        "manifest": manifest.to_dict(),
+    }
+    write_text_atomic(path, json.dumps(data, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def read_index(path: str | Path) -> Tuple[DependencyIndex, OutputManifest, Shard | None]:
+    """
+    Load a build index written by ``write_index``.
+
+    Raises
+    ------
+    ValueError
+        If the file was written by an incompatible index version.
+    """
+    data: Dict[str, Any] = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != INDEX_VERSION:
+        raise ValueError(
+            f"Unsupported build index version in '{path}': {data.get('version')!r}"
+        )
+    shard = tuple(data["shard"]) if data.get("shard") else None
+    return (
+        DependencyIndex.from_dict(data["dependencies"]),
+        OutputManifest.from_dict(data["manifest"]),
+        shard,
+    )
+
+
+def merge_index(
+    list_path: List[str | Path],
+) -> Tuple[DependencyIndex, OutputManifest]:
+    """
+    Combine per-shard build indexes into the index of a single-node build.
+
+    Parameters
+    ----------
+    list_path : list of str or pathlib.Path
+        Build index files written by ``engrave build --shard i/N --index``.
+
+    Returns
+    -------
+    tuple
+        Merged ``DependencyIndex`` and ``OutputManifest``.
+
+    Raises
+    ------
+    ValueError
+        If sharded inputs disagree on the shard count, repeat a shard, or do
+        not cover every shard.
+    """
+    dependency_index = DependencyIndex()
+    manifest = OutputManifest()
+    shard_count: int | None = None
+    set_shard_index: set[int] = set()
+
+    for path in list_path:
+        shard_dependency_index, shard_manifest, shard = read_index(path)
+        if shard is not None:
+            index, count = shard
+            if shard_count is not None and count != shard_count:
+                raise ValueError(
+                    f"Shard count mismatch in '{path}': expected {shard_count}, got {count}"
+                )
+            if index in set_shard_index:
+                raise ValueError(f"Shard {index}/{count} given more than once: '{path}'")
+            shard_count = count
+            set_shard_index.add(index)
+        dependency_index.merge(shard_dependency_index)
+        manifest.merge(shard_manifest)
+        logger.debug("Merged build index: %s", path)
+
+    if shard_count is not None:
+        missing = sorted(set(range(1, shard_count + 1)) - set_shard_index)
+        if missing:
+            raise ValueError(
+                f"Missing build index for shard(s) {', '.join(map(str, missing))} of {shard_count}"
+            )
+
+    return dependency_index, manifest
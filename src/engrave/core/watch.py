@@ -18,12 +18,31 @@ Notes
 - Watch filtering uses compiled regular expressions matched against normalized
   relative path strings.
 - Processing functions are synchronous and are called from the async handlers.
+- Directory deletes and renames are handled per directory: output subtrees
+  are removed or moved in one operation and the dependency index is updated
+  in bulk, so renamed pages are only re-rendered when a rename can change
+  their output.
+- Batches of at least ``burst_threshold`` changes (a ``git checkout`` or
+  ``git pull``) are planned as one bulk rebuild: affected pages are deduped
+  through the dependency index, rendered across a process pool, and reported
+  as a single summarized ``FileChangeResult``.
+- With ``search_index`` or ``site_url`` configured, only the entries of
+  rebuilt, deleted, or moved pages are updated, and only changed search
+  shards, sitemap chunks, and feeds are rewritten after each batch. With
+  ``check_links``, only rebuilt pages are re-parsed, and pages linking to
+  added or deleted outputs are re-validated.
 """
 
 # lib: built-in
-from typing import List, AsyncGenerator, Set, Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, AsyncGenerator, Set, Callable, Tuple
+import asyncio
+import itertools
 import logging
+import multiprocessing
+import os
 import re
+import time
 from pathlib import Path
 
 # lib: external
@@ -43,8 +62,18 @@ from ..util.dataclass import (
     FileChangeResult,
 )
 
+from ..template import RenderDependencies
 from ..util import process
+from ..util.search import SearchIndex
+from ..util.collection import get_collection_index
+from ..util.data import DATA_SUFFIXES, is_data_path
+from ..util.image import get_image_processor
+from ..util.links import LinkChecker, get_link_checker
+from ..util.sitemap import Sitemap
+from ..util.log import format_duration
+from ..util.metrics import BATCH_SIZE_BUCKETS, metrics
 from .deps import DependencyIndex
+from .manifest import OutputManifest, get_manifest_path
 
 
 logger = logging.getLogger(__name__)
@@ -82,11 +111,572 @@ class WatchFilter(DefaultFilter):
         return super().__call__(change, path) and self.path_validator(path_rel)
 
 
+def observe_batch(batch_type: str, batch_size: int, time_start: float) -> None:
+    """Record watch batch size and processing duration metrics.
+
+    Parameters
+    ----------
+    batch_type : str
+        Watch stream that produced the batch, such as ``build`` or ``copy``.
+    batch_size : int
+        Number of raw ``watchfiles`` changes in the batch.
+    time_start : float
+        ``time.perf_counter()`` value taken before the batch was processed.
+    """
+    if not metrics.enabled:
+        return
+    labels = {"type": batch_type}
+    metrics.observe(
+        "engrave_watch_batch_size",
+        batch_size,
+        labels=labels,
+        buckets=BATCH_SIZE_BUCKETS,
+    )
+    metrics.observe(
+        "engrave_watch_rebuild_seconds",
+        time.perf_counter() - time_start,
+        labels=labels,
+    )
+
+
+def is_directory_path(path_rel: Path, dir_src: Path, dir_dest: Path) -> bool:
+    """Check whether a watch path is a source directory or a mirrored output one.
+
+    Deleted source directories no longer exist, so they are recognized by the
+    output directory that mirrors them under ``dir_dest``.
+    """
+    return (dir_src / path_rel).is_dir() or (dir_dest / path_rel).is_dir()
+
+
+def get_page_indexes(
+    render_options: Dict,
+) -> List[SearchIndex | Sitemap | LinkChecker]:
+    """Return the search index, sitemap, and link checker in ``render_options``."""
+    return [
+        render_options[name]
+        for name in ("search_index", "sitemap", "link_checker")
+        if render_options.get(name) is not None
+    ]
+
+
+def index_built_page(
+    build_config: WatchConfig | ServerConfig,
+    render_options: Dict,
+    path_html: Path,
+    dependencies: RenderDependencies,
+) -> None:
+    """Update page indexes for a page rendered outside ``build_html``'s process."""
+    dir_src = Path(build_config.dir_src)
+    dir_dest = Path(build_config.dir_dest)
+    if render_options.get("search_index") is not None:
+        render_options["search_index"].update_from_file(path_html, dir_dest / path_html)
+    if render_options.get("sitemap") is not None:
+        render_options["sitemap"].update(dir_src, dir_dest, path_html, dependencies)
+    if render_options.get("link_checker") is not None:
+        render_options["link_checker"].update_page(path_html)
+
+
+def select_topmost(list_path: List[Path]) -> List[Path]:
+    """Drop paths nested under another path of the list."""
+    list_topmost: List[Path] = []
+    for path in sorted(list_path, key=lambda path: len(path.parts)):
+        if not any(path.is_relative_to(path_top) for path_top in list_topmost):
+            list_topmost.append(path)
+    return list_topmost
+
+
+def list_expected_outputs(
+    build_config: WatchConfig | ServerConfig,
+    path_dir: Path,
+    list_copy_regex: List[re.Pattern],
+    list_exclude_regex: List[re.Pattern],
+) -> Dict[Path, str]:
+    """Map files under a source directory that produce outputs to their kind.
+
+    Keys are relative to ``path_dir``; values are ``"build"`` or ``"copy"``.
+    """
+    dir_src = Path(build_config.dir_src)
+    dict_output: Dict[Path, str] = {}
+    for path in (dir_src / path_dir).rglob("*"):
+        if not path.is_file():
+            continue
+        path_rel = path.relative_to(dir_src)
+        if process.should_build_html(path=path_rel, list_exclude_regex=list_exclude_regex):
+            dict_output[path_rel.relative_to(path_dir)] = "build"
+        elif process.should_copy_path(
+            path=path_rel,
+            list_copy_regex=list_copy_regex,
+            list_exclude_regex=list_exclude_regex,
+        ):
+            dict_output[path_rel.relative_to(path_dir)] = "copy"
+    return dict_output
+
+
+def is_same_sources(
+    build_config: WatchConfig | ServerConfig,
+    manifest: OutputManifest,
+    path_old: Path,
+    path_new: Path,
+    dict_output: Dict[Path, str],
+) -> bool:
+    """Return whether sources under ``path_new`` are those recorded under ``path_old``.
+
+    Sizes are compared first, so unrelated directories are told apart without
+    hashing; digests are computed only when every size matches.
+    """
+    dir_src = Path(build_config.dir_src)
+    list_source: List[Tuple[Path, str]] = []
+    for path_output in dict_output:
+        entry = manifest.entries.get(path_old / path_output)
+        if entry is None or entry.source is None:
+            return False
+        path_src = dir_src / path_new / path_output
+        try:
+            size = path_src.stat().st_size
+        except OSError:
+            return False
+        if size != entry.source.size:
+            return False
+        list_source.append((path_src, entry.source.digest))
+    return all(process.file_digest(path) == digest for path, digest in list_source)
+
+
+def handle_directory_changes(
+    build_config: WatchConfig | ServerConfig,
+    list_file_change: Set[FileChange],
+    dependency_index: DependencyIndex,
+    render_options: Dict,
+) -> Tuple[List[FileChangeResult], Set[FileChange]]:
+    """Apply directory-level deletes, renames, and additions from one batch.
+
+    ``watchfiles`` reports a renamed directory as a deleted and an added
+    directory path without per-file events, and a deleted directory as the
+    directory plus every file below it. This function handles such batches
+    per directory:
+
+    - A deleted directory whose output files match exactly those an added
+      directory would produce, from sources whose size and digest match those
+      the build manifest recorded under the deleted directory, is a rename:
+      its output subtree is moved and
+      its pages keep their outputs unless a template they use lived inside
+      the directory, or the rename changed the parent directory of a page
+      that includes Markdown or ``srcset()`` images (relative paths may
+      resolve differently).
+    - Other deleted directories have their output subtree removed at once.
+    - Other added directories have every page and copied asset built.
+    - Pages elsewhere that use templates, Markdown or images under a deleted
+      or renamed directory are rebuilt.
+
+    Parent directories left empty in ``dir_dest`` are pruned.
+
+    Returns
+    -------
+    tuple
+        Results for the directory changes, and the remaining file changes not
+        covered by a handled directory.
+    """
+    dir_src = Path(build_config.dir_src)
+    dir_dest = Path(build_config.dir_dest)
+    dir_src_resolved = dir_src.resolve()
+    list_dir_deleted: List[Path] = []
+    list_dir_added: List[Path] = []
+    set_file_change: Set[FileChange] = set()
+
+    for change, path in list_file_change:
+        path_rel = Path(path).relative_to(dir_src_resolved)
+        if change == Change.deleted and (dir_dest / path_rel).is_dir():
+            list_dir_deleted.append(path_rel)
+        elif (dir_src / path_rel).is_dir():
+            if change == Change.added:
+                list_dir_added.append(path_rel)
+        else:
+            set_file_change.add((change, path))
+
+    if not list_dir_deleted and not list_dir_added:
+        return [], set_file_change
+
+    render_options["collection_index"].invalidate()
+    list_copy_regex = [re.compile(regex) for regex in build_config.copy]
+    list_exclude_regex = [re.compile(regex) for regex in build_config.exclude]
+    list_dir_deleted = select_topmost(list_dir_deleted)
+    # Nested added directories stay rename candidates: moving a directory into
+    # a new parent reports both the parent and the moved directory as added.
+    dict_added_outputs = {
+        path_dir: list_expected_outputs(
+            build_config, path_dir, list_copy_regex, list_exclude_regex
+        )
+        for path_dir in sorted(list_dir_added)
+    }
+    list_dir_renamed: List[Path] = []
+    manifest = (
+        OutputManifest.load(get_manifest_path(dir_dest, build_config.manifest_file))
+        if list_dir_deleted and dict_added_outputs
+        else OutputManifest()
+    )
+
+    list_file_change_result: List[FileChangeResult] = []
+    set_path_dependent: Set[Path] = set()
+    for path_new in dict_added_outputs:
+        # Pages listing a collection the directory was added to.
+        set_path_dependent |= dependency_index.get_dependents_under(path_new)
+
+    for path_old in list_dir_deleted:
+        set_output_old = process.list_output_files(dir_dest, path_old)
+        set_path_dependent |= dependency_index.get_dependents_under(path_old)
+        path_new = next(
+            (
+                path_dir
+                for path_dir, dict_output in dict_added_outputs.items()
+                if set(dict_output) == set_output_old
+                and is_same_sources(build_config, manifest, path_old, path_dir, dict_output)
+            ),
+            None,
+        )
+
+        if path_new is None:
+            dependency_index.pop_html_under(path_old)
+            process.delete_output_dir(dir_dest, path_old)
+            for page_index in get_page_indexes(render_options):
+                page_index.remove_under(path_old)
+        else:
+            list_dir_renamed.append(path_new)
+            for path_dir in list(dict_added_outputs):
+                if path_dir.is_relative_to(path_new):
+                    del dict_added_outputs[path_dir]
+            process.move_output_dir(dir_dest, path_old, path_new)
+            for page_index in get_page_indexes(render_options):
+                page_index.move_under(path_old, path_new)
+            same_parent = path_old.parent == path_new.parent
+            for path_html, dependencies in dependency_index.pop_html_under(
+                path_old
+            ).items():
+                path_html_new = path_new / path_html.relative_to(path_old)
+                if (
+                    any(
+                        path.is_relative_to(path_old)
+                        for path in dependencies.template_paths
+                    )
+                    or (dependencies.markdown_paths and not same_parent)
+                    or (dependencies.image_paths and not same_parent)
+                    or dependencies.collection_paths
+                ):
+                    dependencies = process.build_html(
+                        FileProcessInfo(
+                            path=dir_src / path_html_new,
+                            dir_src=dir_src,
+                            dir_dest=dir_dest,
+                        ),
+                        **render_options,
+                    )
+                else:
+                    dependencies = RenderDependencies(
+                        markdown_paths={
+                            path_new / path.relative_to(path_old)
+                            if path.is_relative_to(path_old)
+                            else path
+                            for path in dependencies.markdown_paths
+                        },
+                        template_paths=dependencies.template_paths,
+                        data_paths=dependencies.data_paths,
+                        image_paths={
+                            path_new / path.relative_to(path_old)
+                            if path.is_relative_to(path_old)
+                            else path
+                            for path in dependencies.image_paths
+                        },
+                    )
+                dependency_index.update_html(path_html_new, dependencies)
+            list_file_change_result.append(
+                FileChangeResult(
+                    path=str(path_new),
+                    type="build",
+                    change=Change.added,
+                    count=len(set_output_old),
+                )
+            )
+
+        list_file_change_result.append(
+            FileChangeResult(
+                path=str(path_old),
+                type="build",
+                change=Change.deleted,
+                count=len(set_output_old),
+            )
+        )
+
+    list_dir_added = select_topmost(list(dict_added_outputs))
+    for path_new in list_dir_added:
+        dict_output = {
+            path_output: kind
+            for path_output, kind in dict_added_outputs[path_new].items()
+            if not any(
+                (path_new / path_output).is_relative_to(path_dir)
+                for path_dir in list_dir_renamed
+            )
+        }
+        if not dict_output:
+            continue
+        for path_output, kind in sorted(dict_output.items()):
+            file_process_info = FileProcessInfo(
+                path=dir_src / path_new / path_output,
+                dir_src=dir_src,
+                dir_dest=dir_dest,
+            )
+            if kind == "build":
+                dependency_index.update_html(
+                    path_new / path_output,
+                    process.build_html(file_process_info, **render_options),
+                )
+            else:
+                process.copy_file(file_process_info)
+                if render_options.get("link_checker") is not None:
+                    render_options["link_checker"].add_output(path_new / path_output)
+        list_file_change_result.append(
+            FileChangeResult(
+                path=str(path_new),
+                type="build",
+                change=Change.added,
+                count=len(dict_output),
+            )
+        )
+
+    list_dir_handled = list_dir_deleted + list_dir_added + list_dir_renamed
+    for path_html in sorted(set_path_dependent):
+        if any(path_html.is_relative_to(path_dir) for path_dir in list_dir_handled):
+            continue
+        dependency_index.update_html(
+            path_html,
+            process.build_html(
+                FileProcessInfo(
+                    path=dir_src / path_html,
+                    dir_src=dir_src,
+                    dir_dest=dir_dest,
+                ),
+                **render_options,
+            ),
+        )
+        list_file_change_result.append(
+            FileChangeResult(path=str(path_html), type="build", change=Change.modified)
+        )
+
+    set_file_change = {
+        (change, path)
+        for change, path in set_file_change
+        if not any(
+            Path(path).relative_to(dir_src_resolved).is_relative_to(path_dir)
+            for path_dir in list_dir_handled
+        )
+    }
+    return list_file_change_result, set_file_change
+
+
+# Bulk-rebuild batch whose pages a worker process rendered last.
+_worker_batch: int | None = None
+
+
+def build_html_task(
+    build_config: WatchConfig | ServerConfig, path_html: Path, batch: int = 0
+) -> RenderDependencies:
+    """Render one page inside a bulk-rebuild worker process.
+
+    The search index, sitemap, and link checker live in the watcher process,
+    which indexes the page from its output once the worker returns. Workers
+    outlive a batch, so the collection index is rescanned on the first page of
+    each ``batch`` to see pages added or deleted since the previous one.
+    """
+    global _worker_batch
+    file_process_info = FileProcessInfo(
+        path=Path(build_config.dir_src) / path_html,
+        dir_src=Path(build_config.dir_src),
+        dir_dest=Path(build_config.dir_dest),
+    )
+    render_options = process.get_render_options(build_config)
+    for name in ("search_index", "sitemap", "link_checker"):
+        render_options[name] = None
+    if batch != _worker_batch:
+        render_options["collection_index"].invalidate()
+        _worker_batch = batch
+    return process.build_html(file_process_info, **render_options)
+
+
+def create_bulk_executor(build_config: WatchConfig | ServerConfig) -> ProcessPoolExecutor:
+    """Create the worker pool used for bulk rebuilds.
+
+    Workers are spawned rather than forked because the watcher process runs
+    the logging listener and event-loop threads.
+    """
+    return ProcessPoolExecutor(
+        max_workers=build_config.burst_workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def plan_bulk_rebuild(
+    build_config: WatchConfig | ServerConfig,
+    list_file_change: Set[FileChange],
+    dependency_index: DependencyIndex,
+) -> Tuple[Set[Path], Set[Path]]:
+    """Collect the pages a large change batch requires rebuilding or deleting.
+
+    Every page appears once no matter how many of its templates and Markdown
+    includes changed. Added/modified/deleted events for the same path collapse
+    to the file's final state on disk. Added and deleted pages, and pages whose
+    front matter changed, also rebuild the pages listing their collections.
+
+    Returns
+    -------
+    tuple of set of pathlib.Path
+        Source-relative pages to render and pages whose output to delete.
+    """
+    dir_src = Path(build_config.dir_src)
+    dir_src_resolved = dir_src.resolve()
+    list_exclude_regex = [re.compile(regex) for regex in build_config.exclude]
+    collection_index = get_collection_index(build_config.dir_src, build_config.exclude)
+    set_path_build: Set[Path] = set()
+    set_path_delete: Set[Path] = set()
+
+    for _change, path in list_file_change:
+        path_rel = Path(path).relative_to(dir_src_resolved)
+        if path_rel.suffix == ".html":
+            if process.should_build_html(
+                path=path_rel, list_exclude_regex=list_exclude_regex
+            ):
+                if (dir_src / path_rel).is_file():
+                    set_path_build.add(path_rel)
+                    is_collection_changed = collection_index.update(path_rel)
+                else:
+                    set_path_delete.add(path_rel)
+                    is_collection_changed = collection_index.remove(path_rel)
+                if is_collection_changed:
+                    set_path_build |= dependency_index.get_collection_dependents(path_rel)
+                continue
+            set_path_build |= dependency_index.get_template_dependents(path_rel)
+        elif path_rel.suffix == ".md":
+            set_path_build |= dependency_index.get_markdown_dependents(path_rel)
+        elif is_data_path(path_rel, build_config.data_dir):
+            set_path_build |= dependency_index.get_data_dependents(path_rel)
+
+    return set_path_build - set_path_delete, set_path_delete
+
+
+_bulk_batches = itertools.count()
+
+
+async def run_bulk_rebuild(
+    build_config: WatchConfig | ServerConfig,
+    list_file_change: Set[FileChange],
+    dependency_index: DependencyIndex,
+    executor: ProcessPoolExecutor,
+    render_options: Dict | None = None,
+) -> FileChangeResult | None:
+    """Apply a large change batch as one planned, parallel rebuild.
+
+    Pages that fail to render are logged and skipped so one broken page does
+    not stop the rest of the batch. The search index and sitemap of
+    ``render_options`` are updated for rendered and deleted pages.
+
+    Returns
+    -------
+    FileChangeResult or None
+        One result summarizing every rendered and deleted page, or ``None``
+        when the batch affected no page.
+    """
+    time_start = time.perf_counter()
+    set_path_build, set_path_delete = plan_bulk_rebuild(
+        build_config, list_file_change, dependency_index
+    )
+    if not set_path_build and not set_path_delete:
+        return None
+    list_page_index = get_page_indexes(render_options or {})
+    batch = next(_bulk_batches)
+
+    for path_html in set_path_delete:
+        dependency_index.remove_html(path_html)
+        for page_index in list_page_index:
+            page_index.remove(path_html)
+        process.delete_file(
+            FileProcessInfo(
+                path=Path(build_config.dir_src) / path_html,
+                dir_src=Path(build_config.dir_src),
+                dir_dest=Path(build_config.dir_dest),
+            )
+        )
+
+    list_path_build = sorted(set_path_build)
+    loop = asyncio.get_running_loop()
+    list_result = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                executor, build_html_task, build_config, path_html, batch
+            )
+            for path_html in list_path_build
+        ),
+        return_exceptions=True,
+    )
+    count_failed = 0
+    for path_html, result in zip(list_path_build, list_result):
+        if isinstance(result, BaseException):
+            count_failed += 1
+            logger.error("Bulk rebuild failed for '%s': %s", path_html, result)
+            continue
+        dependency_index.update_html(path_html, result)
+        if list_page_index:
+            index_built_page(build_config, render_options, path_html, result)
+
+    logger.info(
+        "Bulk rebuild of %d change(s): %d page(s) rendered, %d failed, %d deleted in %s",
+        len(list_file_change),
+        len(list_path_build) - count_failed,
+        count_failed,
+        len(set_path_delete),
+        format_duration(time.perf_counter() - time_start),
+    )
+    return FileChangeResult(
+        path=".",
+        type="build",
+        change=Change.modified,
+        count=len(list_path_build) + len(set_path_delete),
+    )
+
+
+def rebuild_dependent(
+    build_config: WatchConfig | ServerConfig,
+    path_html: Path,
+    dependency_index: DependencyIndex,
+    render_options: Dict,
+) -> bool:
+    """Render a page affected by another file's change.
+
+    Like ``run_bulk_rebuild``, a page that fails to render, for example a
+    listing whose collection directory was just deleted, is logged and
+    skipped so it does not stop the watcher.
+
+    Returns
+    -------
+    bool
+        ``True`` when the page was rendered.
+    """
+    try:
+        dependencies = process.build_html(
+            FileProcessInfo(
+                path=Path(build_config.dir_src) / path_html,
+                dir_src=Path(build_config.dir_src),
+                dir_dest=Path(build_config.dir_dest),
+            ),
+            **render_options,
+        )
+    except Exception as error:
+        logger.error("Rebuild failed for '%s': %s", path_html, error)
+        return False
+    dependency_index.update_html(path_html, dependencies)
+    return True
+
+
 async def handle_async_list_build_change(
     build_config: WatchConfig | ServerConfig,
-    async_list_build_file_change: AsyncGenerator[Set[FileChange]],
+    async_list_build_file_change: AsyncGenerator[Set[FileChange], None],
     dependency_index: DependencyIndex,
-) -> AsyncGenerator[List[FileChangeResult]]:
+) -> AsyncGenerator[List[FileChangeResult], None]:
     """Handle HTML/Markdown file change events and produce FileChangeResult lists.
 
     This async generator consumes batches of ``watchfiles`` changes for files
@@ -97,6 +687,15 @@ async def handle_async_list_build_change(
     - Added/Modified HTML files: ``process.build_html``
     - Markdown files: rebuild known dependent HTML files when present in the
       dependency index
+    - Added, deleted, or front-matter-changed HTML pages also rebuild the
+      pages listing their collections, once per batch
+
+    Pages rebuilt because a file they use changed are logged and skipped when
+    they fail to render, as in ``run_bulk_rebuild``.
+
+    Batches of at least ``build_config.burst_threshold`` changes are handed to
+    ``run_bulk_rebuild`` instead, which renders each affected page once across
+    a process pool and yields a single summarized result.
 
     Parameters
     ----------
@@ -119,57 +718,130 @@ async def handle_async_list_build_change(
     async_list_file_change = (
         list_file_change async for list_file_change in async_list_build_file_change
     )
+    render_options = process.get_render_options(build_config)
+    list_page_index = get_page_indexes(render_options)
+    collection_index = render_options["collection_index"]
+    executor: ProcessPoolExecutor | None = None
 
-    async for list_file_change in async_list_file_change:
-        list_file_change_result: list[FileChangeResult] = []
-        for change, path in list_file_change:
-            path_rel = Path(path).relative_to(Path(build_config.dir_src).resolve())
-            list_exclude_regex = [re.compile(regex) for regex in build_config.exclude]
+    dir_src_resolved = Path(build_config.dir_src).resolve()
+    list_exclude_regex = [re.compile(regex) for regex in build_config.exclude]
 
-            if path_rel.suffix == ".html":
-                if process.should_build_html(
-                    path=path_rel,
-                    list_exclude_regex=list_exclude_regex,
-                ):
-                    file_process_info = FileProcessInfo(
-                        path=Path(path),
-                        dir_src=Path(build_config.dir_src),
-                        dir_dest=Path(build_config.dir_dest),
+    try:
+        async for list_file_change in async_list_file_change:
+            time_start = time.perf_counter()
+            list_directory_result, list_file_change = handle_directory_changes(
+                build_config, list_file_change, dependency_index, render_options
+            )
+            if list_directory_result:
+                yield list_directory_result
+
+            if len(list_file_change) >= build_config.burst_threshold:
+                if executor is None:
+                    executor = create_bulk_executor(build_config)
+                file_change_result = await run_bulk_rebuild(
+                    build_config,
+                    list_file_change,
+                    dependency_index,
+                    executor,
+                    render_options=render_options,
+                )
+                for page_index in list_page_index:
+                    page_index.save()
+                observe_batch("build", len(list_file_change), time_start)
+                if file_change_result is not None:
+                    yield [file_change_result]
+                continue
+
+            list_file_change_result: list[FileChangeResult] = []
+            set_path_collection_dependent: Set[Path] = set()
+            for change, path in list_file_change:
+                path_rel = Path(path).relative_to(dir_src_resolved)
+
+                if path_rel.suffix == ".html":
+                    if process.should_build_html(
+                        path=path_rel,
+                        list_exclude_regex=list_exclude_regex,
+                    ):
+                        file_process_info = FileProcessInfo(
+                            path=Path(path),
+                            dir_src=Path(build_config.dir_src),
+                            dir_dest=Path(build_config.dir_dest),
+                        )
+                        is_collection_changed = False
+                        if change == Change.deleted:
+                            dependency_index.remove_html(path_rel)
+                            process.delete_file(file_process_info)
+                            for page_index in list_page_index:
+                                page_index.remove(path_rel)
+                            is_collection_changed = collection_index.remove(path_rel)
+                        elif change in {Change.modified, Change.added}:
+                            is_collection_changed = collection_index.update(path_rel)
+                            dependencies = process.build_html(
+                                file_process_info, **render_options
+                            )
+                            dependency_index.update_html(path_rel, dependencies)
+                        if is_collection_changed:
+                            set_path_collection_dependent |= (
+                                dependency_index.get_collection_dependents(path_rel)
+                            )
+
+                        list_file_change_result.append(
+                            FileChangeResult(
+                                path=str(path_rel),
+                                type="build",
+                                change=change,
+                            )
+                        )
+                        continue
+
+                    dependent_html_paths = dependency_index.get_template_dependents(
+                        path_rel
                     )
-                    if change == Change.deleted:
-                        dependency_index.remove_html(path_rel)
-                        process.delete_file(file_process_info)
-                    elif change in {Change.modified, Change.added}:
-                        dependencies = process.build_html(file_process_info)
-                        dependency_index.update_html(path_rel, dependencies)
+                    if not dependent_html_paths:
+                        logger.info(
+                            "Skipping template rebuild for '%s': no known dependent HTML files",
+                            path_rel,
+                        )
+                        continue
 
-                    list_file_change_result.append(
-                        FileChangeResult(
-                            path=str(path_rel),
-                            type="build",
-                            change=change,
+                    for path_html in sorted(dependent_html_paths):
+                        if not rebuild_dependent(
+                            build_config, path_html, dependency_index, render_options
+                        ):
+                            continue
+                        list_file_change_result.append(
+                            FileChangeResult(
+                                path=str(path_html),
+                                type="build",
+                                change=change,
+                            )
                         )
+                    continue
+
+                if path_rel.suffix == ".md":
+                    dependent_html_paths = dependency_index.get_markdown_dependents(
+                        path_rel
                     )
+                    kind = "Markdown"
+                elif is_data_path(path_rel, build_config.data_dir):
+                    dependent_html_paths = dependency_index.get_data_dependents(path_rel)
+                    kind = "data"
+                else:
                     continue
 
-                dependent_html_paths = dependency_index.get_template_dependents(
-                    path_rel
-                )
                 if not dependent_html_paths:
                     logger.info(
-                        "Skipping template rebuild for '%s': no known dependent HTML files",
+                        "Skipping %s rebuild for '%s': no known dependent HTML files",
+                        kind,
                         path_rel,
                     )
                     continue
 
                 for path_html in sorted(dependent_html_paths):
-                    file_process_info = FileProcessInfo(
-                        path=Path(build_config.dir_src) / path_html,
-                        dir_src=Path(build_config.dir_src),
-                        dir_dest=Path(build_config.dir_dest),
-                    )
-                    dependencies = process.build_html(file_process_info)
-                    dependency_index.update_html(path_html, dependencies)
+                    if not rebuild_dependent(
+                        build_config, path_html, dependency_index, render_options
+                    ):
+                        continue
                     list_file_change_result.append(
                         FileChangeResult(
                             path=str(path_html),
@@ -177,43 +849,36 @@ async def handle_async_list_build_change(
                             change=change,
                         )
                     )
-                continue
-
-            if path_rel.suffix != ".md":
-                continue
-
-            dependent_html_paths = dependency_index.get_markdown_dependents(path_rel)
-            if not dependent_html_paths:
-                logger.info(
-                    "Skipping Markdown rebuild for '%s': no known dependent HTML files",
-                    path_rel,
-                )
-                continue
 
-            for path_html in sorted(dependent_html_paths):
-                file_process_info = FileProcessInfo(
-                    path=Path(build_config.dir_src) / path_html,
-                    dir_src=Path(build_config.dir_src),
-                    dir_dest=Path(build_config.dir_dest),
-                )
-                dependencies = process.build_html(file_process_info)
-                dependency_index.update_html(path_html, dependencies)
+            set_path_rebuilt = {Path(result.path) for result in list_file_change_result}
+            for path_html in sorted(set_path_collection_dependent - set_path_rebuilt):
+                if not rebuild_dependent(
+                    build_config, path_html, dependency_index, render_options
+                ):
+                    continue
                 list_file_change_result.append(
                     FileChangeResult(
                         path=str(path_html),
                         type="build",
-                        change=change,
+                        change=Change.modified,
                     )
                 )
 
-        if list_file_change_result:
-            yield list_file_change_result
+            for page_index in list_page_index:
+                page_index.save()
+            observe_batch("build", len(list_file_change), time_start)
+            if list_file_change_result:
+                yield list_file_change_result
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 async def handle_async_list_copy_change(
     server_config: WatchConfig | ServerConfig,
-    async_copy_list_file_change: AsyncGenerator[Set[FileChange]],
-) -> AsyncGenerator[List[FileChangeResult]]:
+    async_copy_list_file_change: AsyncGenerator[Set[FileChange], None],
+    dependency_index: DependencyIndex | None = None,
+) -> AsyncGenerator[List[FileChangeResult], None]:
     """Handle copy-asset change events and produce FileChangeResult lists.
 
     This async generator consumes batches of `watchfiles` changes for files
@@ -222,12 +887,23 @@ async def handle_async_list_copy_change(
     - Deleted files: `process.delete_file`
     - Added/Modified files: `process.copy_file`
 
+    Images matched by the `image` patterns have their variants rewritten or
+    deleted. Pages passing a changed image to `srcset()` are then rebuilt
+    once per batch, since an edit can change which widths fit the image and
+    its dimensions.
+
+    Batches of at least ``burst_threshold`` changes are reported as a single
+    summarized result.
+
     Parameters
     ----------
     build_config : BuildConfig
         Build configuration with `dir_src` and `dir_dest`.
     async_copy_list_file_change : AsyncGenerator[set of FileChange]
         Async generator yielding sets of `(Change, path)` tuples from watchfiles.
+    dependency_index : DependencyIndex, optional
+        Dependency graph used to find the pages using a changed image. When
+        omitted, no page is rebuilt.
 
     Yields
     ------
@@ -237,21 +913,74 @@ async def handle_async_list_copy_change(
     async_list_file_change = (
         list_file_change async for list_file_change in async_copy_list_file_change
     )
+    link_checker = get_link_checker(
+        server_config.dir_dest, server_config.check_links, server_config.site_url
+    )
+    image_processor = get_image_processor(
+        server_config.dir_dest,
+        server_config.image,
+        server_config.image_cache,
+        server_config.image_widths,
+        server_config.image_formats,
+        server_config.image_quality,
+    )
+    list_copy_regex = [re.compile(regex) for regex in server_config.copy]
+    list_image_regex = [re.compile(regex) for regex in server_config.image]
+    list_exclude_regex = [re.compile(regex) for regex in server_config.exclude]
+    render_options = process.get_render_options(server_config)
 
     async for list_file_change in async_list_file_change:
+        time_start = time.perf_counter()
         list_file_change_result: list[FileChangeResult] = []
+        set_path_image_dependent: Set[Path] = set()
         for change, path in list_file_change:
             file_process_info = FileProcessInfo(
                 path=Path(path),
                 dir_src=Path(server_config.dir_src),
                 dir_dest=Path(server_config.dir_dest),
             )
+            path_rel = Path(path).relative_to(Path(server_config.dir_src).resolve())
+            list_path_output: List[Path] = []
+            is_image = process.should_process_image(
+                path=path_rel,
+                list_image_regex=list_image_regex,
+                list_exclude_regex=list_exclude_regex,
+            )
+            is_copy = process.should_copy_path(
+                path=path_rel,
+                list_copy_regex=list_copy_regex,
+                list_exclude_regex=list_exclude_regex,
+            )
             if change == Change.deleted:
-                process.delete_file(file_process_info)
+                if is_copy:
+                    process.delete_file(file_process_info)
+                    list_path_output.append(path_rel)
+                if is_image:
+                    list_path_output += image_processor.remove(
+                        Path(server_config.dir_dest), path_rel
+                    )
+                if link_checker is not None:
+                    for path_output in list_path_output:
+                        link_checker.remove(path_output)
             elif (change == Change.modified) or (change == Change.added):
-                process.copy_file(file_process_info)
+                if is_copy:
+                    process.copy_file(file_process_info)
+                    list_path_output.append(path_rel)
+                if is_image:
+                    dict_image_output = image_processor.run(
+                        Path(server_config.dir_src),
+                        Path(server_config.dir_dest),
+                        [path_rel],
+                        workers=server_config.image_workers,
+                    )
+                    list_path_output += dict_image_output[path_rel]
+                if link_checker is not None:
+                    for path_output in list_path_output:
+                        link_checker.add_output(path_output)
+
+            if dependency_index is not None:
+                set_path_image_dependent |= dependency_index.get_image_dependents(path_rel)
 
-            path_rel = Path(path).relative_to(Path(server_config.dir_src).resolve())
             list_file_change_result.append(
                 FileChangeResult(
                     path=str(path_rel),
@@ -259,13 +988,45 @@ async def handle_async_list_copy_change(
                     change=change,
                 )
             )
+        if dependency_index is not None and set_path_image_dependent:
+            for path_html in sorted(set_path_image_dependent):
+                dependencies = process.build_html(
+                    FileProcessInfo(
+                        path=Path(server_config.dir_src) / path_html,
+                        dir_src=Path(server_config.dir_src),
+                        dir_dest=Path(server_config.dir_dest),
+                    ),
+                    **render_options,
+                )
+                dependency_index.update_html(path_html, dependencies)
+                list_file_change_result.append(
+                    FileChangeResult(
+                        path=str(path_html),
+                        type="build",
+                        change=Change.modified,
+                    )
+                )
+            for page_index in get_page_indexes(render_options):
+                page_index.save()
+        if link_checker is not None:
+            link_checker.report()
+        observe_batch("copy", len(list_file_change), time_start)
+        if len(list_file_change_result) >= server_config.burst_threshold:
+            list_file_change_result = [
+                FileChangeResult(
+                    path=".",
+                    type="copy",
+                    change=Change.modified,
+                    count=len(list_file_change_result),
+                )
+            ]
         yield list_file_change_result
 
 
 async def handle_async_watch_list_change(
     build_config: WatchConfig | ServerConfig,
-    async_watch_list_file_change: AsyncGenerator[Set[FileChange]],
-) -> AsyncGenerator[List[FileChangeResult]]:
+    async_watch_list_file_change: AsyncGenerator[Set[FileChange], None],
+) -> AsyncGenerator[List[FileChangeResult], None]:
     """Handle changes under the destination tree that should be forwarded to clients.
 
     This async generator watches extra paths matched by ``watch_add`` and emits
@@ -307,13 +1068,14 @@ async def handle_async_watch_list_change(
 async def run(
     server_config: WatchConfig | ServerConfig,
     dependency_index: DependencyIndex | None = None,
-) -> AsyncGenerator[List[FileChangeResult]]:
+) -> AsyncGenerator[List[FileChangeResult], None]:
     """Compose and run watchers according to the provided build configuration.
 
     This function sets up three watcher streams:
-    - HTML/Markdown watcher over ``dir_src``, matching ``.html`` and ``.md``.
+    - HTML/Markdown watcher over ``dir_src``, matching ``.html`` and ``.md``
+      files and directories, so it also owns directory deletes and renames.
     - Copy watcher over ``dir_src``, matching non-HTML paths selected by
-      ``build_config.copy``.
+      ``build_config.copy`` or ``build_config.image``.
     - Watcher over the current working directory matching ``watch_add``.
 
     Each watch stream is filtered with ``WatchFilter`` so that only relevant
@@ -321,7 +1083,8 @@ async def run(
     synchronous processing (build/copy/delete) and yield ``FileChangeResult``
     lists which are merged into a single async stream by
     ``aiostream.stream.merge``. HTML rebuild dependency information is kept in a
-    process-local ``DependencyIndex``.
+    process-local ``DependencyIndex``. Every ``awatch`` call uses the
+    configured ``debounce_ms`` and ``step_ms`` batching timings.
 
     Parameters
     ----------
@@ -340,36 +1103,62 @@ async def run(
         dependency_index = DependencyIndex()
 
     list_build_regex = [re.compile(r".*\.html$"), re.compile(r".*\.md$")]
+    if server_config.data_dir is not None:
+        list_build_regex.append(
+            re.compile(
+                rf"{re.escape(Path(server_config.data_dir).as_posix())}/.*"
+                rf"({'|'.join(re.escape(suffix) for suffix in DATA_SUFFIXES)})$"
+            )
+        )
     list_copy_regex = [re.compile(copy_regex) for copy_regex in server_config.copy]
+    list_image_regex = [re.compile(regex) for regex in server_config.image]
     list_watch_regex = [re.compile(regex) for regex in server_config.watch_add]
     list_exclude_regex = [re.compile(regex) for regex in server_config.exclude]
+    dir_src = Path(server_config.dir_src)
+    dir_dest = Path(server_config.dir_dest)
 
     async_list_build_change = awatch(
         server_config.dir_src,
+        debounce=server_config.debounce_ms,
+        step=server_config.step_ms,
         watch_filter=WatchFilter(
             dir_base=Path(server_config.dir_src).resolve(),
             path_validator=lambda path: process.is_valid_path(
                 path=path,
                 list_regex=list_build_regex,
                 list_exclude_regex=list_exclude_regex,
-            ),
+            )
+            or is_directory_path(path, dir_src, dir_dest),
         ),
     )
 
     async_list_copy_change = awatch(
         server_config.dir_src,
+        debounce=server_config.debounce_ms,
+        step=server_config.step_ms,
         watch_filter=WatchFilter(
             dir_base=Path(server_config.dir_src).resolve(),
-            path_validator=lambda path: process.should_copy_path(
-                path=path,
-                list_copy_regex=list_copy_regex,
-                list_exclude_regex=list_exclude_regex,
-            ),
+            # Directory events are handled by the build watcher.
+            path_validator=lambda path: (
+                process.should_copy_path(
+                    path=path,
+                    list_copy_regex=list_copy_regex,
+                    list_exclude_regex=list_exclude_regex,
+                )
+                or process.should_process_image(
+                    path=path,
+                    list_image_regex=list_image_regex,
+                    list_exclude_regex=list_exclude_regex,
+                )
+            )
+            and not is_directory_path(path, dir_src, dir_dest),
         ),
     )
 
     async_watch_list_change = awatch(
         Path.cwd(),
+        debounce=server_config.debounce_ms,
+        step=server_config.step_ms,
         watch_filter=WatchFilter(
             dir_base=Path.cwd().resolve(),
             path_validator=lambda path: process.matches_any(
@@ -385,7 +1174,9 @@ async def run(
             async_list_build_change,
             dependency_index,
         ),
-        handle_async_list_copy_change(server_config, async_list_copy_change),
+        handle_async_list_copy_change(
+            server_config, async_list_copy_change, dependency_index
+        ),
         handle_async_watch_list_change(server_config, async_watch_list_change),
     )
 
@@ -46,6 +46,7 @@ from fastapi import (
 from fastapi.responses import (
     HTMLResponse,
     FileResponse,
+    PlainTextResponse,
     StreamingResponse,
 )
 import dacite
@@ -53,13 +54,27 @@ import logging
 
 # lib: local
 from .template import get_template
+from .util.collection import PageEntry
+from .util.frontmatter import get_front_matter
+from .util.process import get_template_options
 from .util.dataclass import ServerConfig
+from .util.metrics import MetricsRegistry, metrics
 from .core.deps import DependencyIndex
 from .core.watch import run as watch_run
 
 
 logger = logging.getLogger(__name__)
 set_queue_clients = set()
+METRICS_URL = "/__engrave/metrics"
+
+
+def collect_sse_metrics(registry: MetricsRegistry) -> None:
+    """Report connected SSE clients and pending queue depth at scrape time."""
+    registry.set("engrave_sse_clients", len(set_queue_clients))
+    registry.set(
+        "engrave_sse_queue_depth",
+        sum(queue.qsize() for queue in set_queue_clients),
+    )
 
 
 async def publish_queue_put(data, set_queue_clients):
@@ -124,8 +139,12 @@ def create_fastapi(
     - A streaming SSE endpoint at `/__engrave/watch` that streams file-change
       events as JSON-encoded lists of `FileChangeResult` dictionaries.
     - A dynamic renderer for `.html` requests that renders templates from the
-      source directory and falls back to an error template on exceptions.
+      source directory with Jinja's async mode, so slow pages do not block
+      other requests or SSE streams, and falls back to an error template on
+      exceptions.
     - A static file responder for other paths that serves files from `dir_dest`.
+    - When ``server_config.metrics`` is enabled, a Prometheus-format metrics
+      endpoint at `/__engrave/metrics`.
 
     Parameters
     ----------
@@ -204,6 +223,18 @@ def create_fastapi(
 
     fast_api = FastAPI(lifespan=lifespan)
 
+    if server_config.metrics:
+        metrics.enable()
+        if collect_sse_metrics not in metrics.collectors:
+            metrics.add_collector(collect_sse_metrics)
+
+        @fast_api.get(METRICS_URL)
+        async def metrics_endpoint():
+            return PlainTextResponse(
+                metrics.render_prometheus(),
+                media_type="text/plain; version=0.0.4",
+            )
+
     @fast_api.get(server_config.sse_url)
     async def event_watch():
         logger.info("SSE Request")
@@ -225,8 +256,24 @@ def create_fastapi(
         if path.suffix != ".html":
             return FileResponse(Path(server_config.dir_dest) / path)
         try:
-            template = get_template(dir_src=Path(server_config.dir_src))
-            return HTMLResponse(template(str(path)).render())
+            template = get_template(
+                dir_src=Path(server_config.dir_src),
+                enable_async=True,
+                **get_template_options(server_config),
+            )
+            with metrics.timer(
+                "engrave_render_seconds",
+                labels={"page": path.as_posix(), "mode": "server"},
+            ):
+                # Load off-loop, then render with awaitable markdown() includes.
+                template_page = await asyncio.to_thread(template, str(path))
+                meta = await asyncio.to_thread(
+                    get_front_matter, Path(server_config.dir_src) / path
+                )
+                html = await template_page.render_async(
+                    page=PageEntry(path=path, url=path.name, meta=meta)
+                )
+            return HTMLResponse(html)
         except Exception as error:
             message = str(error)
             tb = traceback.format_exc()
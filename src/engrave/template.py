@@ -3,16 +3,42 @@
 The public ``get_template()`` helper keeps the existing ergonomic API while an
 internal ``TemplateEngine`` class owns the render-time state used for template
 loading, Markdown resolution, and optional Markdown dependency recording.
+
+Templates may wrap expensive blocks in ``{% cache "key", vary_on... %}`` ...
+``{% endcache %}``. The rendered block is kept in a ``FragmentCache`` shared
+by every page of a source root in the process, under the template name, the
+key, and the ``vary_on`` values, together with the templates, Markdown and
+data files the block used. Later pages reuse it while none of those files changed,
+and still report them as their own dependencies.
+
+Front matter at the top of a template is not rendered, see
+``engrave.util.frontmatter``; the ``collection()`` global lists pages with
+their front matter, see ``engrave.util.collection``.
 """
 
+import asyncio
+import posixpath
+from collections import OrderedDict
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from hashlib import sha1
 from pathlib import Path
-from typing import cast
+from typing import TYPE_CHECKING, cast
 
 import jinja2  # type: ignore
+import jinja2.ext  # type: ignore
 import mistune  # type: ignore
-from markupsafe import Markup
+from markupsafe import Markup, escape
+
+from .util.collection import CollectionIndex, PageEntry
+from .util.data import DataNamespace, FileSignature, get_file_signature, get_site_data
+from .util.frontmatter import mask_front_matter
+from .util.metrics import metrics
+from .util.profile import profiler
+
+if TYPE_CHECKING:
+    # util.image imports util.cache, which imports this module.
+    from .util.image import ImageProcessor
 
 
 @dataclass(frozen=True)
@@ -21,23 +47,60 @@ class RenderDependencies:
 
     markdown_paths: set[Path]
     template_paths: set[Path]
+    # Data files read and data directories listed through the ``data`` global.
+    data_paths: set[Path] = field(default_factory=set)
+    # Directories whose pages were listed through the ``collection()`` global.
+    collection_paths: set[Path] = field(default_factory=set)
+    # Images passed to the ``srcset()`` global.
+    image_paths: set[Path] = field(default_factory=set)
+
+
+_module_loaders: dict[Path, jinja2.ModuleLoader] = {}
+
+
+def get_module_loader(path_compiled: str | Path) -> jinja2.ModuleLoader:
+    """Return the shared ``ModuleLoader`` for a precompiled template bundle.
+
+    ``ModuleLoader`` keeps imported template modules on the loader instance,
+    so sharing one instance per bundle lets every page rendered in the process
+    reuse modules imported by earlier pages.
+    """
+    path_compiled = Path(path_compiled).resolve()
+    module_loader = _module_loaders.get(path_compiled)
+    if module_loader is None:
+        module_loader = _module_loaders[path_compiled] = jinja2.ModuleLoader(
+            str(path_compiled)
+        )
+    return module_loader
 
 
 class TrackingLoader(jinja2.BaseLoader):
-    """File-system loader wrapper that records resolved template dependencies."""
+    """Template loader wrapper that records resolved template dependencies.
+
+    Templates are read from ``dir_src`` with a ``FileSystemLoader`` unless
+    ``compiled_templates`` points at a bundle written by ``engrave compile``,
+    in which case they are imported from the bundle with a ``ModuleLoader``
+    and only templates missing from the bundle are read from disk.
+    """
 
     def __init__(
         self,
         *,
         dir_src: Path,
         template_dependency_collector: Callable[[Path], None] | None = None,
+        compiled_templates: str | Path | None = None,
     ) -> None:
         self.dir_src = dir_src.resolve()
         self.template_dependency_collector = template_dependency_collector
         self.loader = jinja2.FileSystemLoader(str(dir_src))
+        self.module_loader = None
+        if compiled_templates is not None:
+            self.module_loader = get_module_loader(compiled_templates)
 
     def get_source(self, environment, template):
         source, filename, uptodate = self.loader.get_source(environment, template)
+        metrics.inc("engrave_template_loads_total")
+        source = mask_front_matter(source)
 
         if self.template_dependency_collector is not None:
             path_template = Path(filename).resolve().relative_to(self.dir_src)
@@ -45,11 +108,236 @@ class TrackingLoader(jinja2.BaseLoader):
 
         return source, filename, uptodate
 
+    def load(self, environment, name, globals=None):
+        if self.module_loader is None:
+            return super().load(environment, name, globals)
+
+        try:
+            template = self.module_loader.load(environment, name, globals)
+        except jinja2.TemplateNotFound:
+            # Pages added after the bundle was compiled still render from disk.
+            return super().load(environment, name, globals)
+        metrics.inc("engrave_template_loads_total")
+        if self.template_dependency_collector is not None:
+            # Bundle names are the source-relative paths used at compile time.
+            self.template_dependency_collector(Path(name))
+        return template
+
     def list_templates(self):
         """Delegate template listing to the wrapped file-system loader."""
         return self.loader.list_templates()
 
 
+class SourceBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """Persistent bytecode cache keyed by template name and source checksum.
+
+    Entries live under a ``jinja2-<version>`` subdirectory so upgrading Jinja
+    never loads incompatible bytecode, the key separates sync and async
+    environments, and it ignores the absolute source
+    path so CI checkouts in different directories share entries. Writes go
+    through ``FileSystemBytecodeCache``'s temporary-file-and-rename dump, which
+    keeps the cache safe for concurrent builds and parallel workers.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        directory = Path(directory) / f"jinja2-{jinja2.__version__}"
+        directory.mkdir(parents=True, exist_ok=True)
+        super().__init__(directory=str(directory))
+
+    def get_bucket(self, environment, name, filename, source):
+        checksum = self.get_source_checksum(source)
+        # Async environments compile different code for the same source.
+        mode = "async" if environment.is_async else "sync"
+        key = sha1(f"{name}\0{checksum}\0{mode}".encode("utf-8")).hexdigest()
+        bucket = jinja2.bccache.Bucket(environment, key, checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+
+_bytecode_caches: dict[Path, SourceBytecodeCache] = {}
+
+
+def get_bytecode_cache(directory: str | Path | None) -> SourceBytecodeCache | None:
+    """Return the shared bytecode cache for ``directory``.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path, optional
+        Cache directory. ``None`` disables bytecode caching.
+
+    Returns
+    -------
+    SourceBytecodeCache or None
+        The cache kept for ``directory``. The environments created for each
+        page share it instead of each setting up the versioned cache
+        directory.
+    """
+    if directory is None:
+        return None
+    path_directory = Path(directory).resolve()
+    bytecode_cache = _bytecode_caches.get(path_directory)
+    if bytecode_cache is None:
+        bytecode_cache = _bytecode_caches[path_directory] = SourceBytecodeCache(
+            path_directory
+        )
+    return bytecode_cache
+
+
+FRAGMENT_CACHE_MAX_ENTRIES = 4096
+
+
+@dataclass
+class FragmentEntry:
+    """One rendered ``{% cache %}`` block and the files it was rendered from."""
+
+    html: str
+    markdown_paths: dict[Path, FileSignature]
+    template_paths: dict[Path, FileSignature]
+    data_paths: dict[Path, FileSignature]
+    image_paths: dict[Path, FileSignature]
+    collection_paths: set[Path]
+    # Index the collections were listed from and its ``generation`` then.
+    collection_index: CollectionIndex | None = None
+    collection_generation: int = 0
+
+
+class FragmentCache:
+    """Least recently used store of rendered ``{% cache %}`` blocks.
+
+    Parameters
+    ----------
+    dir_src : pathlib.Path
+        Source root that dependency paths are relative to.
+    max_entries : int, optional
+        Number of fragments kept; least recently used ones are dropped.
+    """
+
+    def __init__(self, dir_src: Path, max_entries: int = FRAGMENT_CACHE_MAX_ENTRIES) -> None:
+        self.dir_src = dir_src
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple, FragmentEntry] = OrderedDict()
+
+    def get(
+        self, key: tuple, collection_index: CollectionIndex | None = None
+    ) -> FragmentEntry | None:
+        """Return a fragment whose dependencies are unchanged since it was stored."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        is_fresh = all(
+            get_file_signature(self.dir_src / path) == signature
+            for paths in (
+                entry.template_paths,
+                entry.markdown_paths,
+                entry.data_paths,
+                entry.image_paths,
+            )
+            for path, signature in paths.items()
+        ) and (
+            not entry.collection_paths
+            or (
+                collection_index is entry.collection_index
+                and collection_index.generation == entry.collection_generation
+            )
+        )
+        if not is_fresh:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(
+        self,
+        key: tuple,
+        html: str,
+        dependencies: RenderDependencies,
+        collection_index: CollectionIndex | None = None,
+    ) -> None:
+        """Store a rendered fragment with the current state of its dependencies."""
+
+        def get_signatures(paths: set[Path]) -> dict[Path, FileSignature]:
+            return {path: get_file_signature(self.dir_src / path) for path in paths}
+
+        if dependencies.collection_paths and collection_index is None:
+            return
+        self.entries[key] = FragmentEntry(
+            html=html,
+            markdown_paths=get_signatures(dependencies.markdown_paths),
+            template_paths=get_signatures(dependencies.template_paths),
+            data_paths=get_signatures(dependencies.data_paths),
+            image_paths=get_signatures(dependencies.image_paths),
+            collection_paths=set(dependencies.collection_paths),
+            collection_index=collection_index,
+            collection_generation=collection_index.generation if collection_index else 0,
+        )
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+_fragment_caches: dict[Path, FragmentCache] = {}
+
+
+def get_fragment_cache(dir_src: str | Path) -> FragmentCache:
+    """Return the shared fragment cache of a source root.
+
+    Fragments rendered by one page are reused by later pages of the build and
+    by watch rebuilds and preview requests, until a file they used changes.
+    """
+    path_directory = Path(dir_src).resolve()
+    fragment_cache = _fragment_caches.get(path_directory)
+    if fragment_cache is None:
+        fragment_cache = _fragment_caches[path_directory] = FragmentCache(path_directory)
+    return fragment_cache
+
+
+class FragmentCacheExtension(jinja2.ext.Extension):
+    """``{% cache "key", vary_on... %}`` blocks rendered once per key and values.
+
+    The block is rendered by ``TemplateEngine.render_fragment``, which the
+    engine installs on its environment.
+    """
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        list_arg = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            list_arg.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        call = self.call_method(
+            "_render_fragment",
+            [jinja2.nodes.Const(parser.name), jinja2.nodes.List(list_arg)],
+        )
+        return jinja2.nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_fragment(self, name, list_arg, caller):
+        return self.environment.render_fragment(name, list_arg, caller)
+
+
+class TrackingEnvironment(jinja2.Environment):
+    """Jinja environment that counts and profiles template lookups.
+
+    Jinja routes ``extends``/``include``/``import`` through ``get_template``, so
+    lookups counted here pair with the loads counted by ``TrackingLoader`` to
+    give the template cache hit ratio, and profiler spans here capture the
+    load and compile time of every template a page pulls in.
+    """
+
+    # Called with every looked-up template name, see ``TemplateEngine``.
+    lookup_collector: Callable[[str], None] | None = None
+
+    def get_template(self, name, *args, **kw) -> jinja2.Template:
+        metrics.inc("engrave_template_lookups_total")
+        if self.lookup_collector is not None and isinstance(name, str):
+            self.lookup_collector(name)
+        if not profiler.enabled:
+            return super().get_template(name, *args, **kw)
+        with profiler.span(str(getattr(name, "name", name)), "template"):
+            return super().get_template(name, *args, **kw)
+
+
 class TemplateEngine:
     """Stateful template environment for one source root."""
 
@@ -60,6 +348,14 @@ class TemplateEngine:
         markdown_to_html: Callable[[str], str] | None = None,
         markdown_dependency_collector: Callable[[Path], None] | None = None,
         template_dependency_collector: Callable[[Path], None] | None = None,
+        compiled_templates: str | Path | None = None,
+        image_processor: "ImageProcessor | None" = None,
+        data_dir: str | Path | None = None,
+        data_dependency_collector: Callable[[Path], None] | None = None,
+        collection_index: CollectionIndex | None = None,
+        collection_dependency_collector: Callable[[Path], None] | None = None,
+        image_dependency_collector: Callable[[Path], None] | None = None,
+        enable_async: bool = False,
         **kw,
     ) -> None:
         self.dir_src = Path(dir_src)
@@ -69,21 +365,156 @@ class TemplateEngine:
         self.markdown_to_html = cast(Callable[[str], str], markdown_to_html)
         self.markdown_dependency_collector = markdown_dependency_collector
         self.template_dependency_collector = template_dependency_collector
-        self.template_env = jinja2.Environment(
+        self.image_processor = image_processor
+        self.data_dependency_collector = data_dependency_collector
+        self.collection_index = collection_index
+        self.collection_dependency_collector = collection_dependency_collector
+        self.image_dependency_collector = image_dependency_collector
+        self.fragment_cache = get_fragment_cache(self.dir_src)
+        # Dependencies of the {% cache %} blocks being rendered, innermost last.
+        self.list_fragment_dependencies: list[RenderDependencies] = []
+        if enable_async:
+            # Bundles are compiled for synchronous rendering only.
+            compiled_templates = None
+        extensions = [*kw.pop("extensions", []), FragmentCacheExtension]
+        self.template_env = TrackingEnvironment(
             *args,
             **kw,
+            enable_async=enable_async,
+            extensions=extensions,
             loader=TrackingLoader(
                 dir_src=self.dir_src,
-                template_dependency_collector=template_dependency_collector,
+                template_dependency_collector=self.collect_template,
+                compiled_templates=compiled_templates,
             ),
         )
-        self.template_env.globals.update(markdown=self.markdown)
+        self.template_env.lookup_collector = self.collect_template_lookup
+        self.template_env.extend(render_fragment=self.render_fragment)
+        if enable_async:
+            self.template_env.globals.update(markdown=self.markdown_async)
+        else:
+            self.template_env.globals.update(markdown=self.markdown)
+        self.template_env.globals.update(srcset=self.srcset)
+        if data_dir is not None:
+            self.template_env.globals["data"] = DataNamespace(
+                get_site_data(self.dir_src), Path(data_dir), self.collect_data
+            )
+        if collection_index is not None:
+            self.template_env.globals.update(collection=self.collection)
         self.template_env.filters["markdown"] = self.markdown_inline
 
     def get_template(self, name: str) -> jinja2.Template:
         """Return a template by name from the configured environment."""
         return self.template_env.get_template(name)
 
+    def collect_template(self, path: Path) -> None:
+        """Record a template dependency of the page and of open fragments."""
+        if self.template_dependency_collector is not None:
+            self.template_dependency_collector(path)
+        for dependencies in self.list_fragment_dependencies:
+            dependencies.template_paths.add(path)
+
+    def collect_markdown(self, path: Path) -> None:
+        """Record a Markdown dependency of the page and of open fragments."""
+        if self.markdown_dependency_collector is not None:
+            self.markdown_dependency_collector(path)
+        for dependencies in self.list_fragment_dependencies:
+            dependencies.markdown_paths.add(path)
+
+    def collect_data(self, path: Path) -> None:
+        """Record a data dependency of the page and of open fragments."""
+        if self.data_dependency_collector is not None:
+            self.data_dependency_collector(path)
+        for dependencies in self.list_fragment_dependencies:
+            dependencies.data_paths.add(path)
+
+    def collect_collection(self, path: Path) -> None:
+        """Record a collection dependency of the page and of open fragments."""
+        if self.collection_dependency_collector is not None:
+            self.collection_dependency_collector(path)
+        for dependencies in self.list_fragment_dependencies:
+            dependencies.collection_paths.add(path)
+
+    def collect_image(self, path: Path) -> None:
+        """Record an image dependency of the page and of open fragments."""
+        if self.image_dependency_collector is not None:
+            self.image_dependency_collector(path)
+        for dependencies in self.list_fragment_dependencies:
+            dependencies.image_paths.add(path)
+
+    def collect_template_lookup(self, name: str) -> None:
+        # Templates loaded earlier by the page are looked up, not reloaded.
+        for dependencies in self.list_fragment_dependencies:
+            dependencies.template_paths.add(Path(name))
+
+    def render_fragment(self, name: str | None, list_arg: list, caller):
+        """Render a ``{% cache %}`` block or reuse it from the fragment cache.
+
+        Parameters
+        ----------
+        name : str or None
+            Name of the template containing the block.
+        list_arg : list
+            Cache key followed by the ``vary_on`` values.
+        caller : callable
+            Renders the block body; returns an awaitable in async mode.
+
+        Returns
+        -------
+        str or collections.abc.Awaitable
+            The rendered block, awaited by Jinja in async mode.
+        """
+        key = (name, *(repr(arg) for arg in list_arg))
+        entry = self.fragment_cache.get(key, self.collection_index)
+        if entry is not None:
+            metrics.inc("engrave_fragment_cache_hits_total")
+            for path in entry.template_paths:
+                self.collect_template(path)
+            for path in entry.markdown_paths:
+                self.collect_markdown(path)
+            for path in entry.data_paths:
+                self.collect_data(path)
+            for path in entry.collection_paths:
+                self.collect_collection(path)
+            for path in entry.image_paths:
+                self.collect_image(path)
+            return entry.html
+
+        metrics.inc("engrave_fragment_cache_misses_total")
+        dependencies = RenderDependencies(
+            markdown_paths=set(),
+            template_paths=set(),
+            data_paths=set(),
+            collection_paths=set(),
+            image_paths=set(),
+        )
+        if name is not None:
+            dependencies.template_paths.add(Path(name))
+        self.list_fragment_dependencies.append(dependencies)
+
+        def store(html: str) -> str:
+            self.list_fragment_dependencies.remove(dependencies)
+            self.fragment_cache.put(key, html, dependencies, self.collection_index)
+            return html
+
+        if not self.template_env.is_async:
+            try:
+                html = caller()
+            except BaseException:
+                self.list_fragment_dependencies.remove(dependencies)
+                raise
+            return store(html)
+
+        async def render_async() -> str:
+            try:
+                html = await caller()
+            except BaseException:
+                self.list_fragment_dependencies.remove(dependencies)
+                raise
+            return store(html)
+
+        return render_async()
+
     def is_child_path(self, root: Path, child: Path) -> bool:
         """Return whether ``child`` stays under ``root``."""
         try:
@@ -119,7 +550,7 @@ class TemplateEngine:
         Returns
         -------
         markupsafe.Markup
-            Safe HTML produced from the Markdown file.
+            Safe HTML produced from the Markdown file, without its front matter.
 
         Raises
         ------
@@ -130,6 +561,56 @@ class TemplateEngine:
         RuntimeError
             If reading or rendering the Markdown file fails.
         """
+        path_markdown = self.resolve_markdown_include(ctx, path)
+        try:
+            with profiler.span(self.markdown_span_name(path_markdown), "markdown"):
+                metrics.inc("engrave_markdown_loads_total")
+                text = path_markdown.read_text(encoding="utf-8")
+                md_template = self.template_env.from_string(mask_front_matter(text))
+                rendered = md_template.render(**ctx.get_all())
+                return Markup(self.markdown_to_html(rendered))
+        except Exception as error:
+            raise RuntimeError(
+                f"Error processing markdown file {path_markdown}: {error}"
+            ) from error
+
+    @jinja2.pass_context
+    async def markdown_async(self, ctx, path: str | Path) -> Markup:
+        """Async ``markdown()`` global used when ``enable_async`` is set.
+
+        Behaves like ``markdown()``, but path resolution, file reads, and the
+        Markdown-to-HTML conversion run in worker threads and the include is
+        rendered with ``render_async()``, so the event loop stays free for
+        other requests while a large include is processed.
+        """
+        path_markdown = await asyncio.to_thread(
+            self.resolve_markdown_include, ctx, path
+        )
+        try:
+            with profiler.span(self.markdown_span_name(path_markdown), "markdown"):
+                metrics.inc("engrave_markdown_loads_total")
+                text = await asyncio.to_thread(
+                    path_markdown.read_text, encoding="utf-8"
+                )
+                md_template = self.template_env.from_string(mask_front_matter(text))
+                rendered = await md_template.render_async(**ctx.get_all())
+                html = await asyncio.to_thread(self.markdown_to_html, rendered)
+                return Markup(html)
+        except Exception as error:
+            raise RuntimeError(
+                f"Error processing markdown file {path_markdown}: {error}"
+            ) from error
+
+    def resolve_markdown_include(self, ctx, path: str | Path) -> Path:
+        """Validate, resolve, and record one ``markdown()`` include.
+
+        Raises
+        ------
+        ValueError
+            If an absolute path is provided.
+        FileNotFoundError
+            If the file cannot be found within ``dir_src``.
+        """
         path = Path(path)
         if path.is_absolute():
             raise ValueError(f"Absolute paths are not allowed in markdown(): {path}")
@@ -138,20 +619,151 @@ class TemplateEngine:
         if path_markdown is None:
             raise FileNotFoundError("Markdown file not found or outside allowed roots")
 
-        if self.markdown_dependency_collector is not None:
-            self.markdown_dependency_collector(
-                path_markdown.relative_to(self.dir_src_resolved)
+        self.collect_markdown(path_markdown.relative_to(self.dir_src_resolved))
+
+        metrics.inc("engrave_markdown_lookups_total")
+        return path_markdown
+
+    def markdown_span_name(self, path_markdown: Path) -> str:
+        return path_markdown.relative_to(self.dir_src_resolved).as_posix()
+
+    @jinja2.pass_context
+    def srcset(
+        self, ctx, path: str | Path, alt: str = "", sizes: str = "100vw", **attrs
+    ) -> Markup:
+        """Emit responsive image markup for a source image.
+
+        Parameters
+        ----------
+        ctx : jinja2.runtime.Context
+            Jinja2 rendering context (injected via ``@pass_context``).
+        path : str or pathlib.Path
+            Relative path to an image matched by ``--image``, resolved against
+            the directory of the currently rendering template.
+        alt : str, optional
+            ``alt`` text of the image.
+        sizes : str, optional
+            ``sizes`` attribute of the image and its sources.
+        **attrs
+            Extra ``<img>`` attributes, such as ``loading="lazy"``.
+
+        Returns
+        -------
+        markupsafe.Markup
+            An ``<img srcset>`` for one output format, or a ``<picture>`` with
+            one ``<source>`` per additional format. Images without cached
+            variants fall back to a plain ``<img>`` of the original.
+
+        Raises
+        ------
+        ValueError
+            If an absolute path is provided.
+        FileNotFoundError
+            If the image cannot be found within ``dir_src``.
+        """
+        path = Path(path)
+        if path.is_absolute():
+            raise ValueError(f"Absolute paths are not allowed in srcset(): {path}")
+        path_image = self.resolve_markdown_path(ctx, path)
+        if path_image is None:
+            raise FileNotFoundError("Image file not found or outside allowed roots")
+        path_rel = path_image.relative_to(self.dir_src_resolved)
+        # Variant widths depend on the image, so cached pages must too.
+        self.collect_image(path_rel)
+
+        dir_page = posixpath.dirname(ctx.name) or "."
+        list_variant = None
+        if self.image_processor is not None:
+            list_variant = self.image_processor.lookup(self.dir_src, path_rel)
+        attrs = {"alt": alt, **attrs}
+        if not list_variant:
+            attrs = {"src": posixpath.relpath(path_rel.as_posix(), dir_page), **attrs}
+            return Markup(f"<img{self.format_attrs(attrs)}>")
+
+        dict_format: dict[str, list[dict]] = {}
+        for variant in list_variant:
+            dict_format.setdefault(variant["format"], []).append(variant)
+
+        def format_srcset(list_format_variant: list[dict]) -> str:
+            return ", ".join(
+                f"{posixpath.relpath(variant['path'].as_posix(), dir_page)} "
+                f"{variant['width']}w"
+                for variant in list_format_variant
             )
 
-        try:
-            text = path_markdown.read_text(encoding="utf-8")
-            md_template = self.template_env.from_string(text)
-            rendered = md_template.render(**ctx.get_all())
-            return Markup(self.markdown_to_html(rendered))
-        except Exception as error:
-            raise RuntimeError(
-                f"Error processing markdown file {path_markdown}: {error}"
-            ) from error
+        *list_source_format, format_img = dict_format
+        variant_largest = dict_format[format_img][-1]
+        attrs = {
+            "src": posixpath.relpath(variant_largest["path"].as_posix(), dir_page),
+            "srcset": format_srcset(dict_format[format_img]),
+            "sizes": sizes,
+            "width": variant_largest["width"],
+            "height": variant_largest["height"],
+            **attrs,
+        }
+        img = f"<img{self.format_attrs(attrs)}>"
+        if not list_source_format:
+            return Markup(img)
+        list_source = [
+            f'<source type="image/{image_format}"'
+            f"{self.format_attrs({'srcset': format_srcset(dict_format[image_format]), 'sizes': sizes})}>"
+            for image_format in list_source_format
+        ]
+        return Markup(f"<picture>{''.join(list_source)}{img}</picture>")
+
+    @jinja2.pass_context
+    def collection(self, ctx, path: str | Path = ".") -> list[PageEntry]:
+        """List the pages below a directory with their front matter.
+
+        Parameters
+        ----------
+        ctx : jinja2.runtime.Context
+            Jinja2 rendering context (injected via ``@pass_context``).
+        path : str or pathlib.Path, optional
+            Relative path to a directory, resolved against the directory of
+            the currently rendering template. Defaults to that directory.
+
+        Returns
+        -------
+        list of PageEntry
+            Pages below the directory, at any depth, ordered by path. The
+            rendering page itself is left out. ``url`` is relative to the
+            rendering page. Empty when the directory does not exist, so
+            listings survive their collection being deleted or renamed.
+
+        Raises
+        ------
+        ValueError
+            If an absolute path is provided.
+        FileNotFoundError
+            If the directory lies outside ``dir_src``.
+        """
+        path = Path(path)
+        if path.is_absolute():
+            raise ValueError(f"Absolute paths are not allowed in collection(): {path}")
+        path_dir = (self.dir_src_resolved / Path(ctx.name)).parent / path
+        path_dir = path_dir.resolve()
+        if not self.is_child_path(self.dir_src_resolved, path_dir):
+            raise FileNotFoundError("Collection directory not found or outside allowed roots")
+        is_dir = path_dir.is_dir()
+        path_dir = path_dir.relative_to(self.dir_src_resolved)
+        # Recorded even when missing, so recreating the directory rebuilds the page.
+        self.collect_collection(path_dir)
+        if not is_dir:
+            return []
+
+        path_self = Path(ctx.name)
+        entries = cast(CollectionIndex, self.collection_index).get_entries(
+            path_dir, posixpath.dirname(ctx.name) or "."
+        )
+        return [entry for entry in entries if entry.path != path_self]
+
+    def format_attrs(self, attrs: dict) -> str:
+        return "".join(
+            f' {name.replace("_", "-")}="{escape(value)}"'
+            for name, value in attrs.items()
+            if value is not None
+        )
 
 
 def get_template(
@@ -160,6 +772,13 @@ def get_template(
     markdown_to_html: Callable[[str], str] | None = None,
     markdown_dependency_collector: Callable[[Path], None] | None = None,
     template_dependency_collector: Callable[[Path], None] | None = None,
+    compiled_templates: str | Path | None = None,
+    image_processor: "ImageProcessor | None" = None,
+    data_dir: str | Path | None = None,
+    data_dependency_collector: Callable[[Path], None] | None = None,
+    collection_index: CollectionIndex | None = None,
+    collection_dependency_collector: Callable[[Path], None] | None = None,
+    image_dependency_collector: Callable[[Path], None] | None = None,
     **kw,
 ) -> Callable[[str], jinja2.Template]:
     """Create a Jinja2 environment with Markdown support.
@@ -177,6 +796,27 @@ def get_template(
     template_dependency_collector : callable, optional
         Callback invoked with each source-relative Jinja template path loaded
         while rendering a template.
+    compiled_templates : str or pathlib.Path, optional
+        Zip archive or directory written by ``engrave compile``. Templates are
+        imported from it instead of being compiled from ``dir_src``; Markdown
+        includes are still read from ``dir_src``.
+    image_processor : ImageProcessor, optional
+        Responsive image variants looked up by the ``srcset()`` global.
+    data_dir : str or pathlib.Path, optional
+        Source-relative directory of JSON, TOML and YAML files exposed as the
+        ``data`` global. ``None`` leaves ``data`` undefined.
+    data_dependency_collector : callable, optional
+        Callback invoked with each source-relative data file read, or data
+        directory listed, through the ``data`` global.
+    collection_index : CollectionIndex, optional
+        Pages listed by the ``collection()`` global. ``None`` leaves
+        ``collection`` undefined.
+    collection_dependency_collector : callable, optional
+        Callback invoked with each source-relative directory listed through
+        the ``collection()`` global.
+    image_dependency_collector : callable, optional
+        Callback invoked with each source-relative image passed to the
+        ``srcset()`` global.
     *args
         Additional positional arguments forwarded to ``jinja2.Environment``.
     **kw
@@ -193,6 +833,13 @@ def get_template(
         markdown_to_html=markdown_to_html,
         markdown_dependency_collector=markdown_dependency_collector,
         template_dependency_collector=template_dependency_collector,
+        compiled_templates=compiled_templates,
+        image_processor=image_processor,
+        data_dir=data_dir,
+        data_dependency_collector=data_dependency_collector,
+        collection_index=collection_index,
+        collection_dependency_collector=collection_dependency_collector,
+        image_dependency_collector=image_dependency_collector,
         *args,
         **kw,
     ).get_template
@@ -0,0 +1,181 @@
+"""Deterministic tar and zip writers for streaming build output.
+
+``ArchiveWriter`` lets ``core.build.run`` write rendered pages and copied
+assets straight into a ``.tar``, ``.tar.gz``/``.tgz`` or ``.zip`` file instead
+of a destination directory. Members carry a fixed timestamp
+(``SOURCE_DATE_EPOCH`` when set), fixed permissions and owner, and are added
+in the order given by the caller, so identical inputs produce byte-identical
+archives.
+
+Memory stays bounded regardless of page or asset size: zip members are
+written through ``ZipFile.open(..., "w")`` as chunks arrive, and tar members,
+whose header needs the size up front, are staged in a
+``SpooledTemporaryFile`` that moves to disk beyond ``SPOOL_MAX_SIZE``.
+"""
+
+# lib: built-in
+import gzip
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+# lib: local
+from .fs import temp_path
+
+ARCHIVE_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".zip")
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+COPY_BUFFER_SIZE = 1 << 16
+# Earliest timestamp representable in a zip entry.
+DEFAULT_EPOCH = 315532800
+
+
+def get_archive_format(path: str | Path) -> str:
+    """
+    Return ``"tar"``, ``"tar.gz"`` or ``"zip"`` for an archive path.
+
+    Raises
+    ------
+    ValueError
+        If the path does not end in a supported suffix.
+    """
+    name = Path(path).name.lower()
+    if name.endswith((".tar.gz", ".tgz")):
+        return "tar.gz"
+    if name.endswith(".tar"):
+        return "tar"
+    if name.endswith(".zip"):
+        return "zip"
+    raise ValueError(
+        f"Unsupported archive '{path}': expected one of {', '.join(ARCHIVE_SUFFIXES)}"
+    )
+
+
+def get_archive_epoch() -> int:
+    """Return ``SOURCE_DATE_EPOCH`` or a fixed default, clamped for zip."""
+    value = os.environ.get("SOURCE_DATE_EPOCH")
+    epoch = int(value) if value else DEFAULT_EPOCH
+    return max(epoch, DEFAULT_EPOCH)
+
+
+class ArchiveWriter:
+    """Write build outputs into a deterministic archive.
+
+    The archive is written to a temporary sibling file and moved to ``path``
+    by ``close()``; ``abort()`` removes it, so a failed build never leaves a
+    truncated archive behind.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Archive path; the format is taken from its suffix.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.format = get_archive_format(self.path)
+        self.epoch = get_archive_epoch()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path_tmp = temp_path(self.path)
+        self.file = open(self.path_tmp, "wb")
+        self.gzip_file: gzip.GzipFile | None = None
+        self.tar_file: tarfile.TarFile | None = None
+        self.zip_file: zipfile.ZipFile | None = None
+
+        if self.format == "zip":
+            self.zip_file = zipfile.ZipFile(
+                self.file, "w", compression=zipfile.ZIP_DEFLATED
+            )
+            return
+
+        fileobj: BinaryIO = self.file
+        if self.format == "tar.gz":
+            # tarfile's own gzip mode stamps the current time into the header.
+            self.gzip_file = gzip.GzipFile(
+                filename="", mode="wb", fileobj=self.file, mtime=self.epoch
+            )
+            fileobj = self.gzip_file
+        self.tar_file = tarfile.open(
+            fileobj=fileobj, mode="w", format=tarfile.PAX_FORMAT
+        )
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def zip_info(self, path_rel: Path) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(path_rel.as_posix(), date_time=time.gmtime(self.epoch)[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        return info
+
+    def tar_info(self, path_rel: Path, size: int) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(path_rel.as_posix())
+        info.size = size
+        info.mtime = self.epoch
+        info.mode = 0o644
+        info.uid = info.gid = 0
+        info.uname = info.gname = ""
+        return info
+
+    def add_file(self, path_rel: Path, path_src: Path) -> None:
+        """Add a member copied from the file ``path_src``."""
+        with open(path_src, "rb") as stream:
+            if self.zip_file is not None:
+                with self.zip_file.open(
+                    self.zip_info(path_rel), "w", force_zip64=True
+                ) as member:
+                    shutil.copyfileobj(stream, member, COPY_BUFFER_SIZE)
+                return
+            assert self.tar_file is not None
+            size = os.fstat(stream.fileno()).st_size
+            self.tar_file.addfile(self.tar_info(path_rel, size), stream)
+
+    def add_chunks(self, path_rel: Path, chunks: Iterable[str]) -> None:
+        """Add a member from text chunks, encoded as UTF-8."""
+        if self.zip_file is not None:
+            with self.zip_file.open(
+                self.zip_info(path_rel), "w", force_zip64=True
+            ) as member:
+                for chunk in chunks:
+                    member.write(chunk.encode("utf-8"))
+            return
+
+        assert self.tar_file is not None
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+            for chunk in chunks:
+                spool.write(chunk.encode("utf-8"))
+            size = spool.tell()
+            spool.seek(0)
+            self.tar_file.addfile(self.tar_info(path_rel, size), spool)
+
+    def close(self) -> None:
+        """Finish the archive and move it into place."""
+        if self.zip_file is not None:
+            self.zip_file.close()
+        if self.tar_file is not None:
+            self.tar_file.close()
+        if self.gzip_file is not None:
+            self.gzip_file.close()
+        self.file.close()
+        os.replace(self.path_tmp, self.path)
+
+    def abort(self) -> None:
+        """Discard the partially written archive."""
+        for closable in (self.zip_file, self.tar_file, self.gzip_file, self.file):
+            if closable is None:
+                continue
+            try:
+                closable.close()
+            except Exception:
+                pass
+        self.path_tmp.unlink(missing_ok=True)
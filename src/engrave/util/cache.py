@@ -0,0 +1,373 @@
+"""Content-addressed cache of rendered pages shared across builds.
+
+Rendered HTML is stored under a key derived from the page path, the contents
+of the page and of every template and Markdown file it used, the versions of
+the rendering libraries, the build options read while rendering (see
+``RENDER_CONFIG_FIELDS``), and the compiled template bundle, if any. Builds
+on other branches, checkouts, or machines that point ``--build-cache`` at the
+same directory (for example a network mount) restore identical pages by
+copying them instead of rendering.
+
+Lookup is two-level because dependencies are only known after a render:
+
+1. ``deps/<page key>.json`` lists the templates and Markdown files the page
+   used last time, keyed by the page path, page source, and engine config.
+2. ``objects/<output key>`` holds the rendered bytes, keyed by the page key
+   plus the current contents of those dependencies.
+
+Editing any dependency changes the output key, so a stale object is never
+restored; if the edit also changed which files the page uses, the miss
+re-renders the page and replaces its dependency list.
+"""
+
+# lib: built-in
+import json
+import logging
+import os
+from hashlib import sha256
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, cast
+
+# lib: external
+import jinja2
+import mistune
+
+# lib: local
+from ..template import RenderDependencies
+from .collection import CollectionIndex
+from .dataclass import BuildConfig, ServerConfig, WatchConfig
+from .fs import copy_atomic, write_text_atomic
+from .metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = "v1"
+DEFAULT_MAX_SIZE_MB = 1024
+# BuildConfig fields read while rendering a page: the data global, the pages
+# listed by collection(), and the variants written into srcset() markup.
+RENDER_CONFIG_FIELDS = (
+    "data_dir",
+    "exclude",
+    "image",
+    "image_widths",
+    "image_formats",
+    "image_quality",
+)
+
+
+def get_compiled_templates(build_config: BuildConfig) -> str | None:
+    """Return the template bundle ``build_config`` renders from, if any.
+
+    Watch mode and the preview server render edited sources, which a bundle
+    written before the edit would not reflect, so they ignore the bundle.
+    """
+    if isinstance(build_config, (WatchConfig, ServerConfig)):
+        return None
+    return build_config.compiled_templates
+
+
+def get_bundle_digest(path_compiled: str | Path) -> str:
+    """Return a digest of a compiled template bundle's contents.
+
+    Pages rendered from a bundle use its templates rather than the sources in
+    ``dir_src``, so the bundle itself has to be part of every cache key.
+    """
+    path_compiled = Path(path_compiled)
+    if not path_compiled.is_dir():
+        return sha256(path_compiled.read_bytes()).hexdigest()
+    digest = sha256()
+    for path in sorted(path_compiled.rglob("*")):
+        if path.is_file():
+            digest.update(path.relative_to(path_compiled).as_posix().encode("utf-8") + b"\0")
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def get_engine_config(build_config: BuildConfig | None = None) -> Dict[str, Any]:
+    """Return the library versions, and build options, that affect rendered output."""
+    try:
+        engrave_version = version("engrave")
+    except PackageNotFoundError:
+        engrave_version = "unknown"
+    engine_config: Dict[str, Any] = {
+        "engrave": engrave_version,
+        "jinja2": jinja2.__version__,
+        "mistune": mistune.__version__,
+    }
+    if build_config is not None:
+        for name in RENDER_CONFIG_FIELDS:
+            engine_config[name] = getattr(build_config, name)
+        compiled_templates = get_compiled_templates(build_config)
+        if compiled_templates is not None:
+            engine_config["compiled_templates"] = get_bundle_digest(compiled_templates)
+    return engine_config
+
+
+class BuildCache:
+    """Size-bounded, content-addressed store of rendered pages.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        Cache root. Entries are written to temporary files and renamed into
+        place, so concurrent builds may share the directory.
+    max_size : int
+        Upper bound in bytes. When exceeded, least recently used entries are
+        removed until the cache is back under 90% of the bound.
+    engine_config : dict, optional
+        Values folded into every key. Defaults to ``get_engine_config()``.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_size: int,
+        engine_config: Dict[str, Any] | None = None,
+    ) -> None:
+        self.directory = Path(directory) / CACHE_VERSION
+        self.max_size = max_size
+        self.set_engine_config(engine_config)
+        # (st_mtime_ns, st_size) -> digest, so layouts shared by every page
+        # are hashed once per edit instead of once per page.
+        self.file_digests: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+        self.bytes_stored = 0
+        (self.directory / "deps").mkdir(parents=True, exist_ok=True)
+        (self.directory / "objects").mkdir(parents=True, exist_ok=True)
+
+    def set_engine_config(self, engine_config: Dict[str, Any] | None) -> None:
+        """Fold ``engine_config``, or ``get_engine_config()``, into later keys."""
+        if engine_config is None:
+            engine_config = get_engine_config()
+        self.config_digest = sha256(
+            json.dumps(engine_config, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def file_digest(self, path: Path) -> str:
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self.file_digests.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        if path.is_dir():
+            # Data directories listed by a page: their entry names matter.
+            digest = sha256("\0".join(sorted(os.listdir(path))).encode("utf-8")).hexdigest()
+        else:
+            digest = sha256(path.read_bytes()).hexdigest()
+        self.file_digests[path] = (signature, digest)
+        return digest
+
+    def page_key(self, dir_src: Path, path_rel: Path) -> str:
+        """Key of a page's dependency list: config, path, and page source."""
+        return sha256(
+            "\0".join(
+                [
+                    self.config_digest,
+                    path_rel.as_posix(),
+                    self.file_digest(dir_src / path_rel),
+                ]
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def output_key(
+        self,
+        dir_src: Path,
+        page_key: str,
+        dependencies: RenderDependencies,
+        collection_index: CollectionIndex | None = None,
+    ) -> str:
+        """Key of a rendered page: page key plus dependency contents.
+
+        Raises
+        ------
+        ValueError
+            If the page listed collections and no ``collection_index`` is given.
+        """
+        parts = [page_key]
+        for kind, paths in (
+            ("template", dependencies.template_paths),
+            ("markdown", dependencies.markdown_paths),
+            ("data", dependencies.data_paths),
+            ("image", dependencies.image_paths),
+        ):
+            for path in sorted(paths):
+                parts.append(f"{kind}:{path.as_posix()}:{self.file_digest(dir_src / path)}")
+        if dependencies.collection_paths and collection_index is None:
+            raise ValueError("Pages listing collections need the collection index")
+        for path in sorted(dependencies.collection_paths):
+            digest = cast(CollectionIndex, collection_index).digest(path)
+            parts.append(f"collection:{path.as_posix()}:{digest}")
+        return sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def entry_path(self, kind: str, key: str) -> Path:
+        return self.directory / kind / key[:2] / key
+
+    def restore(
+        self,
+        dir_src: Path,
+        path_rel: Path,
+        path_dest: Path,
+        collection_index: CollectionIndex | None = None,
+    ) -> RenderDependencies | None:
+        """
+        Copy a cached render of ``path_rel`` to ``path_dest``.
+
+        Returns
+        -------
+        RenderDependencies or None
+            Dependencies of the restored page, or ``None`` on a cache miss.
+        """
+        page_key = self.page_key(dir_src, path_rel)
+        path_deps = self.entry_path("deps", page_key)
+        try:
+            data = json.loads(path_deps.read_text(encoding="utf-8"))
+            dependencies = RenderDependencies(
+                markdown_paths={Path(path) for path in data["markdown"]},
+                template_paths={Path(path) for path in data["templates"]},
+                data_paths={Path(path) for path in data.get("data", [])},
+                collection_paths={Path(path) for path in data.get("collections", [])},
+                image_paths={Path(path) for path in data.get("images", [])},
+            )
+            path_object = self.entry_path(
+                "objects",
+                self.output_key(dir_src, page_key, dependencies, collection_index),
+            )
+            copy_atomic(path_object, path_dest)
+        except (OSError, ValueError, KeyError):
+            # Missing entries, dependencies deleted since, or a concurrent
+            # eviction are all plain misses.
+            metrics.inc("engrave_build_cache_misses_total")
+            return None
+
+        # Mark both entries as recently used for LRU eviction.
+        for path in (path_deps, path_object):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        metrics.inc("engrave_build_cache_hits_total")
+        return dependencies
+
+    def store(
+        self,
+        dir_src: Path,
+        path_rel: Path,
+        path_dest: Path,
+        dependencies: RenderDependencies,
+        collection_index: CollectionIndex | None = None,
+    ) -> None:
+        """Store the rendered ``path_dest`` of ``path_rel`` with its dependencies."""
+        page_key = self.page_key(dir_src, path_rel)
+        path_object = self.entry_path(
+            "objects",
+            self.output_key(dir_src, page_key, dependencies, collection_index),
+        )
+        path_deps = self.entry_path("deps", page_key)
+        data = {
+            "markdown": sorted(path.as_posix() for path in dependencies.markdown_paths),
+            "templates": sorted(path.as_posix() for path in dependencies.template_paths),
+            "data": sorted(path.as_posix() for path in dependencies.data_paths),
+            "collections": sorted(
+                path.as_posix() for path in dependencies.collection_paths
+            ),
+            "images": sorted(path.as_posix() for path in dependencies.image_paths),
+        }
+        try:
+            copy_atomic(path_dest, path_object)
+            write_text_atomic(path_deps, json.dumps(data))
+        except OSError as error:
+            logger.warning("Build cache store failed for %s: %s", path_rel, error)
+            return
+
+        self.bytes_stored += path_dest.stat().st_size
+        if self.bytes_stored > self.max_size // 10:
+            self.evict()
+
+    def iter_entries(self) -> Iterator[os.DirEntry]:
+        for kind in ("deps", "objects"):
+            try:
+                list_dir_shard = list(os.scandir(self.directory / kind))
+            except FileNotFoundError:
+                continue
+            for dir_shard in list_dir_shard:
+                if not dir_shard.is_dir():
+                    continue
+                for entry in os.scandir(dir_shard.path):
+                    if entry.is_file() and not entry.name.startswith("."):
+                        yield entry
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries while the cache exceeds ``max_size``.
+
+        Returns
+        -------
+        int
+            Number of bytes removed.
+        """
+        self.bytes_stored = 0
+        list_entry: List[Tuple[float, int, str]] = []
+        total = 0
+        for entry in self.iter_entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            list_entry.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        if total <= self.max_size:
+            return 0
+
+        target = self.max_size * 9 // 10
+        removed = 0
+        for _mtime, size, path in sorted(list_entry):
+            if total - removed <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            removed += size
+        metrics.inc("engrave_build_cache_evicted_bytes_total", removed)
+        logger.debug("Build cache evicted %d bytes from %s", removed, self.directory)
+        return removed
+
+
+_build_caches: dict[Path, BuildCache] = {}
+
+
+def get_build_cache(
+    directory: str | Path | None,
+    max_size_mb: int = DEFAULT_MAX_SIZE_MB,
+    engine_config: Dict[str, Any] | None = None,
+) -> BuildCache | None:
+    """Return the shared build cache for ``directory``.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path, optional
+        Cache directory. ``None`` disables the build cache.
+    max_size_mb : int, optional
+        Size bound in MiB.
+    engine_config : dict, optional
+        Values folded into every key, such as ``get_engine_config(build_config)``.
+
+    Returns
+    -------
+    BuildCache or None
+        The cache kept for ``directory``, with ``max_size_mb`` and
+        ``engine_config`` applied on every call so eviction and keys follow
+        the latest configuration.
+    """
+    if directory is None:
+        return None
+    path_directory = Path(directory).resolve()
+    build_cache = _build_caches.get(path_directory)
+    if build_cache is None:
+        build_cache = _build_caches[path_directory] = BuildCache(
+            path_directory, max_size=max_size_mb * 1024 * 1024
+        )
+    build_cache.max_size = max_size_mb * 1024 * 1024
+    build_cache.set_engine_config(engine_config)
+    return build_cache
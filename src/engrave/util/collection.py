@@ -0,0 +1,244 @@
+"""Index of the pages of a source root and their front matter.
+
+Listing pages call the ``collection()`` template global to iterate over the
+pages below a directory without rendering or including them::
+
+    {% for page in collection("posts") | sort(attribute="date", reverse=True) %}
+      <a href="{{ page.url }}">{{ page.title }}</a>
+    {% endfor %}
+
+``CollectionIndex`` holds the page paths of one source root, taken from the
+source scan of a build or, in a process that did not build, from a scan on
+first use. Front matter is read from page headers when a collection is first
+listed, see ``engrave.util.frontmatter.get_front_matter``, and each listing
+is kept until the index changes. Every call records the directory as a
+collection dependency of the rendering page, so watch mode rebuilds a listing
+page only when a page below its directory is added, deleted, or changes front
+matter.
+"""
+
+# lib: built-in
+import json
+import logging
+import posixpath
+import re
+from dataclasses import dataclass
+from glob import iglob
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+# lib: local
+from .frontmatter import get_front_matter
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PageEntry:
+    """One page as seen from the rendering page.
+
+    Entries of ``collection()`` and the ``page`` variable of every rendered
+    page, which holds the page's own front matter.
+
+    Front matter keys are available as attributes in templates, so
+    ``page.title`` is ``page.meta["title"]``.
+    """
+
+    path: Path
+    url: str
+    meta: Dict[str, Any]
+
+    def __getitem__(self, key: str) -> Any:
+        return self.meta[key]
+
+
+class CollectionIndex:
+    """Page paths and front matter of one source root.
+
+    Listings are computed once per directory and kept until a page is added,
+    removed, or changes front matter through ``update``, ``remove``,
+    ``reset`` or ``invalidate``, each of which advances ``generation``.
+
+    Parameters
+    ----------
+    dir_src : pathlib.Path
+        Source root that page paths are relative to.
+    list_exclude_regex : list of re.Pattern
+        Exclusion rules of the build; excluded pages are not indexed.
+    """
+
+    def __init__(self, dir_src: Path, list_exclude_regex: List[re.Pattern]) -> None:
+        self.dir_src = dir_src
+        self.list_exclude_regex = list_exclude_regex
+        self.paths: set[Path] | None = None
+        # Front matter last listed per page, to tell whether it changed.
+        self.metas: Dict[Path, Dict[str, Any]] = {}
+        self.generation = 0
+        self.listings: Dict[Path, List[Tuple[Path, Dict[str, Any]]]] = {}
+        self.entries: Dict[Tuple[Path, str], List[PageEntry]] = {}
+        self.digests: Dict[Path, str] = {}
+
+    def is_page(self, path_rel: Path) -> bool:
+        # util.process imports the template module, which imports this one.
+        from .process import should_build_html
+
+        return should_build_html(path=path_rel, list_exclude_regex=self.list_exclude_regex)
+
+    def changed(self) -> None:
+        """Drop computed listings and advance ``generation``."""
+        self.generation += 1
+        self.listings.clear()
+        self.entries.clear()
+        self.digests.clear()
+
+    def reset(self, paths: Iterable[Path]) -> None:
+        """Replace the indexed pages with the pages among source-relative ``paths``."""
+        self.paths = {path for path in paths if self.is_page(path)}
+        self.changed()
+
+    def invalidate(self) -> None:
+        """Forget the indexed pages; the next lookup scans ``dir_src`` again."""
+        self.paths = None
+        self.changed()
+
+    def get_paths(self) -> set[Path]:
+        """Return the indexed pages, scanning ``dir_src`` when none are indexed."""
+        if self.paths is None:
+            self.paths = {
+                path_rel
+                for path_rel in (
+                    Path(path).relative_to(self.dir_src)
+                    for path in iglob(str(self.dir_src / "**/*.html"), recursive=True)
+                )
+                if self.is_page(path_rel)
+            }
+            logger.debug("Scanned %d page(s) for collections", len(self.paths))
+        return self.paths
+
+    def get_meta(self, path_rel: Path) -> Dict[str, Any]:
+        """Return the front matter of an indexed page, read again after it changes."""
+        meta = self.metas[path_rel] = get_front_matter(self.dir_src / path_rel)
+        return meta
+
+    def get(self, path_dir: Path) -> List[Tuple[Path, Dict[str, Any]]]:
+        """Return ``(path, front matter)`` of the pages below a directory, by path."""
+        listing = self.listings.get(path_dir)
+        if listing is None:
+            listing = self.listings[path_dir] = [
+                (path, self.get_meta(path))
+                for path in sorted(self.get_paths(), key=lambda path: path.as_posix())
+                if path.is_relative_to(path_dir)
+            ]
+        return listing
+
+    def get_entries(self, path_dir: Path, dir_page: str) -> List[PageEntry]:
+        """Return the pages below ``path_dir`` with URLs relative to ``dir_page``.
+
+        ``dir_page`` is the posix directory of the rendering page, ``"."`` for
+        the source root.
+        """
+        entries = self.entries.get((path_dir, dir_page))
+        if entries is None:
+            entries = self.entries[(path_dir, dir_page)] = [
+                PageEntry(path=path, url=url, meta=meta)
+                for (path, meta), url in zip(
+                    self.get(path_dir), self.get_urls(path_dir, dir_page)
+                )
+            ]
+        return entries
+
+    def get_urls(self, path_dir: Path, dir_page: str) -> Iterable[str]:
+        """Yield the URLs of the pages below ``path_dir`` relative to ``dir_page``."""
+        # Pages below the page directory drop its prefix; others share the
+        # path from the page directory to the collection directory.
+        page_prefix = "" if dir_page == "." else f"{dir_page}/"
+        dir_rel = posixpath.relpath(path_dir.as_posix(), dir_page)
+        dir_prefix = "" if dir_rel == "." else f"{dir_rel}/"
+        start = 0 if path_dir == Path(".") else len(path_dir.as_posix()) + 1
+        for path, _ in self.get(path_dir):
+            posix = path.as_posix()
+            if posix.startswith(page_prefix):
+                yield posix[len(page_prefix) :]
+            else:
+                yield dir_prefix + posix[start:]
+
+    def digest(self, path_dir: Path) -> str:
+        """Return a digest of the paths and front matter of one collection."""
+        digest = self.digests.get(path_dir)
+        if digest is None:
+            digest = self.digests[path_dir] = sha256(
+                json.dumps(
+                    [(path.as_posix(), meta) for path, meta in self.get(path_dir)],
+                    sort_keys=True,
+                    default=str,
+                ).encode("utf-8")
+            ).hexdigest()
+        return digest
+
+    def update(self, path_rel: Path) -> bool:
+        """
+        Index an added or modified page.
+
+        Returns
+        -------
+        bool
+            True when collections containing the page may have changed: the
+            page is new, or its front matter differs from the one last read.
+            Pages whose front matter was not read in this process count as
+            changed, since another process may have listed them.
+        """
+        paths = self.get_paths()
+        if not self.is_page(path_rel):
+            return False
+        if path_rel not in paths:
+            paths.add(path_rel)
+            self.changed()
+            return True
+        meta_previous = self.metas.get(path_rel)
+        try:
+            meta = self.get_meta(path_rel)
+        except (OSError, RuntimeError):
+            # Unreadable front matter: let the listing pages report it.
+            self.metas.pop(path_rel, None)
+            meta = None
+        if meta_previous is None:
+            # No listing of this process holds the page.
+            return True
+        if meta != meta_previous:
+            self.changed()
+            return True
+        return False
+
+    def remove(self, path_rel: Path) -> bool:
+        """Remove a deleted page; return whether it was indexed."""
+        self.metas.pop(path_rel, None)
+        paths = self.get_paths()
+        if path_rel not in paths:
+            return False
+        paths.discard(path_rel)
+        self.changed()
+        return True
+
+
+_collection_indexes: dict[Path, CollectionIndex] = {}
+
+
+def get_collection_index(dir_src: str | Path, exclude: List[str]) -> CollectionIndex:
+    """Return the shared collection index of a source root.
+
+    The pages found by a build's scan stay indexed for the watch rebuilds that
+    follow. A fresh index replaces the kept one when ``exclude`` differs from
+    the patterns it was built with.
+    """
+    path_directory = Path(dir_src).resolve()
+    collection_index = _collection_indexes.get(path_directory)
+    if collection_index is None or [
+        regex.pattern for regex in collection_index.list_exclude_regex
+    ] != list(exclude):
+        # Exclusion rules decide which pages are indexed.
+        collection_index = _collection_indexes[path_directory] = CollectionIndex(
+            path_directory, [re.compile(regex) for regex in exclude]
+        )
+    return collection_index
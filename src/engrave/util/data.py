@@ -0,0 +1,250 @@
+"""Site data files exposed to templates as the ``data`` global.
+
+With a data directory configured (``--data-dir``; off by default), its JSON,
+TOML and YAML files are available to every template as nested attributes
+named after their file stems and subdirectories: with ``--data-dir data``,
+``data/nav.json`` is ``data.nav`` and ``data/authors/jane.toml`` is
+``data.authors.jane``.
+
+Files are parsed on first access and kept by ``SiteData`` for the lifetime
+of the process, so each file is parsed once per build and again only after it
+changes. Every access is recorded as a data dependency of the rendering page:
+reading ``data.nav`` records ``data/nav.json``, and iterating or missing a
+name in ``data.authors`` records the ``data/authors`` directory, so watch
+mode rebuilds pages when a file they listed is added or deleted.
+
+YAML requires PyYAML (``pip install 'engrave[yaml]'``); TOML uses ``tomllib``,
+or ``tomli`` before Python 3.11.
+"""
+
+# lib: built-in
+import json
+import logging
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+# lib: local
+from .metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+DATA_SUFFIXES = (".json", ".toml", ".yaml", ".yml")
+FileSignature = Tuple[int, int] | None
+
+
+def get_file_signature(path: Path) -> FileSignature:
+    """Return ``(st_mtime_ns, st_size)`` of a file or directory, or ``None`` when missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_data_file(path: Path) -> Any:
+    """
+    Parse one JSON, TOML or YAML file.
+
+    Raises
+    ------
+    RuntimeError
+        If the parser for the file type is not installed.
+    ValueError
+        If the file suffix is not a data file suffix.
+    """
+    return parse_data(path.read_text(encoding="utf-8"), path.suffix, path)
+
+
+def parse_data(text: str, suffix: str, source: str | Path) -> Any:
+    """
+    Parse JSON, TOML or YAML text in the format named by a file suffix.
+
+    Parameters
+    ----------
+    text : str
+        Text to parse.
+    suffix : str
+        One of ``DATA_SUFFIXES``, in any case.
+    source : str or pathlib.Path
+        File the text was read from, used in error messages.
+
+    Raises
+    ------
+    RuntimeError
+        If the parser for the format is not installed.
+    ValueError
+        If the suffix is not a data file suffix.
+    """
+    suffix = suffix.lower()
+    if suffix == ".json":
+        return json.loads(text)
+    if suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib  # type: ignore
+            except ImportError as error:
+                raise RuntimeError(
+                    f"Reading {source} requires tomli before Python 3.11: pip install tomli"
+                ) from error
+        return tomllib.loads(text)
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml  # type: ignore
+        except ImportError as error:
+            raise RuntimeError(
+                f"Reading {source} requires PyYAML: pip install 'engrave[yaml]'"
+            ) from error
+        return yaml.safe_load(text)
+    raise ValueError(f"Unsupported data file: {source}")
+
+
+def is_data_path(path: Path, data_dir: str | Path | None) -> bool:
+    """Return whether a source-relative path is a data file."""
+    return (
+        data_dir is not None
+        and path.is_relative_to(data_dir)
+        and path.suffix.lower() in DATA_SUFFIXES
+    )
+
+
+class SiteData:
+    """Parsed data files of one source root, reparsed when they change.
+
+    Parameters
+    ----------
+    dir_src : pathlib.Path
+        Source root that data paths are relative to.
+    """
+
+    def __init__(self, dir_src: Path) -> None:
+        self.dir_src = dir_src
+        self.values: Dict[Path, Tuple[FileSignature, Any]] = {}
+        self.listings: Dict[Path, Tuple[FileSignature, Dict[str, Path]]] = {}
+
+    def load(self, path_rel: Path) -> Any:
+        """Return the parsed content of a source-relative data file."""
+        path = self.dir_src / path_rel
+        signature = get_file_signature(path)
+        cached = self.values.get(path_rel)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            value = load_data_file(path)
+        except RuntimeError:
+            raise
+        except Exception as error:
+            raise RuntimeError(f"Error loading data file {path}: {error}") from error
+        metrics.inc("engrave_data_loads_total")
+        logger.debug("Loaded data file: %s", path)
+        self.values[path_rel] = (signature, value)
+        return value
+
+    def list_dir(self, path_rel: Path) -> Dict[str, Path]:
+        """Map names in a source-relative data directory to files and subdirectories."""
+        path = self.dir_src / path_rel
+        signature = get_file_signature(path)
+        cached = self.listings.get(path_rel)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        dict_entry: Dict[str, Path] = {}
+        try:
+            list_dir_entry = sorted(os.scandir(path), key=lambda entry: entry.name)
+        except (FileNotFoundError, NotADirectoryError):
+            list_dir_entry = []
+        for dir_entry in list_dir_entry:
+            name = Path(dir_entry.name)
+            if dir_entry.is_dir():
+                dict_entry.setdefault(dir_entry.name, path_rel / name)
+            elif name.suffix.lower() in DATA_SUFFIXES:
+                # A file shadows a directory of the same name.
+                dict_entry[name.stem] = path_rel / name
+        self.listings[path_rel] = (signature, dict_entry)
+        return dict_entry
+
+
+_site_data: dict[Path, SiteData] = {}
+
+
+def get_site_data(dir_src: str | Path) -> SiteData:
+    """Return the shared data files of a source root.
+
+    Every page of a build and of later watch rebuilds reads the same parsed
+    files, and a file is parsed again only after its signature changes.
+    """
+    path_directory = Path(dir_src).resolve()
+    site_data = _site_data.get(path_directory)
+    if site_data is None:
+        site_data = _site_data[path_directory] = SiteData(path_directory)
+    return site_data
+
+
+class DataNamespace:
+    """Lazy view of one data directory for one template engine.
+
+    Parameters
+    ----------
+    site_data : SiteData
+        Shared parsed data files.
+    path_dir : pathlib.Path
+        Source-relative data directory shown by this namespace.
+    collector : callable
+        Called with each data file or directory path the page uses.
+    """
+
+    def __init__(
+        self, site_data: SiteData, path_dir: Path, collector: Callable[[Path], None]
+    ) -> None:
+        self._site_data = site_data
+        self._path_dir = path_dir
+        self._collector = collector
+
+    def _entries(self) -> Dict[str, Path]:
+        return self._site_data.list_dir(self._path_dir)
+
+    def __getitem__(self, name: str) -> Any:
+        path_rel = self._entries().get(name)
+        if path_rel is None:
+            # Adding the file later must rebuild pages that missed it.
+            self._collector(self._path_dir)
+            raise KeyError(name)
+        if path_rel.suffix.lower() not in DATA_SUFFIXES:
+            return DataNamespace(self._site_data, path_rel, self._collector)
+        self._collector(path_rel)
+        return self._site_data.load(path_rel)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __contains__(self, name: object) -> bool:
+        self._collector(self._path_dir)
+        return name in self._entries()
+
+    def __iter__(self) -> Iterator[str]:
+        self._collector(self._path_dir)
+        return iter(self._entries())
+
+    def __len__(self) -> int:
+        self._collector(self._path_dir)
+        return len(self._entries())
+
+    def keys(self) -> list[str]:
+        return list(self)
+
+    def values(self) -> list[Any]:
+        return [self[name] for name in self]
+
+    def items(self) -> list[Tuple[str, Any]]:
+        return [(name, self[name]) for name in self]
+
+    def __repr__(self) -> str:
+        return f"<DataNamespace {self._path_dir.as_posix()}>"
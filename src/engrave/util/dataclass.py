@@ -9,6 +9,7 @@ purpose and attribute types.
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import (
+    TYPE_CHECKING,
     List,
     Literal,
 )
@@ -16,7 +17,10 @@ from typing import Annotated
 
 # lib: external
 from cyclopts import Parameter
-from watchfiles import Change
+
+if TYPE_CHECKING:
+    # Imported lazily so build-only code paths do not load watchfiles.
+    from watchfiles import Change
 
 
 @dataclass
@@ -38,7 +42,8 @@ class FileChangeResult:
     """
     path: Annotated[str, "Path to the file that changed (relative or absolute)"]
     type: Annotated[Literal['build', 'copy', 'watch'], "Category of processing to apply to the file"]
-    change: Annotated[Change, "Change event reported by watchfiles (added, modified, or deleted)"]
+    change: Annotated["Change", "Change event reported by watchfiles (added, modified, or deleted)"]
+    count: Annotated[int, "Number of files summarized by this result (bulk rebuilds report one result per batch)"] = 1
 
 LOG_LEVEL_TYPE = Literal["CRITICAL", "FATAL", "ERROR", "WARNING", "WARN", "INFO", "DEBUG", "NOTSET"]
 
@@ -86,6 +91,297 @@ class BuildConfig():
         LOG_LEVEL_TYPE,
         Parameter(help="Logging verbosity for CLI output."),
     ] = field(default='INFO', kw_only=True)
+    bytecode_cache: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Directory for a persistent Jinja bytecode cache shared by "
+                "builds, watch mode, and the preview server."
+            )
+        ),
+    ] = field(default=None, kw_only=True)
+    compiled_templates: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Precompiled template bundle written by `engrave compile`. "
+                "Markdown includes are still read from the source directory. "
+                "Ignored by `watch` and `server`, which render from sources."
+            )
+        ),
+    ] = field(default=None, kw_only=True)
+    stream: Annotated[
+        bool,
+        Parameter(
+            help=(
+                "Stream rendered pages to disk chunk by chunk to bound memory "
+                "for very large pages."
+            )
+        ),
+    ] = field(default=False, kw_only=True)
+    build_cache: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Directory for a content-addressed cache of rendered pages, "
+                "which may be shared by branches, checkouts, or machines."
+            )
+        ),
+    ] = field(default=None, kw_only=True)
+    build_cache_max_mb: Annotated[
+        int,
+        Parameter(
+            help=(
+                "Size bound of `--build-cache` in MiB; least recently used "
+                "entries are evicted beyond it."
+            )
+        ),
+    ] = field(default=1024, kw_only=True)
+    manifest_file: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Path of the output manifest (source to outputs, size, digest). "
+                "Defaults to `.<dest>.engrave-manifest.json` next to the "
+                "destination directory, outside the deployed tree."
+            )
+        ),
+    ] = field(default=None, kw_only=True)
+    prune: Annotated[
+        bool,
+        Parameter(
+            help=(
+                "Delete outputs recorded in the manifest whose source no longer "
+                "produces them."
+            )
+        ),
+    ] = field(default=False, kw_only=True)
+    changes_file: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Path to write a JSON change set of outputs added, modified, "
+                "or deleted by this build, with their digests."
+            )
+        ),
+    ] = field(default=None, kw_only=True)
+    archive: Annotated[
+        bool,
+        Parameter(
+            help=(
+                "Treat the destination as a `.tar`, `.tar.gz`/`.tgz` or `.zip` "
+                "file and stream outputs into it with deterministic order and "
+                "timestamps instead of writing a directory."
+            )
+        ),
+    ] = field(default=False, kw_only=True)
+    search_index: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Directory, relative to the destination, to write a sharded "
+                "full-text search index of rendered pages to."
+            )
+        ),
+    ] = field(default=None, kw_only=True)
+    site_url: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Absolute base URL of the site. Enables `sitemap.xml`, split "
+                "into a sitemap index beyond 50,000 pages."
+            )
+        ),
+    ] = field(default=None, kw_only=True)
+    feed: Annotated[
+        List[str],
+        Parameter(
+            help=(
+                "Repeatable source-relative directory (`.` for the whole site) "
+                "to write an Atom `feed.xml` of recently modified pages for. "
+                "Requires `--site-url`."
+            )
+        ),
+    ] = field(default_factory=list, kw_only=True)
+    feed_size: Annotated[
+        int,
+        Parameter(help="Number of most recently modified pages per feed."),
+    ] = field(default=20, kw_only=True)
+    feed_title: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Title of the Atom feeds. Defaults to the title of the feed "
+                "directory's `index.html`."
+            )
+        ),
+    ] = field(default=None, kw_only=True)
+    feed_author: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Author name of the Atom feeds, which require one. Defaults to "
+                "the host name of `--site-url`."
+            )
+        ),
+    ] = field(default=None, kw_only=True)
+    check_links: Annotated[
+        bool,
+        Parameter(
+            help=(
+                "Check internal `href`/`src` references of the built pages "
+                "against the outputs and log broken links."
+            )
+        ),
+    ] = field(default=False, kw_only=True)
+    check_links_workers: Annotated[
+        int,
+        Parameter(
+            help="Processes parsing pages for `--check-links`; 0 uses one per CPU."
+        ),
+    ] = field(default=0, kw_only=True)
+    data_dir: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Directory, relative to the source directory, of JSON, TOML "
+                "and YAML files exposed to templates as `data`, such as "
+                "`data`, whose `data/nav.json` is then `data.nav`. Unset, "
+                "templates have no `data` global."
+            )
+        ),
+    ] = field(default=None, kw_only=True)
+    image: Annotated[
+        List[str],
+        Parameter(
+            help=(
+                "Repeatable regex for source-relative images, such as "
+                "`photos/.*\\.jpg`, to write resized and re-encoded variants "
+                "of for the `srcset()` template helper. Requires Pillow."
+            )
+        ),
+    ] = field(default_factory=list, kw_only=True)
+    image_widths: Annotated[
+        List[int],
+        Parameter(
+            help=(
+                "Repeatable variant width in pixels; widths above an image's "
+                "own width are skipped."
+            )
+        ),
+    ] = field(default_factory=lambda: [480, 960, 1920], kw_only=True)
+    image_formats: Annotated[
+        List[Literal["webp", "avif", "jpeg", "png"]],
+        Parameter(
+            help=(
+                "Repeatable variant format. With several formats, `srcset()` "
+                "emits a `<picture>` preferring them in order."
+            )
+        ),
+    ] = field(default_factory=lambda: ["webp"], kw_only=True)
+    image_quality: Annotated[
+        int,
+        Parameter(help="Encoder quality of lossy image variants."),
+    ] = field(default=80, kw_only=True)
+    image_cache: Annotated[
+        str,
+        Parameter(
+            help=(
+                "Directory caching image variants by source content, which "
+                "may be shared by branches, checkouts, or machines."
+            )
+        ),
+    ] = field(default=".engrave-cache/images", kw_only=True)
+    image_workers: Annotated[
+        int,
+        Parameter(
+            help="Processes generating image variants; 0 uses one per CPU."
+        ),
+    ] = field(default=0, kw_only=True)
+
+
+@dataclass(slots=True,)
+class CompileConfig():
+    """
+    Configuration for precompiling source templates into a deployable bundle.
+    """
+    dir_src: Annotated[
+        str,
+        Parameter(help="Source directory containing templates."),
+    ]
+    target: Annotated[
+        str,
+        Parameter(
+            help=(
+                "Output path for the compiled bundle: a zip archive, or a "
+                "directory when `--no-zip` is given."
+            )
+        ),
+    ]
+    zip: Annotated[
+        bool,
+        Parameter(help="Write the bundle as a deflated zip archive."),
+    ] = field(default=True, kw_only=True)
+    exclude: Annotated[
+        List[str],
+        Parameter(
+            help=(
+                "Repeatable regex for source-relative template paths to leave "
+                "out of the bundle."
+            )
+        ),
+    ] = field(default_factory=list, kw_only=True)
+    log_level: Annotated[
+        LOG_LEVEL_TYPE,
+        Parameter(help="Logging verbosity for CLI output."),
+    ] = field(default='INFO', kw_only=True)
+
+
+@dataclass(slots=True,)
+class CheckLinksConfig():
+    """
+    Configuration for checking internal links of a built site.
+    """
+    dir_dest: Annotated[
+        str,
+        Parameter(help="Destination directory of a built site."),
+    ]
+    site_url: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Absolute base URL of the site; links below it and "
+                "root-relative links are resolved against its path."
+            )
+        ),
+    ] = field(default=None, kw_only=True)
+    workers: Annotated[
+        int,
+        Parameter(help="Processes parsing pages; 0 uses one per CPU."),
+    ] = field(default=0, kw_only=True)
+    log_level: Annotated[
+        LOG_LEVEL_TYPE,
+        Parameter(help="Logging verbosity for CLI output."),
+    ] = field(default='INFO', kw_only=True)
+
+
+@dataclass(slots=True,)
+class MergeIndexConfig():
+    """
+    Configuration for combining per-shard build indexes into one.
+    """
+    output: Annotated[
+        str,
+        Parameter(help="Path of the merged build index to write."),
+    ]
+    inputs: Annotated[
+        List[str],
+        Parameter(help="Build index files written by `engrave build --shard i/N --index`."),
+    ]
+    log_level: Annotated[
+        LOG_LEVEL_TYPE,
+        Parameter(help="Logging verbosity for CLI output."),
+    ] = field(default='INFO', kw_only=True)
 
 
 @dataclass(kw_only=True, slots=True,)
@@ -103,6 +399,59 @@ class WatchConfig(BuildConfig):
             )
         ),
     ] = field(default_factory=list)
+    metrics_interval: Annotated[
+        float,
+        Parameter(
+            help=(
+                "Seconds between metrics summary log lines. "
+                "`0` disables periodic metrics logging."
+            )
+        ),
+    ] = 0.0
+    metrics_file: Annotated[
+        str | None,
+        Parameter(
+            help=(
+                "Path to a file rewritten with Prometheus-format metrics "
+                "after each watch batch."
+            )
+        ),
+    ] = None
+    burst_threshold: Annotated[
+        int,
+        Parameter(
+            help=(
+                "Change-batch size from which a batch is handled as one "
+                "parallel bulk rebuild with a single summarized event."
+            )
+        ),
+    ] = 200
+    burst_workers: Annotated[
+        int,
+        Parameter(
+            help=(
+                "Worker processes for bulk rebuilds. `0` uses one per CPU."
+            )
+        ),
+    ] = 0
+    debounce_ms: Annotated[
+        int,
+        Parameter(
+            help=(
+                "Maximum time in milliseconds `watchfiles` groups changes "
+                "into one batch."
+            )
+        ),
+    ] = 1600
+    step_ms: Annotated[
+        int,
+        Parameter(
+            help=(
+                "Quiet time in milliseconds `watchfiles` waits for further "
+                "changes before yielding a batch."
+            )
+        ),
+    ] = 50
 
 
 @dataclass(kw_only=True, slots=True,)
@@ -132,3 +481,42 @@ class ServerConfig(BuildConfig):
         str,
         Parameter(help="URL path for the live reload event stream."),
     ] = '/__engrave/watch'
+    metrics: Annotated[
+        bool,
+        Parameter(help="Expose Prometheus-format metrics at `/__engrave/metrics`."),
+    ] = False
+    burst_threshold: Annotated[
+        int,
+        Parameter(
+            help=(
+                "Change-batch size from which a batch is handled as one "
+                "parallel bulk rebuild with a single summarized event."
+            )
+        ),
+    ] = 200
+    burst_workers: Annotated[
+        int,
+        Parameter(
+            help=(
+                "Worker processes for bulk rebuilds. `0` uses one per CPU."
+            )
+        ),
+    ] = 0
+    debounce_ms: Annotated[
+        int,
+        Parameter(
+            help=(
+                "Maximum time in milliseconds `watchfiles` groups changes "
+                "into one batch."
+            )
+        ),
+    ] = 1600
+    step_ms: Annotated[
+        int,
+        Parameter(
+            help=(
+                "Quiet time in milliseconds `watchfiles` waits for further "
+                "changes before yielding a batch."
+            )
+        ),
+    ] = 50
@@ -0,0 +1,128 @@
+"""Front matter at the top of page and Markdown sources.
+
+A source may start with a metadata block fenced by ``---`` lines, parsed as
+YAML, or by ``+++`` lines, parsed as TOML::
+
+    +++
+    title = "Hello"
+    date = 2026-01-02
+    +++
+    <h1>Hello</h1>
+
+The block must be a mapping. Templates and ``markdown()`` includes are
+loaded with the block replaced by an empty Jinja comment spanning the same
+lines, so it is neither rendered nor passed to mistune, and error line numbers
+still match the source.
+
+``get_front_matter`` reads a file only up to the closing fence, so collecting
+the metadata of many pages costs a few lines of I/O per page instead of a
+render, and keeps it until the file's mtime or size changes.
+"""
+
+# lib: built-in
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+# lib: local
+from .data import FileSignature, get_file_signature, parse_data
+from .metrics import metrics
+
+
+FRONT_MATTER_FENCES = {"---": ".yaml", "+++": ".toml"}
+
+
+def find_front_matter(text: str) -> Tuple[str, str, str] | None:
+    """
+    Locate the front matter block of a source without parsing it.
+
+    Returns
+    -------
+    tuple of (str, str, str) or None
+        The data suffix of the block format, the text between the fences, and
+        the text following the closing fence; ``None`` when the source has no
+        front matter.
+    """
+    first_line, newline, rest = text.partition("\n")
+    fence = first_line.rstrip()
+    suffix = FRONT_MATTER_FENCES.get(fence)
+    if suffix is None or not newline:
+        return None
+
+    offset = 0
+    for line in rest.splitlines(keepends=True):
+        if line.rstrip() == fence:
+            break
+        offset += len(line)
+    else:
+        # No closing fence: the source has no front matter.
+        return None
+
+    _, _, body = rest[offset:].partition("\n")
+    return suffix, rest[:offset], body
+
+
+def parse_front_matter(text: str, suffix: str, source: str | Path) -> Dict[str, Any]:
+    """
+    Parse the text between the fences of a front matter block.
+
+    Raises
+    ------
+    RuntimeError
+        If the text cannot be parsed or is not a mapping.
+    """
+    try:
+        meta = parse_data(text, suffix, source)
+    except RuntimeError:
+        raise
+    except Exception as error:
+        raise RuntimeError(f"Error parsing front matter of {source}: {error}") from error
+    if meta is None:
+        return {}
+    if not isinstance(meta, dict):
+        raise RuntimeError(f"Front matter of {source} is not a mapping")
+    return meta
+
+
+def read_front_matter(path: Path) -> Dict[str, Any]:
+    """Return the parsed front matter of a source file, reading only its header."""
+    # Binary reads leave the body undecoded: only header lines are decoded.
+    with open(path, "rb") as file:
+        first_line = file.readline().decode("utf-8")
+        fence = first_line.rstrip()
+        suffix = FRONT_MATTER_FENCES.get(fence)
+        if suffix is None or not first_line.endswith("\n"):
+            return {}
+        list_line: list[str] = []
+        for line in file:
+            str_line = line.decode("utf-8")
+            if str_line.rstrip() == fence:
+                break
+            list_line.append(str_line)
+        else:
+            # No closing fence: the source has no front matter.
+            return {}
+    return parse_front_matter("".join(list_line), suffix, path)
+
+
+_front_matter: Dict[Path, Tuple[FileSignature, Dict[str, Any]]] = {}
+
+
+def get_front_matter(path: Path) -> Dict[str, Any]:
+    """Return the front matter of a source file, read again only after it changes."""
+    signature = get_file_signature(path)
+    cached = _front_matter.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    meta = read_front_matter(path)
+    metrics.inc("engrave_front_matter_reads_total")
+    _front_matter[path] = (signature, meta)
+    return meta
+
+
+def mask_front_matter(text: str) -> str:
+    """Replace the front matter of a template by a comment over the same lines."""
+    found = find_front_matter(text)
+    if found is None:
+        return text
+    _, _, body = found
+    return "{#" + "\n" * text[: len(text) - len(body)].count("\n") + "#}" + body
@@ -0,0 +1,50 @@
+"""Atomic file writes through temporary sibling files.
+
+Every file engrave writes in place of an existing one, such as pages, cache
+entries, manifests and index files, is first written to a hidden sibling
+named by ``temp_path`` and then renamed over the destination, so readers see
+either the previous or the complete new file. The process id in the name
+keeps concurrent builds writing the same file from sharing a temporary file.
+"""
+
+# lib: built-in
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+def temp_path(path: Path) -> Path:
+    """Return the temporary sibling this process writes ``path`` through."""
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+@contextmanager
+def atomic_path(path_dest: Path) -> Iterator[Path]:
+    """
+    Yield a temporary path that replaces ``path_dest`` once the block succeeds.
+
+    The parent directory is created first. When the block raises, the
+    temporary file is removed and ``path_dest`` is left untouched.
+    """
+    path_dest.parent.mkdir(parents=True, exist_ok=True)
+    path_tmp = temp_path(path_dest)
+    try:
+        yield path_tmp
+        os.replace(path_tmp, path_dest)
+    except BaseException:
+        path_tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_text_atomic(path_dest: Path, text: str) -> None:
+    """Write UTF-8 ``text`` to ``path_dest`` atomically."""
+    with atomic_path(path_dest) as path_tmp:
+        path_tmp.write_text(text, encoding="utf-8")
+
+
+def copy_atomic(path_src: Path, path_dest: Path) -> None:
+    """Copy ``path_src`` to ``path_dest`` atomically."""
+    with atomic_path(path_dest) as path_tmp:
+        shutil.copyfile(path_src, path_tmp)
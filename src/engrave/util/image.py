@@ -0,0 +1,332 @@
+"""Responsive image variants cached by source content.
+
+Images matched by ``--image`` patterns are resized to each configured width
+not larger than the original and re-encoded to each configured format. A
+variant of ``photos/cat.jpg`` at 480 pixels in WebP is written next to it in
+the destination as ``photos/cat-480w.webp``.
+
+Variants are generated once per source content: entries live under
+``<cache>/v1/<key[:2]>/<key>/`` where the key hashes the image bytes and the
+generation options, together with a ``meta.json`` describing them. Cache hits
+are restored by copying in the build process; misses are generated across a
+process pool. Pillow is only imported to generate misses, and is installed
+with ``pip install 'engrave[images]'``.
+
+The ``srcset()`` template global of ``TemplateEngine`` reads the variant
+metadata kept by ``ImageProcessor`` to emit ``<img>``/``<picture>`` markup.
+"""
+
+# lib: built-in
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Dict, List
+
+# lib: local
+from .archive import ArchiveWriter
+from .fs import copy_atomic, temp_path
+from .metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CACHE_VERSION = "v1"
+FORMAT_EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp", "avif": "avif"}
+
+
+def generate_variants(
+    path_src: Path,
+    dir_entry: Path,
+    widths: List[int],
+    formats: List[str],
+    quality: int,
+) -> Dict[str, Any]:
+    """
+    Generate the variants of one image into a cache entry directory.
+
+    Runs inside image worker processes.
+
+    Returns
+    -------
+    dict
+        Entry metadata: original ``width`` and ``height`` and the list of
+        ``variants`` with their cache ``file``, ``width``, ``height`` and
+        ``format``.
+
+    Raises
+    ------
+    RuntimeError
+        If Pillow is not installed.
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as error:
+        raise RuntimeError(
+            "Image variants require Pillow: pip install 'engrave[images]'"
+        ) from error
+
+    dir_tmp = temp_path(dir_entry)
+    shutil.rmtree(dir_tmp, ignore_errors=True)
+    dir_tmp.mkdir(parents=True)
+    try:
+        with Image.open(path_src) as image:
+            # Apply EXIF orientation so variants are not rotated.
+            image = ImageOps.exif_transpose(image)
+            width_original, height_original = image.size
+            list_width = sorted(
+                {width for width in widths if width <= width_original}
+            ) or [width_original]
+            list_variant = []
+            for width in list_width:
+                height = max(1, round(height_original * width / width_original))
+                resized = image.resize((width, height), Image.Resampling.LANCZOS)
+                for image_format in formats:
+                    if image_format == "jpeg" and resized.mode not in ("RGB", "L"):
+                        variant = resized.convert("RGB")
+                    else:
+                        variant = resized
+                    name = f"{width}.{FORMAT_EXTENSIONS[image_format]}"
+                    variant.save(dir_tmp / name, format=image_format.upper(), quality=quality)
+                    list_variant.append(
+                        {"file": name, "width": width, "height": height, "format": image_format}
+                    )
+        meta = {
+            "width": width_original,
+            "height": height_original,
+            "variants": list_variant,
+        }
+        (dir_tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+        try:
+            os.replace(dir_tmp, dir_entry)
+        except OSError:
+            # A concurrent build stored the same entry first.
+            shutil.rmtree(dir_tmp, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(dir_tmp, ignore_errors=True)
+        raise
+    return meta
+
+
+class ImageProcessor:
+    """Generate, cache, and look up responsive variants of source images.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        Cache root, shared across builds and checkouts.
+    widths : list of int
+        Target widths in pixels; widths above the original are skipped.
+    formats : list of str
+        Output formats among ``jpeg``, ``png``, ``webp`` and ``avif``.
+    quality : int
+        Encoder quality for lossy formats.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        widths: List[int],
+        formats: List[str],
+        quality: int,
+    ) -> None:
+        for image_format in formats:
+            if image_format not in FORMAT_EXTENSIONS:
+                raise ValueError(
+                    f"Unsupported image format '{image_format}': expected one of "
+                    f"{', '.join(FORMAT_EXTENSIONS)}"
+                )
+        self.directory = Path(directory) / IMAGE_CACHE_VERSION
+        self.widths = list(widths)
+        self.formats = list(formats)
+        self.quality = quality
+        self.options_digest = sha256(
+            json.dumps([self.widths, self.formats, quality]).encode("utf-8")
+        ).hexdigest()
+        # Source-relative image path -> (cache key, entry metadata).
+        self.metadata: Dict[Path, tuple[str, Dict[str, Any]]] = {}
+
+    def cache_key(self, path_src: Path) -> str:
+        digest = sha256(self.options_digest.encode("utf-8"))
+        with open(path_src, "rb") as file:
+            while chunk := file.read(1 << 16):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def entry_dir(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def output_paths(self, path_rel: Path, meta: Dict[str, Any]) -> List[Path]:
+        """Return destination-relative variant paths of a source image."""
+        return [
+            path_rel.with_name(
+                f"{path_rel.stem}-{variant['width']}w.{FORMAT_EXTENSIONS[variant['format']]}"
+            )
+            for variant in meta["variants"]
+        ]
+
+    def lookup(self, dir_src: Path, path_rel: Path) -> List[Dict[str, Any]] | None:
+        """
+        Return the variants of a source image.
+
+        Images not processed by this instance, such as in bulk rebuild workers
+        or the preview server, are looked up in the cache by content.
+
+        Returns
+        -------
+        list of dict or None
+            ``path`` (destination-relative), ``width``, ``height`` and
+            ``format`` of every variant, or ``None`` when the image has no
+            cached variants.
+        """
+        entry = self.metadata.get(path_rel)
+        if entry is None:
+            key = self.cache_key(dir_src / path_rel)
+            try:
+                meta = json.loads(
+                    (self.entry_dir(key) / "meta.json").read_text(encoding="utf-8")
+                )
+            except FileNotFoundError:
+                return None
+            entry = self.metadata[path_rel] = (key, meta)
+        _key, meta = entry
+        return [
+            {**variant, "path": path_output}
+            for variant, path_output in zip(
+                meta["variants"], self.output_paths(path_rel, meta)
+            )
+        ]
+
+    def run(
+        self,
+        dir_src: Path,
+        dir_dest: Path,
+        list_path_rel: List[Path],
+        *,
+        workers: int = 0,
+        archive: ArchiveWriter | None = None,
+    ) -> Dict[Path, List[Path]]:
+        """
+        Write the variants of source images, generating cache misses in a pool.
+
+        Parameters
+        ----------
+        dir_src, dir_dest : pathlib.Path
+            Source and destination roots.
+        list_path_rel : list of pathlib.Path
+            Source-relative images to process.
+        workers : int, optional
+            Worker processes for cache misses; ``0`` uses one per CPU.
+        archive : ArchiveWriter, optional
+            Archive to add variants to instead of ``dir_dest``.
+
+        Returns
+        -------
+        dict
+            Destination-relative outputs written for each source image.
+        """
+        dict_key: Dict[Path, str] = {}
+        dict_miss: Dict[str, Path] = {}
+        for path_rel in list_path_rel:
+            key = dict_key[path_rel] = self.cache_key(dir_src / path_rel)
+            if not (self.entry_dir(key) / "meta.json").is_file():
+                dict_miss.setdefault(key, path_rel)
+
+        metrics.inc("engrave_image_cache_hits_total", len(list_path_rel) - len(dict_miss))
+        metrics.inc("engrave_image_cache_misses_total", len(dict_miss))
+        if dict_miss:
+            logger.info("Generating variants of %d image(s)", len(dict_miss))
+            self.generate(dir_src, dict_miss, workers)
+
+        dict_output: Dict[Path, List[Path]] = {}
+        for path_rel in list_path_rel:
+            key = dict_key[path_rel]
+            dir_entry = self.entry_dir(key)
+            meta = json.loads((dir_entry / "meta.json").read_text(encoding="utf-8"))
+            entry_previous = self.metadata.get(path_rel)
+            self.metadata[path_rel] = (key, meta)
+            list_output = self.output_paths(path_rel, meta)
+            if entry_previous is not None and archive is None:
+                # An edited image may no longer be wide enough for some widths.
+                list_output_previous = self.output_paths(path_rel, entry_previous[1])
+                for path_output in set(list_output_previous) - set(list_output):
+                    (dir_dest / path_output).unlink(missing_ok=True)
+            for variant, path_output in zip(meta["variants"], list_output):
+                path_cached = dir_entry / variant["file"]
+                if archive is not None:
+                    archive.add_file(path_output, path_cached)
+                else:
+                    copy_atomic(path_cached, dir_dest / path_output)
+            # Mark the entry as recently used.
+            os.utime(dir_entry / "meta.json")
+            dict_output[path_rel] = list_output
+        return dict_output
+
+    def generate(self, dir_src: Path, dict_miss: Dict[str, Path], workers: int) -> None:
+        list_args = [
+            (dir_src / path_rel, self.entry_dir(key), self.widths, self.formats, self.quality)
+            for key, path_rel in sorted(dict_miss.items(), key=lambda item: item[1])
+        ]
+        workers = min(workers or os.cpu_count() or 1, len(list_args))
+        if workers <= 1:
+            for args in list_args:
+                generate_variants(*args)
+            return
+        # Spawned rather than forked: the CLI runs a logging listener thread.
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            for _meta in executor.map(generate_variants, *zip(*list_args)):
+                pass
+
+    def remove(self, dir_dest: Path, path_rel: Path) -> List[Path]:
+        """Delete the variants of a deleted source image and forget it."""
+        entry = self.metadata.pop(path_rel, None)
+        if entry is None:
+            return []
+        list_output = self.output_paths(path_rel, entry[1])
+        for path_output in list_output:
+            (dir_dest / path_output).unlink(missing_ok=True)
+        return list_output
+
+
+_image_processors: dict[Path, ImageProcessor] = {}
+
+
+def get_image_processor(
+    dir_dest: str | Path,
+    list_image_regex: List[str],
+    directory: str | Path,
+    widths: List[int],
+    formats: List[str],
+    quality: int,
+) -> ImageProcessor | None:
+    """Return the shared image processor of ``dir_dest``.
+
+    Returns
+    -------
+    ImageProcessor or None
+        The processor kept for ``dir_dest``, whose variant lookups the preview
+        server and watch mode share with the initial build. It is replaced
+        when the cache directory, widths, formats or quality change. ``None``
+        without image patterns.
+    """
+    if not list_image_regex:
+        return None
+    path_dest = Path(dir_dest).resolve()
+    image_processor = _image_processors.get(path_dest)
+    if (
+        image_processor is None
+        or image_processor.directory != Path(directory) / IMAGE_CACHE_VERSION
+        or (image_processor.widths, image_processor.formats, image_processor.quality)
+        != (list(widths), list(formats), quality)
+    ):
+        image_processor = _image_processors[path_dest] = ImageProcessor(
+            directory, widths, formats, quality
+        )
+    return image_processor
+
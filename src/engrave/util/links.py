@@ -0,0 +1,335 @@
+"""Internal link and asset reference checking over built output.
+
+``LinkChecker`` parses ``href``, ``src`` and ``srcset`` references of every
+HTML output, resolves internal ones to destination-relative paths, and
+reports those that match no known output. A link to a directory (``docs/``
+or ``docs``) is valid when ``docs/index.html`` exists. External URLs,
+``mailto:``/``data:``-style references, and fragment-only links are ignored;
+links starting with ``site_url`` are checked like root-relative ones.
+
+A full check parses pages across a process pool; the parent process keeps
+the known outputs and a reverse index from link targets to pages. In watch
+mode, rebuilt pages are re-parsed one by one, and added or deleted outputs
+only re-validate the pages whose stored links point at them, without
+re-parsing those pages.
+"""
+
+# lib: built-in
+import logging
+import multiprocessing
+import os
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+from urllib.parse import unquote, urlsplit
+
+# lib: local
+from .metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+LINK_ATTRIBUTES = {"href", "src"}
+# Below this many pages per worker, a process pool costs more than it saves.
+PAGES_PER_WORKER = 64
+
+
+class LinkExtractor(HTMLParser):
+    """Collect ``href``, ``src`` and ``srcset`` values of an HTML document."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.list_link: List[str] = []
+
+    def handle_starttag(self, tag, attrs) -> None:
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name in LINK_ATTRIBUTES:
+                self.list_link.append(value)
+            elif name == "srcset":
+                for candidate in value.split(","):
+                    parts = candidate.split()
+                    if parts:
+                        self.list_link.append(parts[0])
+
+
+def extract_links(html: str) -> List[str]:
+    """Return the link references of an HTML document in document order."""
+    extractor = LinkExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.list_link
+
+
+def extract_page_links(dir_dest: Path, path_rel: Path) -> Tuple[Path, List[str]]:
+    """Read one output page and return its link references.
+
+    Runs inside link-check worker processes.
+    """
+    html = (dir_dest / path_rel).read_text(encoding="utf-8", errors="replace")
+    return path_rel, extract_links(html)
+
+
+def resolve_link(path_page: Path, link: str, site_url: str | None = None) -> Path | None:
+    """
+    Resolve a link reference to a destination-relative output path.
+
+    Parameters
+    ----------
+    path_page : pathlib.Path
+        Destination-relative page containing the link.
+    link : str
+        Raw ``href``/``src`` value.
+    site_url : str, optional
+        Absolute site URL; links below it are treated as root-relative, and
+        its path is the root of root-relative links.
+
+    Returns
+    -------
+    pathlib.Path or None
+        Target path, or ``None`` for links not checked. Targets escaping the
+        destination start with ``..`` and never match an output.
+    """
+    link = link.strip()
+    path_base = "/"
+    if site_url is not None:
+        site_url = site_url.rstrip("/") + "/"
+        path_base = urlsplit(site_url).path or "/"
+        if link.startswith(site_url):
+            link = path_base + link[len(site_url) :]
+    parts = urlsplit(link)
+    if parts.scheme or parts.netloc:
+        return None
+    path_link = unquote(parts.path)
+    if not path_link:
+        return None
+
+    if path_link.startswith("/"):
+        if path_link.startswith(path_base):
+            path_link = path_link[len(path_base) :]
+        else:
+            path_link = "../" + path_link.lstrip("/")
+    else:
+        path_link = posixpath.join(path_page.parent.as_posix(), path_link)
+    path_target = posixpath.normpath(path_link)
+    if path_link.endswith("/") or path_target == ".":
+        path_target = posixpath.join(path_target, "index.html")
+    return Path(posixpath.normpath(path_target))
+
+
+def list_outputs(dir_dest: Path) -> Set[Path]:
+    """Return every file below ``dir_dest``, relative to it."""
+    set_output: Set[Path] = set()
+    for dir_path, _list_dir, list_file in os.walk(dir_dest):
+        path_dir = Path(dir_path).relative_to(dir_dest)
+        set_output.update(path_dir / name for name in list_file)
+    return set_output
+
+
+class LinkChecker:
+    """Known outputs of a site and the internal links of its pages.
+
+    Parameters
+    ----------
+    dir_dest : str or pathlib.Path
+        Destination directory of the site.
+    site_url : str, optional
+        Absolute site URL, see ``resolve_link``.
+    """
+
+    def __init__(self, dir_dest: str | Path, site_url: str | None = None) -> None:
+        self.dir_dest = Path(dir_dest)
+        self.site_url = site_url
+        self.outputs: Set[Path] = set()
+        self.page_links: Dict[Path, Dict[str, Path]] = {}
+        self.target_pages: Dict[Path, Set[Path]] = {}
+        self.broken: Dict[Path, List[str]] = {}
+        self.dirty_pages: Set[Path] = set()
+
+    def exists(self, path_target: Path) -> bool:
+        return path_target in self.outputs or path_target / "index.html" in self.outputs
+
+    def set_links(self, path_page: Path, list_link: List[str]) -> None:
+        """Store the resolved internal links of one page."""
+        self.forget_links(path_page)
+        dict_link: Dict[str, Path] = {}
+        for link in list_link:
+            path_target = resolve_link(path_page, link, self.site_url)
+            if path_target is None:
+                continue
+            dict_link[link] = path_target
+            self.target_pages.setdefault(path_target, set()).add(path_page)
+        self.page_links[path_page] = dict_link
+        self.dirty_pages.add(path_page)
+
+    def forget_links(self, path_page: Path) -> None:
+        for path_target in self.page_links.pop(path_page, {}).values():
+            list_page = self.target_pages.get(path_target)
+            if list_page is None:
+                continue
+            list_page.discard(path_page)
+            if not list_page:
+                del self.target_pages[path_target]
+        self.broken.pop(path_page, None)
+
+    def validate(self, path_page: Path) -> List[str]:
+        """Recompute and return the broken links of one page."""
+        list_broken = [
+            link
+            for link, path_target in self.page_links.get(path_page, {}).items()
+            if not self.exists(path_target)
+        ]
+        if list_broken:
+            self.broken[path_page] = list_broken
+        else:
+            self.broken.pop(path_page, None)
+        return list_broken
+
+    def pages_linking_to(self, path_output: Path) -> Set[Path]:
+        """Return pages with a link resolving to ``path_output``."""
+        set_page = set(self.target_pages.get(path_output, set()))
+        if path_output.name == "index.html":
+            set_page |= self.target_pages.get(path_output.parent, set())
+        return set_page
+
+    def check_all(self, workers: int = 0) -> int:
+        """
+        List outputs and check every HTML page.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Worker processes parsing pages; ``0`` uses one per CPU. Small sites
+            are parsed in this process.
+
+        Returns
+        -------
+        int
+            Number of broken links.
+        """
+        self.outputs = list_outputs(self.dir_dest)
+        self.page_links.clear()
+        self.target_pages.clear()
+        self.broken.clear()
+        list_page = sorted(path for path in self.outputs if path.suffix == ".html")
+
+        workers = min(
+            workers or os.cpu_count() or 1, max(1, len(list_page) // PAGES_PER_WORKER)
+        )
+        extract = partial(extract_page_links, self.dir_dest)
+        if workers <= 1:
+            iter_result = map(extract, list_page)
+            for path_page, list_link in iter_result:
+                self.set_links(path_page, list_link)
+        else:
+            # Spawned rather than forked: the CLI runs a logging listener thread.
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                chunksize = max(1, len(list_page) // (workers * 4))
+                for path_page, list_link in executor.map(
+                    extract, list_page, chunksize=chunksize
+                ):
+                    self.set_links(path_page, list_link)
+        metrics.inc("engrave_link_check_pages_total", len(list_page))
+        return self.report()
+
+    def update_page(self, path_rel: Path) -> None:
+        """Re-parse one rebuilt page and re-validate pages linking to it."""
+        try:
+            _path, list_link = extract_page_links(self.dir_dest, path_rel)
+        except FileNotFoundError:
+            self.remove(path_rel)
+            return
+        metrics.inc("engrave_link_check_pages_total")
+        self.add_output(path_rel)
+        self.set_links(path_rel, list_link)
+
+    def add_output(self, path_rel: Path) -> None:
+        """Record an added output, such as a copied asset."""
+        if path_rel in self.outputs:
+            return
+        self.outputs.add(path_rel)
+        self.dirty_pages |= self.pages_linking_to(path_rel)
+
+    def remove(self, path_rel: Path) -> None:
+        """Record a deleted output and drop its links if it was a page."""
+        if path_rel not in self.outputs:
+            return
+        self.outputs.discard(path_rel)
+        self.forget_links(path_rel)
+        self.dirty_pages.discard(path_rel)
+        self.dirty_pages |= self.pages_linking_to(path_rel)
+
+    def remove_under(self, path_dir: Path) -> None:
+        """Record the deletion of every output under a directory."""
+        for path_rel in [path for path in self.outputs if path.is_relative_to(path_dir)]:
+            self.remove(path_rel)
+
+    def move_under(self, path_old: Path, path_new: Path) -> None:
+        """Record a moved output directory, re-resolving its pages' links."""
+        list_moved = [path for path in self.outputs if path.is_relative_to(path_old)]
+        dict_page_links = {
+            path: list(self.page_links.get(path, {})) for path in list_moved
+        }
+        for path_rel in list_moved:
+            self.remove(path_rel)
+        for path_rel in list_moved:
+            path_rel_new = path_new / path_rel.relative_to(path_old)
+            self.add_output(path_rel_new)
+            if path_rel.suffix == ".html":
+                self.set_links(path_rel_new, dict_page_links[path_rel])
+
+    def report(self) -> int:
+        """
+        Validate pages changed since the last report and log broken links.
+
+        Returns
+        -------
+        int
+            Number of broken links on the site.
+        """
+        list_page = sorted(self.dirty_pages)
+        self.dirty_pages.clear()
+        for path_page in list_page:
+            for link in self.validate(path_page):
+                logger.warning("Broken link in %s: %s", path_page.as_posix(), link)
+        count = sum(len(list_broken) for list_broken in self.broken.values())
+        if list_page:
+            logger.info(
+                "Link check: %d broken link(s) in %d page(s)", count, len(self.broken)
+            )
+        return count
+
+    def save(self) -> int:
+        """Report after a watch batch, like the other page indexes."""
+        return self.report()
+
+
+_link_checkers: dict[Path, LinkChecker] = {}
+
+
+def get_link_checker(
+    dir_dest: str | Path, check_links: bool, site_url: str | None = None
+) -> LinkChecker | None:
+    """Return the shared link checker for ``dir_dest``.
+
+    Returns
+    -------
+    LinkChecker or None
+        The checker kept for ``dir_dest`` with ``site_url`` applied. It holds
+        the outputs and links found by the initial build, which watch mode
+        revalidates per change. ``None`` when ``check_links`` is off.
+    """
+    if not check_links:
+        return None
+    path_directory = Path(dir_dest).resolve()
+    link_checker = _link_checkers.get(path_directory)
+    if link_checker is None:
+        link_checker = _link_checkers[path_directory] = LinkChecker(path_directory)
+    link_checker.site_url = site_url
+    return link_checker
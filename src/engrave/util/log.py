@@ -1,9 +1,43 @@
 # lib: built-in
-import sys
+import atexit
 import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+
+_queue_listener: logging.handlers.QueueListener | None = None
+
+
+def stop_queue_listener() -> None:
+    """Flush queued records and stop the background logging thread."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
 
 
 def setup_root_logger(log_level: str = 'INFO') -> logging.Logger:
+    """Configure the root logger to write through a background thread.
+
+    Records are put on an in-memory queue by a ``QueueHandler`` and written to
+    stdout (below WARNING) or stderr (WARNING and above) by a
+    ``QueueListener`` thread, so logging calls on the build path never block
+    on terminal or CI log I/O.
+
+    Parameters
+    ----------
+    log_level : str, optional
+        Root logger level name. Unknown names fall back to ``INFO``.
+
+    Returns
+    -------
+    logging.Logger
+        The configured root logger.
+    """
+    global _queue_listener
+
     logger = logging.getLogger()
     logger.setLevel(logging._nameToLevel.get(log_level.upper(), logging.INFO))
 
@@ -20,7 +54,112 @@ def setup_root_logger(log_level: str = 'INFO') -> logging.Logger:
     stdout_handler.setFormatter(fmt)
     stderr_handler.setFormatter(fmt)
 
-    logger.addHandler(stdout_handler)
-    logger.addHandler(stderr_handler)
+    # Replace handlers from a previous call instead of stacking duplicates.
+    stop_queue_listener()
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            logger.removeHandler(handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue,
+        stdout_handler,
+        stderr_handler,
+        respect_handler_level=True,
+    )
+    _queue_listener.start()
 
     return logger
+
+
+atexit.register(stop_queue_listener)
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration as ``1h02m03s``, ``2m03s``, or ``3.4s``."""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, seconds = divmod(int(seconds), 60)
+    if minutes < 60:
+        return f"{minutes}m{seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s"
+
+
+class ProgressReporter:
+    """Aggregate per-file progress into periodic INFO log lines.
+
+    Parameters
+    ----------
+    total : int
+        Number of files expected to be processed.
+    logger : logging.Logger
+        Logger that receives progress lines.
+    label : str, optional
+        Prefix for progress lines. Defaults to ``"Build"``.
+    interval : float, optional
+        Minimum seconds between progress lines. Defaults to ``2.0``.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        *,
+        logger: logging.Logger,
+        label: str = "Build",
+        interval: float = 2.0,
+    ) -> None:
+        self.total = total
+        self.logger = logger
+        self.label = label
+        self.interval = interval
+        self.counts: dict[str, int] = {}
+        self.done = 0
+        self.time_start = time.perf_counter()
+        self.time_last_report = self.time_start
+
+    def advance(self, kind: str) -> None:
+        """Count one processed file of ``kind`` and log progress when due."""
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.done += 1
+        now = time.perf_counter()
+        if now - self.time_last_report >= self.interval:
+            self.time_last_report = now
+            self.report(now)
+
+    def report(self, now: float | None = None) -> None:
+        """Log counts, processing rate, and estimated time remaining."""
+        if now is None:
+            now = time.perf_counter()
+        elapsed = now - self.time_start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - self.done, 0)
+        eta = format_duration(remaining / rate) if rate > 0 else "unknown"
+        self.logger.info(
+            "%s progress: %d/%d files (%s), %.1f files/s, ETA %s",
+            self.label,
+            self.done,
+            self.total,
+            self.format_counts(),
+            rate,
+            eta,
+        )
+
+    def finish(self) -> None:
+        """Log the final summary line."""
+        elapsed = time.perf_counter() - self.time_start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        self.logger.info(
+            "%s complete: %d files (%s) in %s, %.1f files/s",
+            self.label,
+            self.done,
+            self.format_counts(),
+            format_duration(elapsed),
+            rate,
+        )
+
+    def format_counts(self) -> str:
+        if not self.counts:
+            return "none"
+        return ", ".join(f"{kind}: {count}" for kind, count in sorted(self.counts.items()))
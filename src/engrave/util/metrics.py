@@ -0,0 +1,360 @@
+"""Lightweight in-process metrics for the build, watch, and server pipelines.
+
+This module keeps a single process-wide ``MetricsRegistry`` instance that the
+render, watch, and server code paths record into. The registry is disabled by
+default; every recording helper checks ``enabled`` first and returns
+immediately, so instrumented hot paths pay a single attribute lookup when
+metrics are off.
+
+Recorded values are exposed in the Prometheus text exposition format through
+``MetricsRegistry.render_prometheus()``, which backs the preview server's
+``/__engrave/metrics`` endpoint and the ``engrave watch`` metrics dump.
+"""
+
+# lib: built-in
+import asyncio
+import bisect
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# lib: local
+from .fs import write_text_atomic
+
+
+logger = logging.getLogger(__name__)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+BATCH_SIZE_BUCKETS: Tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 1000, 5000)
+
+
+@dataclass
+class Histogram:
+    """Cumulative-bucket histogram for one metric/label combination."""
+
+    buckets: Tuple[float, ...]
+    counts: List[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+def _label_key(labels: Dict[str, str] | None) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(label_key: LabelKey, extra: Tuple[str, str] | None = None) -> str:
+    items = list(label_key)
+    if extra is not None:
+        items.append(extra)
+    if not items:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(
+            key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for key, value in items
+    )
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Process-wide store of counters, gauges, and histograms.
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        Whether recording helpers store values. Defaults to ``False``.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.help: Dict[str, str] = {}
+        self.collectors: List[Callable[["MetricsRegistry"], None]] = []
+
+    def enable(self) -> None:
+        """Start recording values."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording values without discarding recorded state."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Discard all recorded values, keeping help text and collectors."""
+        self.counters.clear()
+        self.gauges.clear()
+        self.histograms.clear()
+
+    def describe(self, name: str, text: str) -> None:
+        """Attach ``# HELP`` text to a metric name."""
+        self.help[name] = text
+
+    def add_collector(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        """Register a callback that sets gauges right before exposition.
+
+        Collectors let callers report values such as queue depths that are
+        cheap to read on demand but wasteful to update on every change.
+        """
+        self.collectors.append(collector)
+
+    def inc(
+        self,
+        name: str,
+        value: float = 1.0,
+        labels: Dict[str, str] | None = None,
+    ) -> None:
+        """Increment a counter."""
+        if not self.enabled:
+            return
+        series = self.counters.setdefault(name, {})
+        label_key = _label_key(labels)
+        series[label_key] = series.get(label_key, 0.0) + value
+
+    def set(
+        self,
+        name: str,
+        value: float,
+        labels: Dict[str, str] | None = None,
+    ) -> None:
+        """Set a gauge to an absolute value."""
+        if not self.enabled:
+            return
+        self.gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Dict[str, str] | None = None,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Record one histogram observation."""
+        if not self.enabled:
+            return
+        series = self.histograms.setdefault(name, {})
+        label_key = _label_key(labels)
+        histogram = series.get(label_key)
+        if histogram is None:
+            histogram = series[label_key] = Histogram(buckets=buckets)
+        histogram.observe(value)
+
+    @contextmanager
+    def timer(
+        self,
+        name: str,
+        labels: Dict[str, str] | None = None,
+    ) -> Iterator[None]:
+        """Observe the wall-clock duration of the ``with`` block in seconds."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels=labels)
+
+    def get_counter(self, name: str, labels: Dict[str, str] | None = None) -> float:
+        """Return the current value of a counter, or ``0`` when unset."""
+        return self.counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def collect(self) -> None:
+        """Run registered collectors so on-demand gauges are current."""
+        for collector in self.collectors:
+            collector(self)
+
+    def render_prometheus(self) -> str:
+        """Render all recorded metrics in the Prometheus text format.
+
+        Returns
+        -------
+        str
+            Exposition text terminated by a newline.
+        """
+        self.collect()
+
+        lines: List[str] = []
+
+        for name in sorted(self.counters):
+            lines.extend(self._header(name, "counter"))
+            for label_key, value in sorted(self.counters[name].items()):
+                lines.append(f"{name}{_format_labels(label_key)} {_format_value(value)}")
+
+        for name in sorted(self.gauges):
+            lines.extend(self._header(name, "gauge"))
+            for label_key, value in sorted(self.gauges[name].items()):
+                lines.append(f"{name}{_format_labels(label_key)} {_format_value(value)}")
+
+        for name in sorted(self.histograms):
+            lines.extend(self._header(name, "histogram"))
+            for label_key, histogram in sorted(self.histograms[name].items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    labels = _format_labels(label_key, ("le", _format_value(bound)))
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _format_labels(label_key, ("le", "+Inf"))
+                lines.append(f"{name}_bucket{labels} {histogram.count}")
+                labels = _format_labels(label_key)
+                lines.append(f"{name}_sum{labels} {_format_value(histogram.total)}")
+                lines.append(f"{name}_count{labels} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """Return a compact one-line summary suitable for periodic logging."""
+        self.collect()
+        parts: List[str] = []
+        for name in sorted(self.counters):
+            total = sum(self.counters[name].values())
+            parts.append(f"{name}={_format_value(total)}")
+        for name in sorted(self.gauges):
+            total = sum(self.gauges[name].values())
+            parts.append(f"{name}={_format_value(total)}")
+        for name in sorted(self.histograms):
+            count = sum(h.count for h in self.histograms[name].values())
+            total = sum(h.total for h in self.histograms[name].values())
+            mean = total / count if count else 0.0
+            parts.append(f"{name}[count={count} mean={mean:.4f}]")
+        return " ".join(parts)
+
+    def dump(self, path_file: str | Path) -> None:
+        """Atomically write the Prometheus exposition text to a file.
+
+        Parameters
+        ----------
+        path_file : str or pathlib.Path
+            Destination file. A sibling temporary file is written first and
+            then moved into place so readers never see a partial dump.
+        """
+        write_text_atomic(Path(path_file), self.render_prometheus())
+
+    async def log_periodically(self, interval: float) -> None:
+        """Log ``summary()`` every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            logger.info("Metrics: %s", self.summary())
+
+    def _header(self, name: str, kind: str) -> List[str]:
+        lines = []
+        if name in self.help:
+            lines.append(f"# HELP {name} {self.help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+        return lines
+
+
+metrics = MetricsRegistry()
+
+metrics.describe("engrave_render_seconds", "Page render latency in seconds.")
+metrics.describe("engrave_template_lookups_total", "Jinja template lookups.")
+metrics.describe(
+    "engrave_template_loads_total",
+    "Jinja template sources loaded from disk (template cache misses).",
+)
+metrics.describe(
+    "engrave_template_cache_hit_ratio",
+    "Share of template lookups served from the Jinja template cache.",
+)
+metrics.describe("engrave_markdown_lookups_total", "markdown() include calls.")
+metrics.describe("engrave_markdown_loads_total", "Markdown sources read from disk.")
+metrics.describe("engrave_build_cache_hits_total", "Pages restored from the build cache.")
+metrics.describe("engrave_build_cache_misses_total", "Pages rendered on a build cache miss.")
+metrics.describe(
+    "engrave_build_cache_evicted_bytes_total",
+    "Bytes removed from the build cache by LRU eviction.",
+)
+metrics.describe(
+    "engrave_search_pages_indexed_total",
+    "Pages extracted into the full-text search index.",
+)
+metrics.describe(
+    "engrave_link_check_pages_total",
+    "Output pages parsed by the link checker.",
+)
+metrics.describe(
+    "engrave_fragment_cache_hits_total",
+    "{% cache %} blocks reused from the fragment cache.",
+)
+metrics.describe(
+    "engrave_fragment_cache_misses_total",
+    "{% cache %} blocks rendered and stored in the fragment cache.",
+)
+metrics.describe(
+    "engrave_data_loads_total",
+    "Site data files parsed for the `data` template global.",
+)
+metrics.describe(
+    "engrave_front_matter_reads_total",
+    "Source headers read for front matter, outside its mtime cache.",
+)
+metrics.describe(
+    "engrave_image_cache_hits_total",
+    "Source images whose variants were restored from the image cache.",
+)
+metrics.describe(
+    "engrave_image_cache_misses_total",
+    "Source images whose variants were generated.",
+)
+metrics.describe("engrave_watch_batch_size", "Number of file changes per watch batch.")
+metrics.describe("engrave_watch_rebuild_seconds", "Watch batch processing time.")
+metrics.describe("engrave_sse_clients", "Connected live-reload SSE clients.")
+metrics.describe("engrave_sse_queue_depth", "Pending events across SSE client queues.")
+
+
+def _collect_template_cache_ratio(registry: MetricsRegistry) -> None:
+    # markdown() reads every include from disk, so only templates have a ratio.
+    lookups = registry.get_counter("engrave_template_lookups_total")
+    loads = registry.get_counter("engrave_template_loads_total")
+    if lookups:
+        registry.set(
+            "engrave_template_cache_hit_ratio", max(lookups - loads, 0.0) / lookups
+        )
+
+
+metrics.add_collector(_collect_template_cache_ratio)
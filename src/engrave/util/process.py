@@ -1,14 +1,29 @@
 """Processing helpers for Engrave build and watch pipelines."""
 
 import logging
+import os
+from hashlib import sha256
 import re
 import shutil
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+# lib: external
+import jinja2
 
 # lib: local
-from ..template import RenderDependencies, get_template
-from .dataclass import FileProcessInfo
+from ..template import RenderDependencies, get_bytecode_cache, get_template
+from .archive import ArchiveWriter
+from .cache import BuildCache, get_build_cache, get_compiled_templates, get_engine_config
+from .collection import CollectionIndex, PageEntry, get_collection_index
+from .dataclass import BuildConfig, FileProcessInfo
+from .fs import atomic_path
+from .frontmatter import get_front_matter
+from .image import ImageProcessor, get_image_processor
+from .links import LinkChecker, get_link_checker
+from .metrics import metrics
+from .search import SearchIndex, get_search_index
+from .sitemap import Sitemap, get_sitemap
 
 
 logger = logging.getLogger(__name__)
@@ -127,6 +142,37 @@ def should_build_html(*, path: Path, list_exclude_regex: List[re.Pattern]) -> bo
     )
 
 
+def should_process_image(
+    *,
+    path: Path,
+    list_image_regex: List[re.Pattern],
+    list_exclude_regex: List[re.Pattern],
+) -> bool:
+    """
+    Check whether a relative path is an image to write variants of.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Relative path to evaluate.
+    list_image_regex : list of re.Pattern
+        Compiled regular expressions selecting images.
+    list_exclude_regex : list of re.Pattern
+        Compiled regular expressions used as exclusion rules.
+
+    Returns
+    -------
+    bool
+        True when the path matches an image regex, is not excluded, and is not
+        an HTML template.
+    """
+    return path.suffix != ".html" and is_valid_path(
+        path=path,
+        list_regex=list_image_regex,
+        list_exclude_regex=list_exclude_regex,
+    )
+
+
 def should_copy_path(
     *,
     path: Path,
@@ -158,19 +204,176 @@ def should_copy_path(
     )
 
 
-def build_html(file_process_info: FileProcessInfo) -> RenderDependencies:
+STREAM_BUFFER_SIZE = 1 << 16
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in buffered chunks."""
+    digest = sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(STREAM_BUFFER_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_template_options(build_config: BuildConfig) -> Dict[str, Any]:
+    """
+    Collect template-engine options shared by every page of one build.
+
+    Parameters
+    ----------
+    build_config : BuildConfig
+        Build, watch, or server configuration.
+
+    Returns
+    -------
+    dict
+        Keyword arguments accepted by ``get_template``.
+    """
+    return {
+        "bytecode_cache": get_bytecode_cache(build_config.bytecode_cache),
+        "compiled_templates": get_compiled_templates(build_config),
+        "data_dir": build_config.data_dir,
+        "collection_index": get_collection_index(build_config.dir_src, build_config.exclude),
+        "image_processor": get_image_processor(
+            build_config.dir_dest,
+            build_config.image,
+            build_config.image_cache,
+            build_config.image_widths,
+            build_config.image_formats,
+            build_config.image_quality,
+        ),
+    }
+
+
+def get_render_options(build_config: BuildConfig) -> Dict[str, Any]:
+    """
+    Collect ``build_html`` options shared by every page of one build.
+
+    Parameters
+    ----------
+    build_config : BuildConfig
+        Build, watch, or server configuration.
+
+    Returns
+    -------
+    dict
+        ``get_template_options`` plus output-writing options accepted by
+        ``build_html``.
+    """
+    return {
+        **get_template_options(build_config),
+        "stream": build_config.stream,
+        "build_cache": get_build_cache(
+            build_config.build_cache,
+            build_config.build_cache_max_mb,
+            get_engine_config(build_config),
+        ),
+        "search_index": get_search_index(
+            build_config.dir_dest, build_config.search_index
+        ),
+        "sitemap": get_sitemap(
+            build_config.dir_dest,
+            build_config.site_url,
+            build_config.feed,
+            build_config.feed_size,
+            build_config.feed_title,
+            build_config.feed_author,
+        ),
+        "link_checker": get_link_checker(
+            build_config.dir_dest, build_config.check_links, build_config.site_url
+        ),
+    }
+
+
+def write_chunks_atomic(path_dest: Path, chunks) -> None:
+    """
+    Write text chunks to ``path_dest`` through a buffered temporary file.
+
+    Parameters
+    ----------
+    path_dest : pathlib.Path
+        Final output path.
+    chunks : iterable of str
+        Text chunks, such as those yielded by ``jinja2.Template.generate()``.
+
+    Notes
+    -----
+    Chunks are written to a hidden sibling file which replaces ``path_dest``
+    only after every chunk was written, so readers never observe a partially
+    rendered page and a failed render leaves the previous output in place.
+    """
+    with atomic_path(path_dest) as path_tmp:
+        with open(
+            path_tmp, "w", encoding="utf-8", buffering=STREAM_BUFFER_SIZE
+        ) as file:
+            for chunk in chunks:
+                file.write(chunk)
+
+
+def tee_chunks(chunks: Iterable[str], collector: Callable[[str], None]) -> Iterator[str]:
+    """Yield ``chunks`` unchanged while passing each one to ``collector``."""
+    for chunk in chunks:
+        collector(chunk)
+        yield chunk
+
+
+def build_html(
+    file_process_info: FileProcessInfo,
+    *,
+    bytecode_cache: jinja2.BytecodeCache | None = None,
+    compiled_templates: str | Path | None = None,
+    data_dir: str | Path | None = None,
+    collection_index: CollectionIndex | None = None,
+    image_processor: ImageProcessor | None = None,
+    stream: bool = False,
+    build_cache: BuildCache | None = None,
+    archive: ArchiveWriter | None = None,
+    search_index: SearchIndex | None = None,
+    sitemap: Sitemap | None = None,
+    link_checker: LinkChecker | None = None,
+) -> RenderDependencies:
     """Render a template file to HTML in the destination tree.
 
     Parameters
     ----------
     file_process_info : FileProcessInfo
         Context containing the source file path, source root (`dir_src`), and destination root (`dir_dest`).
+    bytecode_cache : jinja2.BytecodeCache, optional
+        Shared bytecode cache used to skip recompiling unchanged templates.
+    compiled_templates : str or pathlib.Path, optional
+        Precompiled template bundle written by ``engrave compile``.
+    data_dir : str or pathlib.Path, optional
+        Source-relative directory of site data files exposed as ``data``.
+    collection_index : CollectionIndex, optional
+        Pages listed by the ``collection()`` global.
+    image_processor : ImageProcessor, optional
+        Responsive image variants looked up by the ``srcset()`` global.
+    stream : bool, optional
+        Write ``Template.generate()`` chunks through a buffered temporary file
+        instead of materializing the whole page with ``render()``. Defaults to
+        ``False``.
+    build_cache : BuildCache, optional
+        Content-addressed cache of rendered pages. On a hit the cached output
+        is copied to the destination and the page is not rendered.
+    archive : ArchiveWriter, optional
+        Archive to stream the rendered page into instead of ``dir_dest``.
+        Pages are always rendered with ``Template.generate()`` in this mode.
+    search_index : SearchIndex, optional
+        Full-text search index updated with the text of the written page,
+        including pages restored from ``build_cache``.
+    sitemap : Sitemap, optional
+        Sitemap and feeds updated with the written page and its last
+        modification time.
+    link_checker : LinkChecker, optional
+        Link checker that re-parses the written page and re-validates pages
+        linking to it.
 
     Returns
     -------
     RenderDependencies
-        Source-relative Markdown and template files used while rendering the
-        HTML file.
+        Source-relative Markdown, template and data files, and collection
+        directories, used while rendering the HTML file.
 
     Side Effects
     ------------
@@ -180,45 +383,120 @@ def build_html(file_process_info: FileProcessInfo) -> RenderDependencies:
     Notes
     -----
     The relative path from `dir_src` is used to locate and render the template via `get_template(dir_src=...)`.
+
+    The page is rendered with a ``page`` variable holding its own front
+    matter, read from the source header only, so ``{{ page.title }}`` works
+    in the page and in the layouts it extends.
     """
     # Get relative path from source directory
     path_rel = file_process_info.path.resolve().relative_to(
         file_process_info.dir_src.resolve()
     )
     path_src = file_process_info.dir_src / path_rel
+    path_dest = file_process_info.dir_dest / path_rel
+
+    if build_cache is not None and archive is None:
+        dependencies = build_cache.restore(
+            file_process_info.dir_src, path_rel, path_dest, collection_index
+        )
+        if dependencies is not None:
+            logger.debug("Restored HTML from build cache: %s → %s", path_src, path_dest)
+            if search_index is not None:
+                search_index.update_from_file(path_rel, path_dest)
+            if sitemap is not None:
+                sitemap.update(
+                    file_process_info.dir_src,
+                    file_process_info.dir_dest,
+                    path_rel,
+                    dependencies,
+                )
+            if link_checker is not None:
+                link_checker.update_page(path_rel)
+            return dependencies
+
     markdown_dependencies: set[Path] = set()
     template_dependencies: set[Path] = set()
+    data_dependencies: set[Path] = set()
+    collection_dependencies: set[Path] = set()
+    image_dependencies: set[Path] = set()
 
     # Get template loader
     template = get_template(
         dir_src=file_process_info.dir_src,
         markdown_dependency_collector=markdown_dependencies.add,
         template_dependency_collector=template_dependencies.add,
+        data_dependency_collector=data_dependencies.add,
+        collection_dependency_collector=collection_dependencies.add,
+        image_dependency_collector=image_dependencies.add,
+        bytecode_cache=bytecode_cache,
+        compiled_templates=compiled_templates,
+        data_dir=data_dir,
+        collection_index=collection_index,
+        image_processor=image_processor,
     )
 
+    page = PageEntry(path=path_rel, url=path_rel.name, meta=get_front_matter(path_src))
+
     # Create output directory if needed
-    path_dest = file_process_info.dir_dest / path_rel
-    path_dest.parent.mkdir(parents=True, exist_ok=True)
+    if archive is None:
+        path_dest.parent.mkdir(parents=True, exist_ok=True)
 
     # Write rendered content to output file
-    with open(path_dest, "w", encoding="utf-8") as file:
-        file.write(template(str(path_rel)).render())
-
-    logger.info(f"Built HTML: {path_src} → {path_dest}")
+    with metrics.timer(
+        "engrave_render_seconds",
+        labels={"page": path_rel.as_posix(), "mode": "build"},
+    ):
+        if archive is not None:
+            chunks = template(str(path_rel)).generate(page=page)
+            if search_index is not None:
+                list_chunk: List[str] = []
+                chunks = tee_chunks(chunks, list_chunk.append)
+            archive.add_chunks(path_rel, chunks)
+            if search_index is not None:
+                search_index.update(path_rel, "".join(list_chunk))
+        elif stream:
+            write_chunks_atomic(path_dest, template(str(path_rel)).generate(page=page))
+        else:
+            with open(path_dest, "w", encoding="utf-8") as file:
+                file.write(template(str(path_rel)).render(page=page))
+
+    logger.debug("Built HTML: %s → %s", path_src, path_dest)
+    if search_index is not None and archive is None:
+        search_index.update_from_file(path_rel, path_dest)
     template_dependencies.discard(path_rel)
-    return RenderDependencies(
+    dependencies = RenderDependencies(
         markdown_paths=markdown_dependencies,
         template_paths=template_dependencies,
+        data_paths=data_dependencies,
+        collection_paths=collection_dependencies,
+        image_paths=image_dependencies,
     )
-
-
-def copy_file(file_process_info: FileProcessInfo) -> None:
+    if build_cache is not None and archive is None:
+        build_cache.store(
+            file_process_info.dir_src, path_rel, path_dest, dependencies, collection_index
+        )
+    if sitemap is not None:
+        sitemap.update(
+            file_process_info.dir_src, file_process_info.dir_dest, path_rel, dependencies
+        )
+    if link_checker is not None and archive is None:
+        link_checker.update_page(path_rel)
+    return dependencies
+
+
+def copy_file(
+    file_process_info: FileProcessInfo,
+    *,
+    archive: ArchiveWriter | None = None,
+) -> None:
     """Copy a source asset to the destination tree, preserving metadata.
 
     Parameters
     ----------
     file_process_info : FileProcessInfo
         Context containing the source file path, source root (`dir_src`), and destination root (`dir_dest`).
+    archive : ArchiveWriter, optional
+        Archive to stream the asset into instead of ``dir_dest``.
 
     Side Effects
     ------------
@@ -230,13 +508,18 @@ def copy_file(file_process_info: FileProcessInfo) -> None:
         file_process_info.dir_src.resolve()
     )
     path_src = file_process_info.dir_src / path_rel
+    if archive is not None:
+        archive.add_file(path_rel, file_process_info.path)
+        logger.debug("Archived asset: %s → %s:%s", path_src, archive.path, path_rel)
+        return
+
     # Create output directory if needed
     path_dest = file_process_info.dir_dest / path_rel
     path_dest.parent.mkdir(parents=True, exist_ok=True)
 
     # Copy the asset file
     shutil.copy2(file_process_info.path, path_dest)
-    logger.info(f"Copied asset: {path_src} → {path_dest}")
+    logger.debug("Copied asset: %s → %s", path_src, path_dest)
 
 
 def delete_file(file_process_info: FileProcessInfo) -> None:
@@ -260,6 +543,96 @@ def delete_file(file_process_info: FileProcessInfo) -> None:
     try:
         path_dest.unlink()
     except FileNotFoundError:
-        logger.info(f"Delete skipped for missing output: {path_src} → {path_dest}")
+        logger.debug("Delete skipped for missing output: %s → %s", path_src, path_dest)
         return
-    logger.info(f"Deleted file: {path_src} → {path_dest}")
+    prune_empty_dirs(path_dest.parent, file_process_info.dir_dest)
+    logger.debug("Deleted file: %s → %s", path_src, path_dest)
+
+
+def delete_output(dir_dest: Path, path_rel: Path) -> bool:
+    """Delete one destination-relative output and prune emptied directories.
+
+    Returns
+    -------
+    bool
+        True when a file was removed.
+    """
+    path_dest = dir_dest / path_rel
+    try:
+        path_dest.unlink()
+    except FileNotFoundError:
+        return False
+    prune_empty_dirs(path_dest.parent, dir_dest)
+    logger.debug("Deleted output: %s", path_dest)
+    return True
+
+
+def prune_empty_dirs(path_dir: Path, dir_root: Path) -> None:
+    """Remove ``path_dir`` and its parents while they are empty.
+
+    Parameters
+    ----------
+    path_dir : pathlib.Path
+        Directory to start pruning from.
+    dir_root : pathlib.Path
+        Directory that is never removed; pruning stops below it.
+    """
+    while path_dir != dir_root and path_dir.is_relative_to(dir_root):
+        try:
+            path_dir.rmdir()
+        except OSError:
+            # Not empty, already gone, or not removable.
+            return
+        path_dir = path_dir.parent
+
+
+def list_output_files(dir_dest: Path, path_rel: Path) -> set[Path]:
+    """Return files under an output directory, relative to that directory."""
+    path_dir = dir_dest / path_rel
+    return {path.relative_to(path_dir) for path in path_dir.rglob("*") if path.is_file()}
+
+
+def delete_output_dir(dir_dest: Path, path_rel: Path) -> None:
+    """Remove the output subtree for a deleted source directory.
+
+    Parameters
+    ----------
+    dir_dest : pathlib.Path
+        Destination root.
+    path_rel : pathlib.Path
+        Source-relative directory that was deleted.
+
+    Side Effects
+    ------------
+    - Removes ``dir_dest / path_rel`` in one ``shutil.rmtree`` call.
+    - Prunes parent directories left empty.
+    """
+    path_dest = dir_dest / path_rel
+    shutil.rmtree(path_dest, ignore_errors=True)
+    prune_empty_dirs(path_dest.parent, dir_dest)
+    logger.debug("Deleted directory: %s", path_dest)
+
+
+def move_output_dir(dir_dest: Path, path_old: Path, path_new: Path) -> None:
+    """Move the output subtree of a renamed source directory.
+
+    Parameters
+    ----------
+    dir_dest : pathlib.Path
+        Destination root.
+    path_old, path_new : pathlib.Path
+        Source-relative directory paths before and after the rename.
+
+    Side Effects
+    ------------
+    - Replaces any existing output at the new location.
+    - Prunes parent directories of the old location left empty.
+    """
+    path_dest_old = dir_dest / path_old
+    path_dest_new = dir_dest / path_new
+    path_dest_new.parent.mkdir(parents=True, exist_ok=True)
+    if path_dest_new.exists():
+        shutil.rmtree(path_dest_new)
+    os.replace(path_dest_old, path_dest_new)
+    prune_empty_dirs(path_dest_old.parent, dir_dest)
+    logger.debug("Moved directory: %s → %s", path_dest_old, path_dest_new)
@@ -0,0 +1,211 @@
+"""Build profiling with per-page, template, and Markdown attribution.
+
+The module-level ``profiler`` mirrors ``util.metrics.metrics``: it is disabled
+by default, and ``BuildProfiler.span()`` returns immediately when disabled so
+the instrumented render paths stay cheap during normal builds.
+
+When enabled, every span is recorded with wall-clock start/duration and thread
+CPU time. ``BuildProfiler.write()`` then produces:
+
+- ``profile.txt``: pages sorted by wall time plus the most expensive templates
+  and Markdown includes.
+- ``trace.json``: Chrome trace-event JSON that can be opened in
+  ``chrome://tracing`` or Perfetto to inspect the build timeline.
+"""
+
+# lib: built-in
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+@dataclass
+class ProfileSpan:
+    """One timed region of the build.
+
+    Attributes
+    ----------
+    name : str
+        Source-relative path of the page, template, or Markdown file.
+    category : str
+        Span kind: ``page``, ``template``, ``markdown``, or ``copy``.
+    start : float
+        Wall-clock start in seconds relative to the profiler start.
+    wall : float
+        Wall-clock duration in seconds.
+    cpu : float
+        Thread CPU time in seconds.
+    thread_id : int
+        Identifier of the thread that recorded the span.
+    """
+
+    name: str
+    category: str
+    start: float
+    wall: float
+    cpu: float
+    thread_id: int
+
+
+class BuildProfiler:
+    """Collect timed spans for one build and write profiling reports.
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        Whether ``span()`` records anything. Defaults to ``False``.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.spans: List[ProfileSpan] = []
+        self.time_origin = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def enable(self) -> None:
+        """Clear previous spans and start recording."""
+        self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording, keeping spans for ``write()``."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Discard recorded spans and restart the profile clock."""
+        with self.lock:
+            self.spans = []
+        self.time_origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, category: str) -> Iterator[None]:
+        """Time the ``with`` block as one span.
+
+        Parameters
+        ----------
+        name : str
+            Source-relative path that the span is attributed to.
+        category : str
+            Span kind such as ``page``, ``template``, or ``markdown``.
+        """
+        if not self.enabled:
+            yield
+            return
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            span = ProfileSpan(
+                name=name,
+                category=category,
+                start=wall_start - self.time_origin,
+                wall=time.perf_counter() - wall_start,
+                cpu=time.thread_time() - cpu_start,
+                thread_id=threading.get_ident(),
+            )
+            with self.lock:
+                self.spans.append(span)
+
+    def totals(self, category: str) -> List[Tuple[str, int, float, float]]:
+        """Aggregate spans of one category by name.
+
+        Parameters
+        ----------
+        category : str
+            Span kind to aggregate.
+
+        Returns
+        -------
+        list of tuple
+            ``(name, calls, wall, cpu)`` rows sorted by descending wall time.
+        """
+        rows: Dict[str, List[float]] = {}
+        for span in self.spans:
+            if span.category != category:
+                continue
+            row = rows.setdefault(span.name, [0, 0.0, 0.0])
+            row[0] += 1
+            row[1] += span.wall
+            row[2] += span.cpu
+        return sorted(
+            ((name, int(calls), wall, cpu) for name, (calls, wall, cpu) in rows.items()),
+            key=lambda row: (-row[2], row[0]),
+        )
+
+    def render_report(self, limit: int = 50) -> str:
+        """Render the sorted plain-text profiling report.
+
+        Parameters
+        ----------
+        limit : int, optional
+            Maximum number of rows shown per section. Defaults to ``50``.
+
+        Returns
+        -------
+        str
+            Report text with page, template, and Markdown sections.
+        """
+        lines: List[str] = []
+        sections = (
+            ("Pages", "page"),
+            ("Templates (load and compile)", "template"),
+            ("Markdown includes", "markdown"),
+        )
+        for title, category in sections:
+            rows = self.totals(category)
+            total_wall = sum(row[2] for row in rows)
+            lines.append(f"{title}: {len(rows)} file(s), {total_wall:.3f}s wall")
+            lines.append(f"{'wall (s)':>10} {'cpu (s)':>10} {'calls':>6}  path")
+            for name, calls, wall, cpu in rows[:limit]:
+                lines.append(f"{wall:>10.4f} {cpu:>10.4f} {calls:>6}  {name}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def render_trace(self) -> Dict[str, object]:
+        """Return the recorded spans as a Chrome trace-event document."""
+        pid = os.getpid()
+        trace_events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round(span.start * 1_000_000, 3),
+                "dur": round(span.wall * 1_000_000, 3),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {"cpu_ms": round(span.cpu * 1000, 3)},
+            }
+            for span in sorted(self.spans, key=lambda span: span.start)
+        ]
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, dir_profile: str | Path) -> Tuple[Path, Path]:
+        """Write ``profile.txt`` and ``trace.json`` into ``dir_profile``.
+
+        Parameters
+        ----------
+        dir_profile : str or pathlib.Path
+            Output directory, created when missing.
+
+        Returns
+        -------
+        tuple of pathlib.Path
+            Paths of the written report and trace files.
+        """
+        dir_profile = Path(dir_profile)
+        dir_profile.mkdir(parents=True, exist_ok=True)
+        path_report = dir_profile / "profile.txt"
+        path_trace = dir_profile / "trace.json"
+        path_report.write_text(self.render_report(), encoding="utf-8")
+        path_trace.write_text(json.dumps(self.render_trace()), encoding="utf-8")
+        return path_report, path_trace
+
+
+profiler = BuildProfiler()
@@ -0,0 +1,312 @@
+"""Incremental full-text search index of rendered pages.
+
+``build_html`` feeds every rendered page to a ``SearchIndex``, which extracts
+its visible text and title and keeps an inverted index in memory. ``save()``
+writes it below the destination directory for client-side search:
+
+- ``documents.json`` maps document ids to page URL, title, and term count.
+- ``terms/<prefix>.json`` maps each term starting with ``<prefix>`` (its
+  first two characters) to ``[document id, term frequency]`` postings, so a
+  client fetches only the shards for the terms it looks up.
+
+Text of ``markdown()`` includes is indexed as part of the pages it renders
+into, which also covers pages restored from the build cache. In watch mode
+only rebuilt pages are re-extracted, and only the shards whose postings
+changed are rewritten.
+"""
+
+# lib: built-in
+import json
+import logging
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
+
+# lib: local
+from .fs import write_text_atomic
+from .metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_VERSION = 1
+PREFIX_LENGTH = 2
+REGEX_TERM = re.compile(r"\w{2,}")
+
+
+class TextExtractor(HTMLParser):
+    """Collect the title and visible text of an HTML document."""
+
+    IGNORED_TAGS = {"script", "style", "noscript", "template"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.list_text: List[str] = []
+        self.title = ""
+        self.heading = ""
+        self.tag_ignored: str | None = None
+        self.in_title = False
+        self.in_heading = False
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag in self.IGNORED_TAGS:
+            self.tag_ignored = tag
+        elif tag == "title":
+            self.in_title = True
+        elif tag == "h1" and not self.heading:
+            self.in_heading = True
+
+    def handle_endtag(self, tag) -> None:
+        if tag == self.tag_ignored:
+            self.tag_ignored = None
+        elif tag == "title":
+            self.in_title = False
+        elif tag == "h1":
+            self.in_heading = False
+
+    def handle_data(self, data) -> None:
+        if self.tag_ignored is not None:
+            return
+        if self.in_title:
+            self.title += data
+            return
+        if self.in_heading:
+            self.heading += data
+        self.list_text.append(data)
+
+
+def extract_text(html: str) -> Tuple[str, str]:
+    """
+    Return the title and visible text of an HTML page.
+
+    The title is the ``<title>`` element or, failing that, the first ``<h1>``.
+    The returned text includes the title. Text inside ``script``, ``style``,
+    ``noscript`` and ``template`` elements is skipped.
+    """
+    extractor = TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    title = " ".join((extractor.title or extractor.heading).split())
+    return title, " ".join([extractor.title, *extractor.list_text])
+
+
+def tokenize(text: str) -> Counter:
+    """Return case-folded word terms of at least two characters with counts."""
+    return Counter(REGEX_TERM.findall(text.casefold()))
+
+
+def term_prefix(term: str) -> str:
+    """Return the shard key of a term."""
+    return term[:PREFIX_LENGTH]
+
+
+class SearchIndex:
+    """Inverted index of rendered pages, updated page by page.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        Output directory of the index files.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop every page, for example before a full build."""
+        self.doc_ids: Dict[Path, int] = {}
+        self.documents: Dict[int, Dict] = {}
+        self.page_terms: Dict[Path, Counter] = {}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.prefix_terms: Dict[str, Set[str]] = {}
+        self.next_id = 0
+        self.dirty_prefixes: Set[str] = set()
+        self.documents_dirty = True
+        self.full = True
+
+    def update(self, path_rel: Path, html: str) -> None:
+        """Index or re-index one page from its rendered HTML."""
+        title, text = extract_text(html)
+        terms = tokenize(text)
+
+        doc_id = self.doc_ids.get(path_rel)
+        if doc_id is None:
+            doc_id = self.doc_ids[path_rel] = self.next_id
+            self.next_id += 1
+        terms_old = self.page_terms.get(path_rel, Counter())
+        for term in terms_old.keys() - terms.keys():
+            self.remove_posting(term, doc_id)
+        for term, count in terms.items():
+            if terms_old.get(term) != count:
+                self.postings.setdefault(term, {})[doc_id] = count
+                self.prefix_terms.setdefault(term_prefix(term), set()).add(term)
+                self.dirty_prefixes.add(term_prefix(term))
+        self.page_terms[path_rel] = terms
+
+        document = {
+            "url": path_rel.as_posix(),
+            "title": title,
+            "length": sum(terms.values()),
+        }
+        if self.documents.get(doc_id) != document:
+            self.documents[doc_id] = document
+            self.documents_dirty = True
+        metrics.inc("engrave_search_pages_indexed_total")
+
+    def update_from_file(self, path_rel: Path, path_output: Path) -> None:
+        """Index a page from its written output, or drop it when missing."""
+        try:
+            html = path_output.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            self.remove(path_rel)
+            return
+        self.update(path_rel, html)
+
+    def remove(self, path_rel: Path) -> None:
+        """Drop one page from the index."""
+        doc_id = self.doc_ids.pop(path_rel, None)
+        if doc_id is None:
+            return
+        for term in self.page_terms.pop(path_rel, Counter()):
+            self.remove_posting(term, doc_id)
+        del self.documents[doc_id]
+        self.documents_dirty = True
+
+    def remove_under(self, path_dir: Path) -> None:
+        """Drop every page under a source-relative directory."""
+        for path_rel in [path for path in self.doc_ids if path.is_relative_to(path_dir)]:
+            self.remove(path_rel)
+
+    def move_under(self, path_old: Path, path_new: Path) -> None:
+        """Re-key pages of a renamed directory without re-extracting them."""
+        for path_rel in [path for path in self.doc_ids if path.is_relative_to(path_old)]:
+            path_rel_new = path_new / path_rel.relative_to(path_old)
+            doc_id = self.doc_ids[path_rel_new] = self.doc_ids.pop(path_rel)
+            self.page_terms[path_rel_new] = self.page_terms.pop(path_rel)
+            self.documents[doc_id] = {
+                **self.documents[doc_id],
+                "url": path_rel_new.as_posix(),
+            }
+            self.documents_dirty = True
+
+    def remove_posting(self, term: str, doc_id: int) -> None:
+        postings = self.postings.get(term)
+        if postings is None:
+            return
+        postings.pop(doc_id, None)
+        prefix = term_prefix(term)
+        self.dirty_prefixes.add(prefix)
+        if not postings:
+            del self.postings[term]
+            self.prefix_terms[prefix].discard(term)
+            if not self.prefix_terms[prefix]:
+                del self.prefix_terms[prefix]
+
+    def shard_path(self, prefix: str) -> Path:
+        return Path("terms") / f"{prefix}.json"
+
+    def iter_files(self, full: bool = False) -> Iterator[Tuple[Path, str | None]]:
+        """
+        Yield index files changed since the last ``save()``.
+
+        Yields
+        ------
+        tuple
+            Path relative to ``directory`` and its JSON text, or ``None`` for
+            a shard left without terms.
+        """
+        if full or self.documents_dirty:
+            data = {
+                "version": SEARCH_INDEX_VERSION,
+                "prefix_length": PREFIX_LENGTH,
+                "documents": {
+                    str(doc_id): document
+                    for doc_id, document in sorted(self.documents.items())
+                },
+            }
+            yield Path("documents.json"), json.dumps(data, separators=(",", ":"))
+
+        prefixes = self.prefix_terms.keys() if full else self.dirty_prefixes
+        for prefix in sorted(prefixes):
+            terms = self.prefix_terms.get(prefix)
+            if not terms:
+                yield self.shard_path(prefix), None
+                continue
+            data = {
+                term: sorted(self.postings[term].items()) for term in sorted(terms)
+            }
+            yield self.shard_path(prefix), json.dumps(data, separators=(",", ":"))
+
+    def list_files(self) -> List[Path]:
+        """Return the paths, relative to ``directory``, of every file ``save()`` keeps."""
+        return [Path("documents.json")] + [
+            self.shard_path(prefix) for prefix in sorted(self.prefix_terms)
+        ]
+
+    def save(self) -> int:
+        """
+        Write changed index files, or every file after ``clear()``.
+
+        A full write also removes shard files left over from earlier builds.
+
+        Returns
+        -------
+        int
+            Number of files written or removed.
+        """
+        full = self.full
+        count = 0
+        set_path_written: Set[Path] = set()
+        for path_rel, text in self.iter_files(full=full):
+            path = self.directory / path_rel
+            if text is None:
+                path.unlink(missing_ok=True)
+            else:
+                write_text_atomic(path, text)
+                set_path_written.add(path)
+            count += 1
+
+        if full:
+            for path in (self.directory / "terms").glob("*.json"):
+                if path not in set_path_written:
+                    path.unlink()
+                    count += 1
+
+        self.dirty_prefixes.clear()
+        self.documents_dirty = False
+        self.full = False
+        logger.debug("Search index: %d file(s) updated in %s", count, self.directory)
+        return count
+
+
+_search_indexes: dict[Path, SearchIndex] = {}
+
+
+def get_search_index(
+    dir_dest: str | Path, search_index: str | None
+) -> SearchIndex | None:
+    """Return the shared search index written to ``dir_dest / search_index``.
+
+    Parameters
+    ----------
+    dir_dest : str or pathlib.Path
+        Destination directory of the build.
+    search_index : str, optional
+        Index directory relative to ``dir_dest``. ``None`` disables indexing.
+
+    Returns
+    -------
+    SearchIndex or None
+        The in-memory index kept for that directory, which watch mode updates
+        page by page after the initial build filled it.
+    """
+    if search_index is None:
+        return None
+    path_directory = (Path(dir_dest) / search_index).resolve()
+    index = _search_indexes.get(path_directory)
+    if index is None:
+        index = _search_indexes[path_directory] = SearchIndex(path_directory)
+    return index
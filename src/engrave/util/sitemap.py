@@ -0,0 +1,395 @@
+"""Incremental ``sitemap.xml`` and Atom feed generation.
+
+``build_html`` reports every written page to a ``Sitemap``, which keeps the
+sorted page URLs with their last modification time in memory and writes:
+
+- ``sitemap.xml``: one ``<urlset>`` of every page, or, beyond ``max_urls``
+  pages, a ``<sitemapindex>`` of ``sitemap-1.xml``, ``sitemap-2.xml``, ...
+  chunks of at most ``max_urls`` URLs each.
+- ``<dir>/feed.xml``: an Atom feed of the most recently modified pages under
+  each configured feed directory. Its title is ``feed_title``, or else the
+  title of the directory's ``index.html``, and its author is ``feed_author``,
+  or else the host name of the site URL, as RFC 4287 requires one. A feed
+  directory without pages has no ``feed.xml``.
+
+A page's last modification time is the newest modification time among its
+source and the templates, Markdown, data and image files it used.
+``index.html`` pages are listed under their directory URL.
+
+In watch mode pages are added, updated, removed, and moved one by one, and
+``save()`` rewrites only the sitemap chunks from the first changed URL onward
+and the feeds containing a changed page, without scanning the output tree.
+"""
+
+# lib: built-in
+import bisect
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape
+
+# lib: local
+from ..template import RenderDependencies
+from .fs import write_text_atomic
+from .search import extract_text
+
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_MAX_URLS = 50000
+DEFAULT_FEED_SIZE = 20
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+REGEX_CHUNK_NAME = re.compile(r"sitemap-\d+\.xml")
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+@dataclass
+class SitemapPage:
+    """
+    One page listed in the sitemap.
+    """
+
+    path: Path
+    lastmod: int
+    title: str = ""
+
+
+def format_timestamp(timestamp: int) -> str:
+    """Return a W3C datetime in UTC for a POSIX timestamp."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def get_lastmod(dir_src: Path, path_rel: Path, dependencies: RenderDependencies) -> int:
+    """Return the newest modification time of a page source and its dependencies."""
+    lastmod = 0
+    for path in (
+        path_rel,
+        *dependencies.template_paths,
+        *dependencies.markdown_paths,
+        *dependencies.data_paths,
+        *dependencies.image_paths,
+    ):
+        try:
+            lastmod = max(lastmod, int((dir_src / path).stat().st_mtime))
+        except FileNotFoundError:
+            continue
+    return lastmod
+
+
+class Sitemap:
+    """Sorted page URLs of a site, written as sitemap chunks and feeds.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        Destination directory of the site.
+    site_url : str
+        Absolute base URL that page paths are appended to.
+    feeds : list of str, optional
+        Source-relative directories to write an Atom ``feed.xml`` for; ``.``
+        is the whole site.
+    feed_size : int, optional
+        Number of most recently modified pages per feed.
+    feed_title : str, optional
+        Title of every feed.
+    feed_author : str, optional
+        Author name of every feed.
+    max_urls : int, optional
+        URLs per sitemap file, 50,000 by the sitemap protocol.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        site_url: str,
+        feeds: List[str] | None = None,
+        feed_size: int = DEFAULT_FEED_SIZE,
+        feed_title: str | None = None,
+        feed_author: str | None = None,
+        max_urls: int = SITEMAP_MAX_URLS,
+    ) -> None:
+        self.directory = Path(directory)
+        self.configure(site_url, feeds, feed_size, feed_title, feed_author)
+        self.max_urls = max_urls
+        self.clear()
+
+    def configure(
+        self,
+        site_url: str,
+        feeds: List[str] | None,
+        feed_size: int,
+        feed_title: str | None = None,
+        feed_author: str | None = None,
+    ) -> None:
+        self.site_url = site_url.rstrip("/") + "/"
+        self.feeds = [Path(feed) for feed in feeds or []]
+        self.feed_size = feed_size
+        self.feed_title = feed_title
+        self.feed_author = feed_author or urlsplit(self.site_url).hostname or self.site_url
+
+    def clear(self) -> None:
+        """Drop every page, for example before a full build."""
+        self.pages: Dict[str, SitemapPage] = {}
+        self.urls: List[str] = []
+        self.dirty_from: int | None = 0
+        self.dirty_feeds: Set[Path] = set(self.feeds)
+        self.chunk_count_written = 0
+        self.full = True
+
+    def page_url(self, path_rel: Path) -> str:
+        """Return the absolute URL of a source-relative page."""
+        if path_rel.name == "index.html":
+            path_url = path_rel.parent.as_posix()
+            return self.site_url if path_url == "." else f"{self.site_url}{path_url}/"
+        return self.site_url + path_rel.as_posix()
+
+    def mark_dirty(self, url: str, path_rel: Path) -> None:
+        index = bisect.bisect_left(self.urls, url)
+        self.dirty_from = index if self.dirty_from is None else min(self.dirty_from, index)
+        self.dirty_feeds.update(feed for feed in self.feeds if path_rel.is_relative_to(feed))
+
+    def update(
+        self,
+        dir_src: Path,
+        dir_dest: Path,
+        path_rel: Path,
+        dependencies: RenderDependencies,
+    ) -> None:
+        """Add or refresh one written page."""
+        page = SitemapPage(path=path_rel, lastmod=get_lastmod(dir_src, path_rel, dependencies))
+        if any(path_rel.is_relative_to(feed) for feed in self.feeds):
+            try:
+                page.title, _text = extract_text(
+                    (dir_dest / path_rel).read_text(encoding="utf-8")
+                )
+            except FileNotFoundError:
+                pass
+
+        url = self.page_url(path_rel)
+        page_previous = self.pages.get(url)
+        if page_previous == page:
+            return
+        if page_previous is None:
+            bisect.insort(self.urls, url)
+        self.pages[url] = page
+        self.mark_dirty(url, path_rel)
+
+    def remove(self, path_rel: Path) -> None:
+        """Drop one page."""
+        url = self.page_url(path_rel)
+        if self.pages.pop(url, None) is None:
+            return
+        self.mark_dirty(url, path_rel)
+        del self.urls[bisect.bisect_left(self.urls, url)]
+
+    def remove_under(self, path_dir: Path) -> None:
+        """Drop every page under a source-relative directory."""
+        for page in [page for page in self.pages.values() if page.path.is_relative_to(path_dir)]:
+            self.remove(page.path)
+
+    def move_under(self, path_old: Path, path_new: Path) -> None:
+        """Re-key pages of a renamed directory, keeping their metadata."""
+        list_page = [page for page in self.pages.values() if page.path.is_relative_to(path_old)]
+        for page in list_page:
+            self.remove(page.path)
+        for page in list_page:
+            page.path = path_new / page.path.relative_to(path_old)
+            url = self.page_url(page.path)
+            bisect.insort(self.urls, url)
+            self.pages[url] = page
+            self.mark_dirty(url, page.path)
+
+    def render_urlset(self, urls: List[str]) -> str:
+        lines = [XML_HEADER, f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n']
+        for url in urls:
+            lines.append(
+                f"<url><loc>{escape(url)}</loc>"
+                f"<lastmod>{format_timestamp(self.pages[url].lastmod)}</lastmod></url>\n"
+            )
+        lines.append("</urlset>\n")
+        return "".join(lines)
+
+    def render_index(self, chunk_count: int) -> str:
+        lines = [XML_HEADER, f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n']
+        for index in range(chunk_count):
+            urls = self.urls[index * self.max_urls : (index + 1) * self.max_urls]
+            lastmod = max(self.pages[url].lastmod for url in urls)
+            lines.append(
+                f"<sitemap><loc>{escape(self.site_url)}sitemap-{index + 1}.xml</loc>"
+                f"<lastmod>{format_timestamp(lastmod)}</lastmod></sitemap>\n"
+            )
+        lines.append("</sitemapindex>\n")
+        return "".join(lines)
+
+    def render_feed(self, feed: Path) -> str | None:
+        """Return the Atom feed of ``feed``, or ``None`` when it has no pages."""
+        list_page = sorted(
+            (page for page in self.pages.values() if page.path.is_relative_to(feed)),
+            key=lambda page: (-page.lastmod, page.path),
+        )[: self.feed_size]
+        if not list_page:
+            return None
+        url_feed = self.page_url(feed / "feed.xml")
+        url_home = self.page_url(feed / "index.html")
+        updated = max(page.lastmod for page in list_page)
+        page_home = self.pages.get(url_home)
+        title = self.feed_title or (page_home.title if page_home is not None else "")
+        lines = [
+            XML_HEADER,
+            f'<feed xmlns="{ATOM_NAMESPACE}">\n',
+            f"<id>{escape(url_feed)}</id>\n",
+            f"<title>{escape(title or url_home)}</title>\n",
+            f"<author><name>{escape(self.feed_author)}</name></author>\n",
+            f"<updated>{format_timestamp(updated)}</updated>\n",
+            f'<link rel="self" href="{escape(url_feed)}"/>\n',
+            f'<link href="{escape(url_home)}"/>\n',
+        ]
+        for page in list_page:
+            url = self.page_url(page.path)
+            lines.append(
+                f"<entry><id>{escape(url)}</id>"
+                f"<title>{escape(page.title or page.path.as_posix())}</title>"
+                f"<updated>{format_timestamp(page.lastmod)}</updated>"
+                f'<link href="{escape(url)}"/></entry>\n'
+            )
+        lines.append("</feed>\n")
+        return "".join(lines)
+
+    def iter_files(self, full: bool = False) -> Iterator[Tuple[Path, str | None]]:
+        """
+        Yield sitemap and feed files changed since the last ``save()``.
+
+        Yields
+        ------
+        tuple
+            Path relative to ``directory`` and its XML text, or ``None`` for a
+            sitemap chunk no longer needed or a feed without pages.
+        """
+        chunk_count = -(-len(self.urls) // self.max_urls)
+        chunked = chunk_count > 1
+        full = (
+            full
+            or self.full
+            or chunked != (self.chunk_count_written > 1)
+        )
+
+        if full or self.dirty_from is not None:
+            if not chunked:
+                yield Path("sitemap.xml"), self.render_urlset(self.urls)
+            else:
+                yield Path("sitemap.xml"), self.render_index(chunk_count)
+                chunk_first = 0 if full else self.dirty_from // self.max_urls
+                for index in range(chunk_first, chunk_count):
+                    yield Path(f"sitemap-{index + 1}.xml"), self.render_urlset(
+                        self.urls[index * self.max_urls : (index + 1) * self.max_urls]
+                    )
+            if self.chunk_count_written > 1:
+                for index in range(chunk_count if chunked else 0, self.chunk_count_written):
+                    yield Path(f"sitemap-{index + 1}.xml"), None
+
+        for feed in sorted(self.feeds if full else self.dirty_feeds):
+            yield feed / "feed.xml", self.render_feed(feed)
+
+    def list_files(self) -> List[Path]:
+        """Return the paths, relative to ``directory``, of every file ``save()`` keeps."""
+        chunk_count = -(-len(self.urls) // self.max_urls)
+        list_path = [Path("sitemap.xml")]
+        if chunk_count > 1:
+            list_path += [Path(f"sitemap-{index + 1}.xml") for index in range(chunk_count)]
+        return list_path + [
+            feed / "feed.xml"
+            for feed in sorted(self.feeds)
+            if any(page.path.is_relative_to(feed) for page in self.pages.values())
+        ]
+
+    def save(self) -> int:
+        """
+        Write changed sitemap and feed files, or every file after ``clear()``.
+
+        A full write also removes numbered sitemap chunks left over from
+        earlier builds.
+
+        Returns
+        -------
+        int
+            Number of files written or removed.
+        """
+        full = self.full
+        count = 0
+        set_path_written: Set[Path] = set()
+        for path_rel, text in self.iter_files():
+            path = self.directory / path_rel
+            if text is None:
+                path.unlink(missing_ok=True)
+            else:
+                write_text_atomic(path, text)
+                set_path_written.add(path)
+            count += 1
+
+        if full:
+            for path in self.directory.glob("sitemap-*.xml"):
+                if REGEX_CHUNK_NAME.fullmatch(path.name) and path not in set_path_written:
+                    path.unlink()
+                    count += 1
+        self.commit()
+        logger.debug("Sitemap: %d file(s) updated in %s", count, self.directory)
+        return count
+
+    def commit(self) -> None:
+        """Mark the current state as written."""
+        self.chunk_count_written = -(-len(self.urls) // self.max_urls)
+        self.dirty_from = None
+        self.dirty_feeds.clear()
+        self.full = False
+
+
+_sitemaps: dict[Path, Sitemap] = {}
+
+
+def get_sitemap(
+    dir_dest: str | Path,
+    site_url: str | None,
+    feeds: List[str] | None = None,
+    feed_size: int = DEFAULT_FEED_SIZE,
+    feed_title: str | None = None,
+    feed_author: str | None = None,
+) -> Sitemap | None:
+    """Return the shared sitemap written to ``dir_dest``.
+
+    Parameters
+    ----------
+    dir_dest : str or pathlib.Path
+        Destination directory of the build.
+    site_url : str, optional
+        Absolute base URL of the site. ``None`` disables the sitemap and feeds.
+    feeds : list of str, optional
+        Source-relative directories to write Atom feeds for.
+    feed_size : int, optional
+        Number of entries per feed.
+    feed_title : str, optional
+        Title of every feed.
+    feed_author : str, optional
+        Author name of every feed.
+
+    Returns
+    -------
+    Sitemap or None
+        The sitemap kept for ``dir_dest``, reconfigured with the given URL
+        and feed options. Watch mode updates the pages the initial build
+        added to it.
+    """
+    if site_url is None:
+        return None
+    path_directory = Path(dir_dest).resolve()
+    sitemap = _sitemaps.get(path_directory)
+    if sitemap is None:
+        sitemap = _sitemaps[path_directory] = Sitemap(
+            path_directory, site_url, feeds, feed_size, feed_title, feed_author
+        )
+    sitemap.configure(site_url, feeds, feed_size, feed_title, feed_author)
+    return sitemap
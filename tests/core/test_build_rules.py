@@ -1,10 +1,16 @@
+import json
+import re
 import shutil
+import tarfile
 import tempfile
+import zipfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
 from engrave.core.build import run as build_run
+from engrave.core.manifest import OutputManifest, get_manifest_path
+from engrave.util.process import file_digest
 from engrave.util.dataclass import BuildConfig
 
 
@@ -69,5 +75,307 @@ class BuildRuleTests(unittest.TestCase):
         self.assertEqual(copy_paths, ["assets/app.css"])
 
 
+    def test_stream_build_matches_render_output_and_dependencies(self):
+        (self.dir_src / "content.md").write_text("# Streamed", encoding="utf-8")
+        (self.dir_src / "index.html").write_text(
+            '{% include "_partials/ignored.html" %}{{ markdown("content.md") }}',
+            encoding="utf-8",
+        )
+        dir_dest_stream = self.temp_dir / "dist-stream"
+
+        dependency_index = build_run(
+            BuildConfig(dir_src=str(self.dir_src), dir_dest=str(self.dir_dest))
+        )
+        dependency_index_stream = build_run(
+            BuildConfig(
+                dir_src=str(self.dir_src),
+                dir_dest=str(dir_dest_stream),
+                stream=True,
+            )
+        )
+
+        self.assertEqual(
+            (dir_dest_stream / "index.html").read_text(encoding="utf-8"),
+            (self.dir_dest / "index.html").read_text(encoding="utf-8"),
+        )
+        self.assertEqual(
+            dependency_index_stream.html_to_markdown, dependency_index.html_to_markdown
+        )
+        self.assertEqual(
+            dependency_index_stream.html_to_template, dependency_index.html_to_template
+        )
+
+    def test_stream_build_keeps_previous_output_when_render_fails(self):
+        config = BuildConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_dest),
+            exclude=[r"drafts/.*"],
+            stream=True,
+        )
+        build_run(config)
+        previous = (self.dir_dest / "index.html").read_text(encoding="utf-8")
+
+        (self.dir_src / "index.html").write_text(
+            "<p>partial</p>{{ markdown('missing.md') }}", encoding="utf-8"
+        )
+        with self.assertRaises(FileNotFoundError):
+            build_run(config)
+
+        self.assertEqual(
+            (self.dir_dest / "index.html").read_text(encoding="utf-8"), previous
+        )
+        self.assertEqual(list(self.dir_dest.glob(".*.tmp")), [])
+
+    def test_build_writes_manifest_with_output_sizes_and_digests(self):
+        build_run(
+            BuildConfig(
+                dir_src=str(self.dir_src),
+                dir_dest=str(self.dir_dest),
+                copy=[r"assets/.*\.css$"],
+                exclude=[r"drafts/.*"],
+            )
+        )
+
+        path_manifest = get_manifest_path(self.dir_dest)
+        self.assertEqual(path_manifest, self.temp_dir.resolve() / ".dist.engrave-manifest.json")
+        self.assertEqual(
+            sorted(path.name for path in self.dir_dest.iterdir()),
+            ["assets", "index.html", "section"],
+        )
+        manifest = OutputManifest.load(path_manifest)
+        self.assertEqual(
+            sorted(path.as_posix() for path in manifest.entries),
+            ["assets/app.css", "index.html", "section/index.html"],
+        )
+        [output] = manifest.entries[Path("assets/app.css")].outputs
+        path_output = self.dir_dest / "assets/app.css"
+        self.assertEqual(output.size, path_output.stat().st_size)
+        self.assertEqual(output.digest, file_digest(path_output))
+
+    def test_prune_deletes_outputs_of_removed_sources_from_manifest(self):
+        config = BuildConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_dest),
+            copy=[r"assets/.*\.css$"],
+            exclude=[r"drafts/.*"],
+        )
+        build_run(config)
+        shutil.rmtree(self.dir_src / "section")
+        (self.dir_src / "assets/app.css").unlink()
+
+        # Without --prune the orphans stay on disk and in the manifest.
+        build_run(config)
+        self.assertTrue((self.dir_dest / "section/index.html").exists())
+        manifest = OutputManifest.load(get_manifest_path(self.dir_dest))
+        self.assertIn(Path("section/index.html"), manifest.entries)
+
+        config.prune = True
+        build_run(config)
+
+        self.assertFalse((self.dir_dest / "section").exists())
+        self.assertFalse((self.dir_dest / "assets").exists())
+        self.assertTrue((self.dir_dest / "index.html").exists())
+        manifest = OutputManifest.load(get_manifest_path(self.dir_dest))
+        self.assertEqual(list(manifest.entries), [Path("index.html")])
+
+    def test_changes_file_reports_added_modified_and_deleted_outputs(self):
+        path_changes = self.temp_dir / "changes.json"
+        config = BuildConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_dest),
+            copy=[r"assets/.*\.css$"],
+            exclude=[r"drafts/.*"],
+            prune=True,
+            changes_file=str(path_changes),
+        )
+        build_run(config)
+        changes = json.loads(path_changes.read_text(encoding="utf-8"))
+        self.assertEqual(
+            [output["path"] for output in changes["added"]],
+            ["assets/app.css", "index.html", "section/index.html"],
+        )
+
+        (self.dir_src / "index.html").write_text("<p>Changed</p>", encoding="utf-8")
+        shutil.rmtree(self.dir_src / "section")
+        build_run(config)
+        changes = json.loads(path_changes.read_text(encoding="utf-8"))
+
+        self.assertEqual(changes["added"], [])
+        self.assertEqual(
+            [output["path"] for output in changes["modified"]], ["index.html"]
+        )
+        self.assertEqual(
+            changes["modified"][0]["digest"],
+            file_digest(self.dir_dest / "index.html"),
+        )
+        self.assertEqual(
+            [output["path"] for output in changes["deleted"]], ["section/index.html"]
+        )
+        self.assertEqual(changes["unchanged"], 1)
+
+    def _archive_config(self, name: str) -> BuildConfig:
+        return BuildConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.temp_dir / name),
+            copy=[r"assets/.*\.css$"],
+            exclude=[r"drafts/.*"],
+            archive=True,
+        )
+
+    def test_archive_build_is_deterministic_and_matches_directory_build(self):
+        build_run(self._archive_config("site.tar.gz"))
+        first = (self.temp_dir / "site.tar.gz").read_bytes()
+        (self.dir_src / "index.html").touch()
+        build_run(self._archive_config("site.tar.gz"))
+
+        self.assertEqual((self.temp_dir / "site.tar.gz").read_bytes(), first)
+        self.assertFalse(self.dir_dest.exists())
+
+        build_run(
+            BuildConfig(
+                dir_src=str(self.dir_src),
+                dir_dest=str(self.dir_dest),
+                copy=[r"assets/.*\.css$"],
+                exclude=[r"drafts/.*"],
+            )
+        )
+        with tarfile.open(self.temp_dir / "site.tar.gz") as tar:
+            names = tar.getnames()
+            self.assertEqual(names, ["assets/app.css", "index.html", "section/index.html"])
+            for name in names:
+                self.assertEqual(
+                    tar.extractfile(name).read(), (self.dir_dest / name).read_bytes()
+                )
+                self.assertEqual(tar.getmember(name).mtime, 315532800)
+
+    def test_archive_build_writes_zip(self):
+        build_run(self._archive_config("site.zip"))
+
+        with zipfile.ZipFile(self.temp_dir / "site.zip") as archive:
+            self.assertEqual(
+                archive.namelist(), ["assets/app.css", "index.html", "section/index.html"]
+            )
+            self.assertEqual(
+                archive.getinfo("index.html").date_time, (1980, 1, 1, 0, 0, 0)
+            )
+        self.assertEqual(list(self.temp_dir.glob(".*.tmp")), [])
+
+    def test_search_index_indexes_page_and_markdown_text(self):
+        (self.dir_src / "guide.md").write_text("Install with pip.", encoding="utf-8")
+        (self.dir_src / "index.html").write_text(
+            "<html><head><title>Home Page</title><script>var hidden;</script></head>"
+            '<body>{{ markdown("guide.md") }}</body></html>',
+            encoding="utf-8",
+        )
+        (self.dir_dest / "search/terms").mkdir(parents=True)
+        (self.dir_dest / "search/terms/zz.json").write_text("{}", encoding="utf-8")
+
+        build_run(
+            BuildConfig(
+                dir_src=str(self.dir_src),
+                dir_dest=str(self.dir_dest),
+                exclude=[r"drafts/.*"],
+                search_index="search",
+            )
+        )
+
+        dir_index = self.dir_dest / "search"
+        documents = json.loads((dir_index / "documents.json").read_text(encoding="utf-8"))
+        self.assertEqual(
+            documents["documents"],
+            {
+                "0": {"url": "index.html", "title": "Home Page", "length": 5},
+                "1": {"url": "section/index.html", "title": "", "length": 2},
+            },
+        )
+        shard = json.loads((dir_index / "terms/pi.json").read_text(encoding="utf-8"))
+        self.assertEqual(shard, {"pip": [[0, 1]]})
+        shard = json.loads((dir_index / "terms/pa.json").read_text(encoding="utf-8"))
+        self.assertEqual(shard, {"page": [[0, 1], [1, 1]]})
+        self.assertFalse((dir_index / "terms/hi.json").exists())
+        self.assertFalse((dir_index / "terms/zz.json").exists())
+
+    def test_changes_file_reports_search_index_files(self):
+        path_changes = self.temp_dir / "changes.json"
+        (self.dir_src / "index.html").write_text("<p>Install with pip.</p>", encoding="utf-8")
+        config = BuildConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_dest),
+            exclude=[r"drafts/.*"],
+            prune=True,
+            changes_file=str(path_changes),
+            search_index="search",
+        )
+        build_run(config)
+        changes = json.loads(path_changes.read_text(encoding="utf-8"))
+        self.assertIn("search/documents.json", [output["path"] for output in changes["added"]])
+        self.assertIn("search/terms/pi.json", [output["path"] for output in changes["added"]])
+
+        (self.dir_src / "index.html").write_text("<p>Install with uv.</p>", encoding="utf-8")
+        build_run(config)
+        changes = json.loads(path_changes.read_text(encoding="utf-8"))
+
+        self.assertEqual(
+            [output["path"] for output in changes["deleted"]], ["search/terms/pi.json"]
+        )
+        self.assertIn("search/terms/uv.json", [output["path"] for output in changes["added"]])
+        self.assertFalse((self.dir_dest / "search/terms/pi.json").exists())
+
+    def test_site_url_writes_sitemap_and_feed(self):
+        (self.dir_src / "section/post.html").write_text(
+            "<html><head><title>A &amp; B</title></head></html>", encoding="utf-8"
+        )
+        build_run(
+            BuildConfig(
+                dir_src=str(self.dir_src),
+                dir_dest=str(self.dir_dest),
+                exclude=[r"drafts/.*"],
+                site_url="https://example.com/docs",
+                feed=["section"],
+            )
+        )
+
+        sitemap = (self.dir_dest / "sitemap.xml").read_text(encoding="utf-8")
+        self.assertEqual(
+            re.findall(r"<loc>(.*?)</loc>", sitemap),
+            [
+                "https://example.com/docs/",
+                "https://example.com/docs/section/",
+                "https://example.com/docs/section/post.html",
+            ],
+        )
+        feed = (self.dir_dest / "section/feed.xml").read_text(encoding="utf-8")
+        self.assertIn("<title>A &amp; B</title>", feed)
+        self.assertEqual(feed.count("<entry>"), 2)
+        self.assertFalse((self.dir_dest / "feed.xml").exists())
+
+    def test_changes_file_reports_sitemap_and_feed_files(self):
+        path_changes = self.temp_dir / "changes.json"
+        config = BuildConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_dest),
+            exclude=[r"drafts/.*"],
+            changes_file=str(path_changes),
+            site_url="https://example.com/",
+            feed=["section"],
+        )
+        build_run(config)
+        changes = json.loads(path_changes.read_text(encoding="utf-8"))
+        self.assertEqual(
+            [output["path"] for output in changes["added"]],
+            ["index.html", "section/feed.xml", "section/index.html", "sitemap.xml"],
+        )
+
+        config.feed = []
+        build_run(config)
+        changes = json.loads(path_changes.read_text(encoding="utf-8"))
+
+        self.assertEqual(
+            [output["path"] for output in changes["deleted"]], ["section/feed.xml"]
+        )
+        self.assertFalse((self.dir_dest / "section/feed.xml").exists())
+        self.assertEqual(changes["unchanged"], 3)
+
+
 if __name__ == "__main__":
     unittest.main()
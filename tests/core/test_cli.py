@@ -1,6 +1,9 @@
 """Integration-like tests exercising CLI commands with real filesystem I/O."""
 import asyncio
+import os
 import shutil
+import subprocess
+import sys
 import tempfile
 import unittest
 from pathlib import Path
@@ -58,6 +61,24 @@ class CLICoreIntegrationTests(unittest.TestCase):
         self.assertFalse(html_excluded.exists(), "Excluded HTML should not be built")
         self.assertFalse(css_excluded.exists(), "Excluded asset should not be copied")
 
+    def test_build_command_profile_writes_report_and_trace(self):
+        self._write("_layout.html", "<main>{% block body %}{% endblock %}</main>")
+        self._write(
+            "index.html",
+            '{% extends "_layout.html" %}{% block body %}{{ markdown("a.md") }}{% endblock %}',
+        )
+        self._write("a.md", "# Profiled")
+        dir_profile = self.dir_dest / "profile"
+
+        config = cli.BuildConfig(dir_src=str(self.dir_src), dir_dest=str(self.dir_dest))
+        asyncio.run(cli.build(config, profile=str(dir_profile)))
+
+        report = (dir_profile / "profile.txt").read_text(encoding="utf-8")
+        self.assertIn("index.html", report)
+        self.assertIn("_layout.html", report)
+        self.assertIn("a.md", report)
+        self.assertTrue((dir_profile / "trace.json").exists())
+
     def test_server_builds_and_invokes_uvicorn(self):
         self._write("home.html", "<h1>Server Page</h1>")
 
@@ -71,7 +92,7 @@ class CLICoreIntegrationTests(unittest.TestCase):
             port=5050,
         )
 
-        with patch("engrave.core.cli.uvicorn.run") as mock_uvicorn_run:
+        with patch("uvicorn.run") as mock_uvicorn_run:
             cli.server(server_config)
 
         html_out = self.dir_dest / "home.html"
@@ -83,6 +104,27 @@ class CLICoreIntegrationTests(unittest.TestCase):
         self.assertEqual(kwargs["host"], "0.0.0.0")
         self.assertEqual(kwargs["port"], 5050)
 
+    def test_check_links_command_fails_on_broken_links(self):
+        self._write("index.html", '<a href="guide/">Guide</a><img src="logo.png">')
+        self._write("guide/index.html", '<a href="../">Home</a>')
+        asyncio.run(
+            cli.build(cli.BuildConfig(dir_src=str(self.dir_src), dir_dest=str(self.dir_dest)))
+        )
+
+        command, bound, _ = cli.app.parse_args(["check-links", str(self.dir_dest)])
+        with self.assertRaises(SystemExit) as context, self.assertLogs(
+            "engrave.util.links", level="WARNING"
+        ) as logs:
+            command(*bound.args, **bound.kwargs)
+
+        self.assertEqual(context.exception.code, 1)
+        self.assertEqual(
+            logs.output, ["WARNING:engrave.util.links:Broken link in index.html: logo.png"]
+        )
+
+        (self.dir_dest / "logo.png").write_bytes(b"")
+        command(*bound.args, **bound.kwargs)
+
     def test_watch_builds_and_consumes_watch_stream_without_uvicorn(self):
         self._write("home.html", "<h1>Watch Page</h1>")
 
@@ -94,7 +136,7 @@ class CLICoreIntegrationTests(unittest.TestCase):
             exclude=[],
         )
 
-        async def fake_watch_run(_server_config):
+        async def fake_watch_run(_server_config, **kwargs):
             yield [
                 FileChangeResult(
                     path=str(self.dir_src / "home.html"),
@@ -103,8 +145,8 @@ class CLICoreIntegrationTests(unittest.TestCase):
                 )
             ]
 
-        with patch("engrave.core.cli.watch_run", side_effect=fake_watch_run), patch(
-            "engrave.core.cli.uvicorn.run"
+        with patch("engrave.core.watch.run", side_effect=fake_watch_run), patch(
+            "uvicorn.run"
         ) as mock_uvicorn_run:
             asyncio.run(cli.watch(watch_config))
 
@@ -113,5 +155,52 @@ class CLICoreIntegrationTests(unittest.TestCase):
         self.assertFalse(mock_uvicorn_run.called, "Watch mode should not start Uvicorn")
 
 
+class CLIImportTimeTests(unittest.TestCase):
+    """Guards command-scoped lazy imports with ``python -X importtime``."""
+
+    HEAVY_MODULES = {
+        "aiostream",
+        "fastapi",
+        "pydantic",
+        "starlette",
+        "uvicorn",
+        "watchfiles",
+    }
+
+    def _import_times(self, statement: str) -> dict[str, int]:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        import_times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line.split("|")
+            import_times[name.strip()] = int(cumulative.strip())
+        return import_times
+
+    def test_cli_import_does_not_load_server_or_watch_dependencies(self):
+        import_times = self._import_times("import engrave.core.cli")
+
+        loaded_heavy = sorted(self.HEAVY_MODULES & set(import_times))
+        self.assertEqual(loaded_heavy, [])
+        self.assertNotIn("engrave.server", import_times)
+        self.assertNotIn("engrave.core.watch", import_times)
+
+    @unittest.skipUnless(
+        os.environ.get("ENGRAVE_IMPORT_BUDGET_MS"),
+        "wall-clock budget; set ENGRAVE_IMPORT_BUDGET_MS to enable",
+    )
+    def test_cli_import_time_stays_within_budget(self):
+        budget_us = int(os.environ["ENGRAVE_IMPORT_BUDGET_MS"]) * 1000
+
+        import_times = self._import_times("import engrave.core.cli")
+
+        self.assertLess(import_times["engrave.core.cli"], budget_us)
+
+
 if __name__ == "__main__":
     unittest.main()
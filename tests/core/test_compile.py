@@ -0,0 +1,75 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import jinja2
+
+from engrave.core.build import run as build_run
+from engrave.core.compile import run as compile_run
+from engrave.util.dataclass import BuildConfig, CompileConfig
+
+
+class CompileTemplatesTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.dir_src = self.temp_dir / "src"
+        self.dir_dest = self.temp_dir / "dist"
+        self.path_bundle = self.temp_dir / "bundle" / "templates.zip"
+
+        fixture_root = Path(__file__).resolve().parents[1] / "fixtures" / "project" / "src"
+        shutil.copytree(fixture_root, self.dir_src)
+        (self.dir_src / "_partials" / "layout.html").write_text(
+            "<main>{% block body %}{% endblock %}</main>", encoding="utf-8"
+        )
+        (self.dir_src / "index.html").write_text(
+            '{% extends "_partials/layout.html" %}{% block body %}Compiled{% endblock %}',
+            encoding="utf-8",
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_compile_bundles_html_templates_and_respects_exclude(self):
+        list_name = compile_run(
+            CompileConfig(
+                dir_src=str(self.dir_src),
+                target=str(self.path_bundle),
+                exclude=[r"drafts/.*"],
+            )
+        )
+
+        self.assertTrue(self.path_bundle.is_file())
+        self.assertIn("index.html", list_name)
+        self.assertIn("_partials/layout.html", list_name)
+        self.assertNotIn("drafts/skip.html", list_name)
+
+    def test_build_renders_from_bundle_without_compiling_and_tracks_templates(self):
+        compile_run(CompileConfig(dir_src=str(self.dir_src), target=str(self.path_bundle)))
+
+        with patch.object(
+            jinja2.Environment, "compile", wraps=jinja2.Environment.compile
+        ) as mock_compile:
+            dependency_index = build_run(
+                BuildConfig(
+                    dir_src=str(self.dir_src),
+                    dir_dest=str(self.dir_dest),
+                    exclude=[r"drafts/.*"],
+                    compiled_templates=str(self.path_bundle),
+                )
+            )
+
+        mock_compile.assert_not_called()
+        self.assertIn(
+            "<main>Compiled</main>",
+            (self.dir_dest / "index.html").read_text(encoding="utf-8"),
+        )
+        self.assertEqual(
+            dependency_index.get_template_dependents(Path("_partials/layout.html")),
+            {Path("index.html")},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
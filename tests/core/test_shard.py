@@ -0,0 +1,163 @@
+"""Tests for sharded builds and merged build indexes."""
+import asyncio
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from engrave.core import cli
+from engrave.core.build import run as build_run
+from engrave.core.manifest import OutputManifest
+from engrave.core.shard import merge_index, parse_shard, read_index, shard_of, write_index
+from engrave.util.dataclass import BuildConfig
+
+
+class ParseShardTests(unittest.TestCase):
+    def test_parses_one_based_index_and_count(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        self.assertEqual(parse_shard("1/1"), (1, 1))
+
+    def test_rejects_malformed_or_out_of_range_values(self):
+        for value in ["", "3", "a/b", "0/4", "5/4", "1/0"]:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_shard(value)
+
+    def test_shard_assignment_is_stable_and_in_range(self):
+        path = Path("section/page.html")
+        self.assertEqual(shard_of(path, 8), shard_of(Path("section") / "page.html", 8))
+        self.assertTrue(1 <= shard_of(path, 8) <= 8)
+
+
+class ShardedBuildTests(unittest.TestCase):
+    def setUp(self):
+        self.dir_root = Path(tempfile.mkdtemp())
+        self.dir_src = self.dir_root / "src"
+        self._write("_layout.html", "<main>{% block body %}{% endblock %}</main>")
+        self._write("shared.md", "# Shared")
+        for index in range(12):
+            self._write(
+                f"pages/page_{index}.html",
+                '{% extends "_layout.html" %}{% block body %}'
+                '{{ markdown("../shared.md") }}{% endblock %}',
+            )
+            self._write(f"assets/asset_{index}.css", f"/* {index} */")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_root, ignore_errors=True)
+
+    def _write(self, rel_path: str, content: str) -> None:
+        path = self.dir_src / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    def _config(self, name: str) -> BuildConfig:
+        return BuildConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_root / name),
+            copy=[r"assets/.*"],
+        )
+
+    def _outputs(self, name: str) -> set[Path]:
+        dir_dest = self.dir_root / name
+        return {
+            path.relative_to(dir_dest)
+            for path in dir_dest.rglob("*")
+            if path.is_file()
+        }
+
+    def _outputs_by_source(self, manifest: OutputManifest) -> dict:
+        # Modification times differ between nodes; sizes and digests must not.
+        return {
+            path_src: [(output.path, output.size, output.digest) for output in entry.outputs]
+            for path_src, entry in manifest.entries.items()
+        }
+
+    def test_merged_shards_match_single_node_build(self):
+        manifest_full = OutputManifest()
+        dependency_index_full = build_run(self._config("full"), manifest=manifest_full)
+        path_full = write_index(
+            self.dir_root / "full.json", dependency_index_full, manifest_full
+        )
+
+        list_path_index = []
+        outputs_sharded: list[set[Path]] = []
+        for index in (1, 2, 3):
+            manifest = OutputManifest()
+            dependency_index = build_run(
+                self._config(f"shard_{index}"), manifest=manifest, shard=(index, 3)
+            )
+            list_path_index.append(
+                write_index(
+                    self.dir_root / f"shard_{index}.json",
+                    dependency_index,
+                    manifest,
+                    shard=(index, 3),
+                )
+            )
+            outputs_sharded.append(self._outputs(f"shard_{index}"))
+
+        # Every output is built by exactly one shard.
+        self.assertEqual(sum(len(outputs) for outputs in outputs_sharded), 24)
+        self.assertEqual(set().union(*outputs_sharded), self._outputs("full"))
+
+        dependency_index, manifest = merge_index(list_path_index)
+        self.assertEqual(dependency_index.to_dict(), dependency_index_full.to_dict())
+        self.assertEqual(
+            self._outputs_by_source(manifest), self._outputs_by_source(manifest_full)
+        )
+        self.assertEqual(
+            dependency_index.get_markdown_dependents(Path("shared.md")),
+            dependency_index_full.get_markdown_dependents(Path("shared.md")),
+        )
+
+        _dependency_index, _manifest, shard = read_index(path_full)
+        self.assertIsNone(shard)
+
+    def test_merge_rejects_missing_and_mismatched_shards(self):
+        manifest = OutputManifest()
+        dependency_index = build_run(self._config("shard_1"), manifest=manifest, shard=(1, 2))
+        path_1 = write_index(self.dir_root / "1.json", dependency_index, manifest, shard=(1, 2))
+        path_other = write_index(
+            self.dir_root / "other.json", dependency_index, manifest, shard=(2, 3)
+        )
+
+        with self.assertRaisesRegex(ValueError, "Missing build index"):
+            merge_index([path_1])
+        with self.assertRaisesRegex(ValueError, "Shard count mismatch"):
+            merge_index([path_1, path_other])
+        with self.assertRaisesRegex(ValueError, "more than once"):
+            merge_index([path_1, path_1])
+
+    def test_cli_build_shards_and_merge_index(self):
+        list_path_index = []
+        for index in (1, 2):
+            path_index = self.dir_root / f"index_{index}.json"
+            asyncio.run(
+                cli.build(
+                    cli.BuildConfig(
+                        dir_src=str(self.dir_src),
+                        dir_dest=str(self.dir_root / "dist"),
+                        copy=[r"assets/.*"],
+                    ),
+                    shard=f"{index}/2",
+                    index=str(path_index),
+                )
+            )
+            list_path_index.append(str(path_index))
+
+        path_merged = self.dir_root / "merged.json"
+        command, bound, _ = cli.app.parse_args(
+            ["merge-index", str(path_merged), *list_path_index]
+        )
+        command(*bound.args, **bound.kwargs)
+
+        data = json.loads(path_merged.read_text(encoding="utf-8"))
+        self.assertIsNone(data["shard"])
+        self.assertEqual(len(data["manifest"]["sources"]), 24)
+        self.assertEqual(len(data["dependencies"]["pages"]), 12)
+        self.assertEqual(len(self._outputs("dist")), 24)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,20 @@
 import asyncio
+import json
 import os
 import shutil
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
+from watchfiles import Change
+
+from engrave.core import watch
 from engrave.core.build import run as build_run
+from engrave.core.compile import run as compile_run
+from engrave.core.watch import handle_async_list_build_change
 from engrave.core.watch import run as watch_run
-from engrave.util.dataclass import BuildConfig, WatchConfig
+from engrave.util.dataclass import BuildConfig, CompileConfig, WatchConfig
 
 
 class WatchIntegrationTests(unittest.IsolatedAsyncioTestCase):
@@ -232,6 +239,123 @@ class WatchIntegrationTests(unittest.IsolatedAsyncioTestCase):
             (self.dir_dest / "section/index.html").read_text(encoding="utf-8"),
         )
 
+    async def test_watch_run_rebuilds_only_pages_reading_changed_data_file(self):
+        source_file = self.dir_src / "index.html"
+        other_file = self.dir_src / "section" / "index.html"
+        data_file = self.dir_src / "data" / "site.json"
+
+        source_file.write_text(
+            "<html><body><h1>{{ data.site.title }}</h1></body></html>",
+            encoding="utf-8",
+        )
+        other_file.write_text(
+            "<html><body><p>Static section</p></body></html>", encoding="utf-8"
+        )
+        data_file.write_text('{"title": "Initial"}', encoding="utf-8")
+
+        dependency_index = build_run(
+            BuildConfig(
+                dir_src=str(self.dir_src),
+                dir_dest=str(self.dir_dest),
+                copy=[],
+                exclude=[],
+                data_dir="data",
+            ),
+        )
+        self.assertEqual(
+            dependency_index.get_data_dependents(Path("data/site.json")),
+            {Path("index.html")},
+        )
+
+        watcher = watch_run(
+            WatchConfig(
+                dir_src=str(self.dir_src),
+                dir_dest=str(self.dir_dest),
+                copy=[],
+                exclude=[],
+                watch_add=[],
+                data_dir="data",
+            ),
+            dependency_index=dependency_index,
+        )
+
+        try:
+            batch = await self._next_batch_after(
+                watcher,
+                lambda: data_file.write_text('{"title": "Updated title"}', encoding="utf-8"),
+            )
+        finally:
+            await watcher.aclose()
+
+        self.assertEqual([result.path for result in batch], ["index.html"])
+        self.assertIn(
+            "<h1>Updated title</h1>",
+            (self.dir_dest / "index.html").read_text(encoding="utf-8"),
+        )
+
+    async def test_front_matter_change_rebuilds_collection_listing(self):
+        listing_file = self.dir_src / "section" / "index.html"
+        post_file = self.dir_src / "section" / "post.html"
+        listing_file.write_text(
+            "{% for page in collection() %}<a>{{ page.title }}</a>{% endfor %}",
+            encoding="utf-8",
+        )
+        post_file.write_text('+++\ntitle = "Initial"\n+++\n<p>Body</p>', encoding="utf-8")
+
+        dependency_index = build_run(
+            BuildConfig(
+                dir_src=str(self.dir_src),
+                dir_dest=str(self.dir_dest),
+                copy=[],
+                exclude=[],
+            ),
+        )
+        self.assertEqual(
+            (self.dir_dest / "section/index.html").read_text(encoding="utf-8"),
+            "<a>Initial</a>",
+        )
+
+        watcher = watch_run(
+            WatchConfig(
+                dir_src=str(self.dir_src),
+                dir_dest=str(self.dir_dest),
+                copy=[],
+                exclude=[],
+                watch_add=[],
+            ),
+            dependency_index=dependency_index,
+        )
+
+        try:
+            batch_body = await self._next_batch_after(
+                watcher,
+                lambda: post_file.write_text(
+                    '+++\ntitle = "Initial"\n+++\n<p>New body</p>', encoding="utf-8"
+                ),
+            )
+            batch_title = await self._next_batch_after(
+                watcher,
+                lambda: post_file.write_text(
+                    '+++\ntitle = "Updated"\n+++\n<p>New body</p>', encoding="utf-8"
+                ),
+            )
+        finally:
+            await watcher.aclose()
+
+        self.assertEqual([result.path for result in batch_body], ["section/post.html"])
+        self.assertEqual(
+            [result.path for result in batch_title],
+            ["section/post.html", "section/index.html"],
+        )
+        self.assertEqual(
+            (self.dir_dest / "section/index.html").read_text(encoding="utf-8"),
+            "<a>Updated</a>",
+        )
+        self.assertEqual(
+            (self.dir_dest / "section/post.html").read_text(encoding="utf-8"),
+            "<p>New body</p>",
+        )
+
     async def test_watch_run_rebuilds_dependents_for_partial_html_change(self):
         source_file = self.dir_src / "index.html"
         partial_file = self.dir_src / "_partials" / "ignored.html"
@@ -281,6 +405,450 @@ class WatchIntegrationTests(unittest.IsolatedAsyncioTestCase):
         )
         self.assertFalse((self.dir_dest / "_partials/ignored.html").exists())
 
+    async def test_bulk_worker_sees_pages_added_by_later_batches(self):
+        (self.dir_src / "posts").mkdir()
+        (self.dir_src / "posts/a.html").write_text('+++\ntitle = "A"\n+++\n', encoding="utf-8")
+        self.dir_dest.mkdir()
+        (self.dir_src / "posts/index.html").write_text(
+            "{% for page in collection() %}{{ page.title }};{% endfor %}", encoding="utf-8"
+        )
+        config = WatchConfig(dir_src=str(self.dir_src), dir_dest=str(self.dir_dest))
+        path_listing = self.dir_dest / "posts/index.html"
+
+        watch.build_html_task(config, Path("posts/index.html"), 1)
+        self.assertEqual(path_listing.read_text(encoding="utf-8"), "A;")
+
+        (self.dir_src / "posts/b.html").write_text('+++\ntitle = "B"\n+++\n', encoding="utf-8")
+        watch.build_html_task(config, Path("posts/index.html"), 2)
+        self.assertEqual(path_listing.read_text(encoding="utf-8"), "A;B;")
+
+    async def test_large_batch_runs_one_bulk_rebuild_with_summary_result(self):
+        layout_file = self.dir_src / "_partials" / "ignored.html"
+        markdown_file = self.dir_src / "content.md"
+        layout_file.write_text("<p>Initial partial</p>", encoding="utf-8")
+        markdown_file.write_text("# Initial", encoding="utf-8")
+        for index in range(4):
+            (self.dir_src / f"page_{index}.html").write_text(
+                '{% include "_partials/ignored.html" %}{{ markdown("content.md") }}',
+                encoding="utf-8",
+            )
+
+        watch_config = WatchConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_dest),
+            burst_threshold=3,
+            burst_workers=2,
+        )
+        dependency_index = build_run(watch_config)
+
+        layout_file.write_text("<p>Updated partial</p>", encoding="utf-8")
+        markdown_file.write_text("# Updated", encoding="utf-8")
+        (self.dir_src / "page_0.html").unlink()
+        dir_src = self.dir_src.resolve()
+
+        async def one_batch():
+            yield {
+                (Change.modified, str(dir_src / "_partials/ignored.html")),
+                (Change.modified, str(dir_src / "content.md")),
+                (Change.modified, str(dir_src / "page_1.html")),
+                (Change.deleted, str(dir_src / "page_0.html")),
+            }
+
+        list_batch = [
+            batch
+            async for batch in handle_async_list_build_change(
+                watch_config, one_batch(), dependency_index
+            )
+        ]
+
+        self.assertEqual(len(list_batch), 1)
+        [result] = list_batch[0]
+        self.assertEqual((result.path, result.type, result.count), (".", "build", 4))
+        self.assertFalse((self.dir_dest / "page_0.html").exists())
+        for index in range(1, 4):
+            html = (self.dir_dest / f"page_{index}.html").read_text(encoding="utf-8")
+            self.assertIn("Updated partial", html)
+            self.assertIn("Updated", html)
+        self.assertNotIn(
+            Path("page_0.html"),
+            dependency_index.get_markdown_dependents(Path("content.md")),
+        )
+
+    async def test_watch_run_passes_debounce_and_step_to_awatch(self):
+        calls = []
+
+        async def fake_awatch(*args, **kw):
+            calls.append(kw)
+            return
+            yield
+
+        watcher = watch_run(
+            WatchConfig(
+                dir_src=str(self.dir_src),
+                dir_dest=str(self.dir_dest),
+                debounce_ms=300,
+                step_ms=20,
+            )
+        )
+        with patch.object(watch, "awatch", fake_awatch):
+            async for _batch in watcher:
+                pass
+
+        self.assertEqual(len(calls), 3)
+        for kw in calls:
+            self.assertEqual((kw["debounce"], kw["step"]), (300, 20))
+
+    def _build_blog(self, watch_config: WatchConfig):
+        (self.dir_src / "blog/2020").mkdir(parents=True)
+        (self.dir_src / "blog/2020/post.html").write_text(
+            '{{ markdown("post.md") }}', encoding="utf-8"
+        )
+        (self.dir_src / "blog/2020/post.md").write_text("# Post", encoding="utf-8")
+        (self.dir_src / "blog/index.html").write_text("<p>Blog</p>", encoding="utf-8")
+        (self.dir_src / "blog/site.css").write_text("body {}", encoding="utf-8")
+        return build_run(watch_config)
+
+    async def _handle_batch(self, watch_config, dependency_index, batch) -> list:
+        async def one_batch():
+            yield batch
+
+        return [
+            result
+            async for list_result in handle_async_list_build_change(
+                watch_config, one_batch(), dependency_index
+            )
+            for result in list_result
+        ]
+
+    async def test_collection_directory_delete_rebuilds_listing_as_empty(self):
+        (self.dir_src / "index.html").write_text(
+            '{% for page in collection("blog/2020") %}{{ page.url }};{% endfor %}',
+            encoding="utf-8",
+        )
+        watch_config = WatchConfig(dir_src=str(self.dir_src), dir_dest=str(self.dir_dest))
+        dependency_index = self._build_blog(watch_config)
+        self.assertEqual(
+            (self.dir_dest / "index.html").read_text(encoding="utf-8"), "blog/2020/post.html;"
+        )
+        path_dir = (self.dir_src / "blog/2020").resolve()
+        shutil.rmtree(path_dir)
+
+        results = await self._handle_batch(
+            watch_config, dependency_index, {(Change.deleted, str(path_dir))}
+        )
+
+        self.assertIn("index.html", [result.path for result in results])
+        self.assertEqual((self.dir_dest / "index.html").read_text(encoding="utf-8"), "")
+        self.assertFalse((self.dir_dest / "blog/2020").exists())
+
+    async def test_dependent_render_failure_is_logged_and_skipped(self):
+        path_partial = self.dir_src / "_partials" / "nav.html"
+        path_partial.write_text("<nav></nav>", encoding="utf-8")
+        (self.dir_src / "index.html").write_text(
+            '{% include "_partials/nav.html" %}', encoding="utf-8"
+        )
+        watch_config = WatchConfig(dir_src=str(self.dir_src), dir_dest=str(self.dir_dest))
+        dependency_index = build_run(watch_config)
+        path_partial.write_text("{{ 1 + }}", encoding="utf-8")
+
+        with self.assertLogs(watch.logger, level="ERROR") as logs:
+            results = await self._handle_batch(
+                watch_config,
+                dependency_index,
+                {(Change.modified, str(path_partial.resolve()))},
+            )
+
+        self.assertEqual(results, [])
+        self.assertIn("index.html", logs.output[0])
+        self.assertEqual(
+            dependency_index.get_template_dependents(Path("_partials/nav.html")),
+            {Path("index.html")},
+        )
+
+    async def test_directory_rename_moves_outputs_without_rendering(self):
+        watch_config = WatchConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_dest),
+            copy=[r".*\.css$"],
+        )
+        dependency_index = self._build_blog(watch_config)
+        (self.dir_src / "blog").rename(self.dir_src / "news")
+        dir_src = self.dir_src.resolve()
+
+        with patch.object(
+            watch.process, "build_html", wraps=watch.process.build_html
+        ) as build_html:
+            results = await self._handle_batch(
+                watch_config,
+                dependency_index,
+                {
+                    (Change.deleted, str(dir_src / "blog")),
+                    (Change.added, str(dir_src / "news")),
+                },
+            )
+
+        self.assertEqual(build_html.call_count, 0)
+        self.assertEqual(
+            sorted((result.path, result.change, result.count) for result in results),
+            [("blog", Change.deleted, 3), ("news", Change.added, 3)],
+        )
+        self.assertFalse((self.dir_dest / "blog").exists())
+        self.assertTrue((self.dir_dest / "news/2020/post.html").exists())
+        self.assertTrue((self.dir_dest / "news/site.css").exists())
+        self.assertEqual(
+            dependency_index.get_markdown_dependents(Path("news/2020/post.md")),
+            {Path("news/2020/post.html")},
+        )
+        self.assertEqual(dependency_index.get_html_under(Path("blog")), set())
+
+    async def test_directory_replaced_by_same_names_is_rebuilt_not_moved(self):
+        watch_config = WatchConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_dest),
+            copy=[r".*\.css$"],
+        )
+        dependency_index = self._build_blog(watch_config)
+        shutil.rmtree(self.dir_src / "blog")
+        (self.dir_src / "news/2020").mkdir(parents=True)
+        (self.dir_src / "news/2020/post.html").write_text("NEW", encoding="utf-8")
+        (self.dir_src / "news/2020/post.md").write_text("# Post", encoding="utf-8")
+        (self.dir_src / "news/index.html").write_text("<p>News</p>", encoding="utf-8")
+        (self.dir_src / "news/site.css").write_text("main {}", encoding="utf-8")
+        dir_src = self.dir_src.resolve()
+
+        await self._handle_batch(
+            watch_config,
+            dependency_index,
+            {
+                (Change.deleted, str(dir_src / "blog")),
+                (Change.added, str(dir_src / "news")),
+            },
+        )
+
+        self.assertFalse((self.dir_dest / "blog").exists())
+        self.assertEqual(
+            (self.dir_dest / "news/2020/post.html").read_text(encoding="utf-8"), "NEW"
+        )
+        self.assertEqual(
+            (self.dir_dest / "news/site.css").read_text(encoding="utf-8"), "main {}"
+        )
+
+    async def test_directory_move_to_new_parent_rerenders_markdown_pages(self):
+        watch_config = WatchConfig(dir_src=str(self.dir_src), dir_dest=str(self.dir_dest))
+        dependency_index = self._build_blog(watch_config)
+        (self.dir_src / "archive").mkdir()
+        (self.dir_src / "blog").rename(self.dir_src / "archive/blog")
+        dir_src = self.dir_src.resolve()
+
+        with patch.object(
+            watch.process, "build_html", wraps=watch.process.build_html
+        ) as build_html:
+            await self._handle_batch(
+                watch_config,
+                dependency_index,
+                {
+                    (Change.deleted, str(dir_src / "blog")),
+                    (Change.added, str(dir_src / "archive")),
+                    (Change.added, str(dir_src / "archive/blog")),
+                },
+            )
+
+        # Only the page with a relative Markdown include is re-rendered.
+        self.assertEqual(build_html.call_count, 1)
+        self.assertTrue((self.dir_dest / "archive/blog/index.html").exists())
+        self.assertIn(
+            "Post",
+            (self.dir_dest / "archive/blog/2020/post.html").read_text(encoding="utf-8"),
+        )
+
+    async def test_watch_run_reports_directory_rename(self):
+        watch_config = WatchConfig(dir_src=str(self.dir_src), dir_dest=str(self.dir_dest))
+        dependency_index = self._build_blog(watch_config)
+        watcher = watch_run(watch_config, dependency_index=dependency_index)
+
+        try:
+            batch = await self._next_batch_after(
+                watcher,
+                lambda: (self.dir_src / "blog").rename(self.dir_src / "news"),
+            )
+        finally:
+            await watcher.aclose()
+
+        self.assertEqual(
+            sorted((result.path, result.change) for result in batch),
+            [("blog", Change.deleted), ("news", Change.added)],
+        )
+        self.assertTrue((self.dir_dest / "news/index.html").exists())
+        self.assertFalse((self.dir_dest / "blog").exists())
+
+    async def test_directory_delete_removes_subtree_and_prunes_empty_parents(self):
+        watch_config = WatchConfig(dir_src=str(self.dir_src), dir_dest=str(self.dir_dest))
+        dependency_index = self._build_blog(watch_config)
+        shutil.rmtree(self.dir_src / "blog/2020")
+        (self.dir_src / "blog/index.html").unlink()
+        (self.dir_src / "blog/site.css").unlink()
+        dir_src = self.dir_src.resolve()
+
+        results = await self._handle_batch(
+            watch_config,
+            dependency_index,
+            {
+                (Change.deleted, str(dir_src / "blog/2020")),
+                (Change.deleted, str(dir_src / "blog/2020/post.html")),
+                (Change.deleted, str(dir_src / "blog/2020/post.md")),
+                (Change.deleted, str(dir_src / "blog/index.html")),
+            },
+        )
+
+        self.assertIn(("blog/2020", Change.deleted, 1), [
+            (result.path, result.change, result.count) for result in results
+        ])
+        self.assertFalse((self.dir_dest / "blog").exists())
+        self.assertEqual(dependency_index.get_html_under(Path("blog")), set())
+        self.assertTrue((self.dir_dest / "index.html").exists())
+
+    def _read_search(self, rel_path: str):
+        path = self.dir_dest / "search" / rel_path
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+    async def test_markdown_change_updates_only_affected_search_shards(self):
+        watch_config = WatchConfig(
+            dir_src=str(self.dir_src), dir_dest=str(self.dir_dest), search_index="search"
+        )
+        dependency_index = self._build_blog(watch_config)
+        path_blog_shard = self.dir_dest / "search/terms/bl.json"
+        mtime_blog_shard = path_blog_shard.stat().st_mtime_ns
+        self.assertIn("post", self._read_search("terms/po.json"))
+        path_markdown = self.dir_src / "blog/2020/post.md"
+        path_markdown.write_text("# Updated", encoding="utf-8")
+
+        await self._handle_batch(
+            watch_config,
+            dependency_index,
+            {(Change.modified, str(path_markdown.resolve()))},
+        )
+
+        documents = self._read_search("documents.json")["documents"]
+        doc_id = next(
+            doc_id
+            for doc_id, document in documents.items()
+            if document["url"] == "blog/2020/post.html"
+        )
+        self.assertEqual(documents[doc_id]["title"], "Updated")
+        self.assertEqual(self._read_search("terms/up.json"), {"updated": [[int(doc_id), 1]]})
+        self.assertIsNone(self._read_search("terms/po.json"))
+        self.assertEqual(path_blog_shard.stat().st_mtime_ns, mtime_blog_shard)
+
+    async def test_directory_rename_moves_search_entries(self):
+        watch_config = WatchConfig(
+            dir_src=str(self.dir_src), dir_dest=str(self.dir_dest), search_index="search"
+        )
+        dependency_index = self._build_blog(watch_config)
+        (self.dir_src / "blog").rename(self.dir_src / "news")
+        dir_src = self.dir_src.resolve()
+
+        await self._handle_batch(
+            watch_config,
+            dependency_index,
+            {
+                (Change.deleted, str(dir_src / "blog")),
+                (Change.added, str(dir_src / "news")),
+            },
+        )
+
+        documents = self._read_search("documents.json")["documents"]
+        self.assertIn(
+            "news/2020/post.html", {document["url"] for document in documents.values()}
+        )
+        self.assertFalse(
+            any(document["url"].startswith("blog/") for document in documents.values())
+        )
+
+    async def test_copy_delete_revalidates_pages_linking_to_asset(self):
+        (self.dir_src / "index.html").write_text(
+            '<link href="assets/app.css">', encoding="utf-8"
+        )
+        watch_config = WatchConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_dest),
+            copy=[r"assets/.*"],
+            check_links=True,
+        )
+        build_run(watch_config)
+        path_asset = (self.dir_src / "assets/app.css").resolve()
+        path_asset.unlink()
+
+        async def one_batch():
+            yield {(Change.deleted, str(path_asset))}
+
+        with self.assertLogs("engrave.util.links", level="WARNING") as logs:
+            async for _results in watch.handle_async_list_copy_change(
+                watch_config, one_batch()
+            ):
+                pass
+
+        self.assertEqual(
+            logs.output,
+            ["WARNING:engrave.util.links:Broken link in index.html: assets/app.css"],
+        )
+
+    async def test_image_change_rebuilds_pages_using_it(self):
+        (self.dir_src / "photo.jpg").write_bytes(b"photo")
+        (self.dir_src / "index.html").write_text(
+            '{{ srcset("photo.jpg", alt="Photo") }}', encoding="utf-8"
+        )
+        watch_config = WatchConfig(
+            dir_src=str(self.dir_src), dir_dest=str(self.dir_dest), copy=[r".*\.jpg$"]
+        )
+        dependency_index = build_run(watch_config)
+        self.assertEqual(
+            dependency_index.get_image_dependents(Path("photo.jpg")), {Path("index.html")}
+        )
+        path_photo = (self.dir_src / "photo.jpg").resolve()
+        path_photo.write_bytes(b"new photo")
+
+        async def one_batch():
+            yield {(Change.modified, str(path_photo))}
+
+        async for results in watch.handle_async_list_copy_change(
+            watch_config, one_batch(), dependency_index
+        ):
+            self.assertEqual(
+                [(result.path, result.type) for result in results],
+                [("photo.jpg", "copy"), ("index.html", "build")],
+            )
+
+    async def test_layout_change_renders_from_source_despite_compiled_bundle(self):
+        path_layout = self.dir_src / "_partials" / "layout.html"
+        path_layout.write_text("<main>{% block body %}{% endblock %}</main>", encoding="utf-8")
+        (self.dir_src / "index.html").write_text(
+            '{% extends "_partials/layout.html" %}{% block body %}Home{% endblock %}',
+            encoding="utf-8",
+        )
+        path_bundle = self.temp_dir / "bundle" / "templates.zip"
+        compile_run(CompileConfig(dir_src=str(self.dir_src), target=str(path_bundle)))
+        watch_config = WatchConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_dest),
+            compiled_templates=str(path_bundle),
+        )
+        dependency_index = build_run(watch_config)
+        path_layout.write_text(
+            "<article>{% block body %}{% endblock %}</article>", encoding="utf-8"
+        )
+
+        results = await self._handle_batch(
+            watch_config,
+            dependency_index,
+            {(Change.modified, str(path_layout.resolve()))},
+        )
+
+        self.assertIn("index.html", [result.path for result in results])
+        self.assertIn(
+            "<article>Home</article>",
+            (self.dir_dest / "index.html").read_text(encoding="utf-8"),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,63 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks import reload
+from benchmarks.run import main
+from benchmarks.sitegen import SiteShape, generate_site
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    def test_generate_site_matches_requested_shape(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            site = generate_site(
+                temp_dir,
+                SiteShape(pages=7, sections=3, layout_depth=2, assets=4, asset_size=16),
+            )
+
+            self.assertEqual(len(site.pages), 7)
+            self.assertEqual(len(site.layouts), 2)
+            self.assertEqual(len(site.assets), 4)
+            self.assertEqual((Path(temp_dir) / site.assets[0]).stat().st_size, 16)
+            self.assertEqual(
+                sorted({path.parent.name for path in site.pages}),
+                ["section_0", "section_1", "section_2"],
+            )
+
+    def test_main_writes_machine_readable_results(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path_output = Path(temp_dir) / "bench.json"
+            main(
+                [
+                    "--pages", "3",
+                    "--assets", "2",
+                    "--repeat", "1",
+                    "--scenario", "full_build",
+                    "--scenario", "markdown_edit",
+                    "--output", str(path_output),
+                ]
+            )
+            report = json.loads(path_output.read_text(encoding="utf-8"))
+
+        self.assertEqual(sorted(report["results"]), ["full_build", "markdown_edit"])
+        self.assertEqual(report["shape"]["pages"], 3)
+        self.assertEqual(report["results"]["full_build"]["runs"], 1)
+
+    def test_reload_harness_reports_stage_percentiles_for_html_edit(self):
+        report = reload.run(
+            SiteShape(pages=2, assets=1, markdown_includes=2),
+            edits=["html"],
+            repeat=1,
+            settle=0.2,
+            timeout=10,
+        )
+
+        stages = report["results"]["html"]
+        self.assertEqual(sorted(stages), ["deliver", "detect", "process", "total"])
+        self.assertEqual(stages["total"]["runs"], 1)
+        self.assertGreaterEqual(stages["total"]["p99"], stages["deliver"]["p99"])
+
+
+if __name__ == "__main__":
+    unittest.main()
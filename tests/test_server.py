@@ -9,6 +9,7 @@ from watchfiles import Change
 
 from engrave.server import create_fastapi, watch_to_queue
 from engrave.util.dataclass import FileChangeResult, ServerConfig
+from engrave.util.metrics import metrics
 
 
 class ServerRoutingTests(unittest.TestCase):
@@ -101,6 +102,56 @@ class ServerRoutingTests(unittest.TestCase):
         self.assertNotIn("Stale Dest", response.text)
 
 
+class ServerMetricsTests(unittest.TestCase):
+    def setUp(self):
+        fixtures_root = Path(__file__).parent / "fixtures" / "server"
+        self.temp_root = Path(tempfile.mkdtemp())
+        shutil.copytree(fixtures_root / "src", self.temp_root / "src")
+        shutil.copytree(fixtures_root / "dest", self.temp_root / "dest")
+
+        self.watch_patch = patch("engrave.server.watch_to_queue", new=AsyncMock())
+        self.watch_patch.start()
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.reset()
+        self.watch_patch.stop()
+        shutil.rmtree(self.temp_root, ignore_errors=True)
+
+    def _client(self, **kw) -> TestClient:
+        server_config = ServerConfig(
+            dir_src=str(self.temp_root / "src"),
+            dir_dest=str(self.temp_root / "dest"),
+            **kw,
+        )
+        return TestClient(create_fastapi(server_config))
+
+    def test_metrics_endpoint_reports_render_latency_and_sse_clients(self):
+        with self._client(metrics=True) as client:
+            client.get("/nested/")
+            response = client.get("/__engrave/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'engrave_render_seconds_count{mode="server",page="nested/index.html"} 1',
+            response.text,
+        )
+        self.assertIn("engrave_template_lookups_total", response.text)
+        self.assertIn("engrave_sse_clients 0", response.text)
+
+    def test_metrics_endpoint_is_absent_when_disabled(self):
+        app = create_fastapi(
+            ServerConfig(
+                dir_src=str(self.temp_root / "src"),
+                dir_dest=str(self.temp_root / "dest"),
+            )
+        )
+
+        paths = [getattr(route, "path", None) for route in app.routes]
+        self.assertNotIn("/__engrave/metrics", paths)
+        self.assertFalse(metrics.enabled)
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -128,11 +179,17 @@ class ServerWatchQueueTests(unittest.IsolatedAsyncioTestCase):
 
         publish_mock.assert_awaited_once_with(
             [
-                {"path": "index.html", "type": "build", "change": Change.modified},
+                {
+                    "path": "index.html",
+                    "type": "build",
+                    "change": Change.modified,
+                    "count": 1,
+                },
                 {
                     "path": "assets/site.css",
                     "type": "copy",
                     "change": Change.modified,
+                    "count": 1,
                 },
             ],
             set(),
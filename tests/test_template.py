@@ -1,10 +1,16 @@
+import asyncio
+import time
 import unittest
 import tempfile
 import os
 import shutil
 from pathlib import Path
 
-from engrave.template import get_template
+from unittest.mock import patch
+
+import jinja2
+
+from engrave.template import get_bytecode_cache, get_template
 
 
 class TemplateTests(unittest.TestCase):
@@ -280,5 +286,119 @@ class TemplateTests(unittest.TestCase):
         self.assertIn("<p>Nested content.</p>", out)
 
 
+    def test_bytecode_cache_reuses_compiled_templates_across_engines(self):
+        """Persistent bytecode skips compilation until the source changes."""
+        cache_dir = tempfile.mkdtemp()
+        try:
+            bytecode_cache = get_bytecode_cache(cache_dir)
+            get_template(dir_src=self.temp_dir, bytecode_cache=bytecode_cache)(
+                "partial.html"
+            ).render()
+
+            dir_versioned = Path(cache_dir) / f"jinja2-{jinja2.__version__}"
+            self.assertEqual(len(list(dir_versioned.iterdir())), 1)
+
+            with patch.object(
+                jinja2.Environment, "compile", wraps=jinja2.Environment.compile
+            ) as mock_compile:
+                get_template(dir_src=self.temp_dir, bytecode_cache=bytecode_cache)(
+                    "partial.html"
+                ).render()
+            mock_compile.assert_not_called()
+
+            with open(self.partial_file, "a") as f:
+                f.write("<p>changed</p>")
+            get_template(dir_src=self.temp_dir, bytecode_cache=bytecode_cache)(
+                "partial.html"
+            ).render()
+            self.assertEqual(len(list(dir_versioned.iterdir())), 2)
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_cache_tag_reuses_fragment_until_dependency_changes(self):
+        """{% cache %} blocks render once per key and vary_on values."""
+        path_nav = Path(self.temp_dir) / "nav.html"
+        path_nav.write_text("nav {{ section }}", encoding="utf-8")
+        Path(self.temp_dir, "page.html").write_text(
+            '{% cache "nav", section %}{% include "nav.html" %} '
+            '{{ markdown("content.md") | length > 0 }}{% endcache %}',
+            encoding="utf-8",
+        )
+
+        def render(section):
+            markdown_paths, template_paths = set(), set()
+            html = get_template(
+                dir_src=self.temp_dir,
+                markdown_dependency_collector=markdown_paths.add,
+                template_dependency_collector=template_paths.add,
+            )("page.html").render(section=section)
+            return html, markdown_paths, template_paths
+
+        self.assertEqual(render("docs")[0], "nav docs True")
+        with patch("engrave.template.mistune.html") as mock_html:
+            html, markdown_paths, template_paths = render("docs")
+        mock_html.assert_not_called()
+        self.assertEqual(html, "nav docs True")
+        # Pages reusing a fragment still depend on what it was rendered from.
+        self.assertEqual(markdown_paths, {Path("content.md")})
+        self.assertEqual(template_paths, {Path("page.html"), Path("nav.html")})
+        self.assertEqual(render("blog")[0], "nav blog True")
+
+        path_nav.write_text("menu {{ section }}", encoding="utf-8")
+        os.utime(path_nav, ns=(0, 0))
+        self.assertEqual(render("docs")[0], "menu docs True")
+
+
+class AsyncTemplateTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        fixtures_root = Path(__file__).parent / "fixtures" / "template"
+        self.temp_dir = tempfile.mkdtemp()
+        shutil.copytree(fixtures_root / "primary", self.temp_dir, dirs_exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    async def test_render_async_includes_markdown_and_records_dependency(self):
+        markdown_paths = set()
+        template = get_template(
+            dir_src=self.temp_dir,
+            enable_async=True,
+            markdown_dependency_collector=markdown_paths.add,
+        )("main.html")
+
+        result = await template.render_async(
+            title="Async", content="*inline*", partial_content="p", author="Docs"
+        )
+
+        self.assertIn("<h1>Hello World</h1>", result)
+        self.assertIn("Author: Docs", result)
+        self.assertIn("<em>inline</em>", result)
+        self.assertEqual(markdown_paths, {Path("content.md")})
+
+    async def test_markdown_conversion_does_not_block_event_loop(self):
+        def slow_markdown(text):
+            time.sleep(0.3)
+            return text
+
+        template = get_template(
+            dir_src=self.temp_dir, enable_async=True, markdown_to_html=slow_markdown
+        )("main.html")
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task_tick = asyncio.create_task(tick())
+        try:
+            await template.render_async(title="Async", content="x", partial_content="p")
+        finally:
+            task_tick.cancel()
+
+        self.assertGreater(ticks, 5)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from engrave.core.build import run as build_run
+from engrave.core.compile import run as compile_run
+from engrave.util import process
+from engrave.util.cache import BuildCache, get_engine_config
+from engrave.util.dataclass import BuildConfig, CompileConfig
+
+
+class BuildCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.dir_root = Path(tempfile.mkdtemp())
+        self.dir_src = self.dir_root / "src"
+        self.dir_cache = self.dir_root / "cache"
+        self._write("_layout.html", "<main>{% block body %}{% endblock %}</main>")
+        self._write("intro.md", "# Intro")
+        self._write(
+            "index.html",
+            '{% extends "_layout.html" %}{% block body %}{{ markdown("intro.md") }}{% endblock %}',
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_root, ignore_errors=True)
+
+    def _write(self, rel_path: str, content: str) -> None:
+        path = self.dir_src / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    def _build(self, name: str, **kw):
+        config = BuildConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_root / name),
+            build_cache=str(self.dir_cache),
+            **kw,
+        )
+        with patch.object(process, "get_template", wraps=process.get_template) as mock:
+            dependency_index = build_run(config)
+        return dependency_index, mock.call_count
+
+    def test_hit_restores_output_and_dependencies_without_rendering(self):
+        dependency_index_first, renders_first = self._build("first")
+        dependency_index_second, renders_second = self._build("second")
+
+        self.assertEqual(renders_first, 1)
+        self.assertEqual(renders_second, 0)
+        self.assertEqual(
+            (self.dir_root / "second/index.html").read_text(encoding="utf-8"),
+            (self.dir_root / "first/index.html").read_text(encoding="utf-8"),
+        )
+        self.assertEqual(dependency_index_second.to_dict(), dependency_index_first.to_dict())
+
+    def test_dependency_edit_misses_and_rerenders(self):
+        self._build("first")
+        self._write("intro.md", "# Edited")
+
+        _dependency_index, renders = self._build("second")
+
+        self.assertEqual(renders, 1)
+        self.assertIn("Edited", (self.dir_root / "second/index.html").read_text(encoding="utf-8"))
+
+    def test_render_option_change_misses(self):
+        self._write("data/site.json", '{"name": "FROM-DATA"}')
+        self._write("other/site.json", '{"name": "FROM-OTHER"}')
+        self._write("index.html", "{{ data.site.name }}")
+        self._build("first", data_dir="data")
+
+        _dependency_index, renders = self._build("second", data_dir="other")
+
+        self.assertEqual(renders, 1)
+        self.assertEqual(
+            (self.dir_root / "second/index.html").read_text(encoding="utf-8"), "FROM-OTHER"
+        )
+
+    def test_compiled_bundle_change_changes_engine_config(self):
+        path_bundle = self.dir_root / "bundle" / "templates.zip"
+        compile_run(CompileConfig(dir_src=str(self.dir_src), target=str(path_bundle)))
+        config = BuildConfig(
+            dir_src=str(self.dir_src),
+            dir_dest=str(self.dir_root / "dist"),
+            compiled_templates=str(path_bundle),
+        )
+        engine_config_first = get_engine_config(config)
+        self._write("_layout.html", "<article>{% block body %}{% endblock %}</article>")
+        compile_run(CompileConfig(dir_src=str(self.dir_src), target=str(path_bundle)))
+
+        self.assertNotEqual(get_engine_config(config), engine_config_first)
+        self.assertNotEqual(get_engine_config(config), get_engine_config())
+
+    def test_evict_removes_least_recently_used_entries(self):
+        build_cache = BuildCache(self.dir_cache, max_size=10**6)
+        path_old = build_cache.entry_path("objects", "aa" * 32)
+        path_new = build_cache.entry_path("objects", "bb" * 32)
+        for path, mtime in ((path_old, 1_000_000), (path_new, 2_000_000)):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"x" * 600_000)
+            os.utime(path, (mtime, mtime))
+
+        removed = build_cache.evict()
+
+        self.assertEqual(removed, 600_000)
+        self.assertFalse(path_old.exists())
+        self.assertTrue(path_new.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from engrave.template import get_template
+from engrave.util.collection import CollectionIndex, get_collection_index
+
+
+class CollectionTests(unittest.TestCase):
+    def setUp(self):
+        self.dir_src = Path(tempfile.mkdtemp())
+        self._write(
+            "posts/first.html",
+            '+++\ntitle = "First"\ndate = 2026-01-02\n+++\n<h1>{{ 1 + 1 }}</h1>',
+        )
+        self._write("posts/2026/second.html", '+++\ntitle = "Second"\n+++\nBody')
+        self._write("posts/_draft.html", '+++\ntitle = "Draft"\n+++\n')
+        self._write("about.html", "About")
+        self.collection_index = CollectionIndex(self.dir_src, [])
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_src, ignore_errors=True)
+
+    def _write(self, rel_path: str, content: str) -> None:
+        path = self.dir_src / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    def _template(self, set_collection_path: set):
+        return get_template(
+            dir_src=self.dir_src,
+            collection_index=self.collection_index,
+            collection_dependency_collector=set_collection_path.add,
+        )
+
+    def test_collection_lists_pages_below_directory_with_front_matter(self):
+        self._write(
+            "posts/index.html",
+            "{% for page in collection() %}{{ page.url }}={{ page.title }};{% endfor %}",
+        )
+        set_collection_path = set()
+
+        html = self._template(set_collection_path)("posts/index.html").render()
+
+        self.assertEqual(html, "2026/second.html=Second;first.html=First;")
+        self.assertEqual(set_collection_path, {Path("posts")})
+
+    def test_front_matter_is_not_rendered_and_keeps_line_numbers(self):
+        template = self._template(set())
+
+        self.assertEqual(template("posts/first.html").render(), "<h1>2</h1>")
+
+        self._write("broken.html", '+++\ntitle = "Broken"\n+++\n\n{{ 1 + }}')
+        with self.assertRaises(Exception) as context:
+            template("broken.html")
+        self.assertEqual(context.exception.lineno, 5)
+
+    def test_update_reports_front_matter_changes_only(self):
+        path_rel = Path("posts/first.html")
+        self.collection_index.get(Path("posts"))
+
+        self._write(path_rel.as_posix(), '+++\ntitle = "First"\ndate = 2026-01-02\n+++\nNew')
+        self.assertFalse(self.collection_index.update(path_rel))
+
+        self._write(path_rel.as_posix(), '+++\ntitle = "Renamed"\n+++\nNew')
+        self.assertTrue(self.collection_index.update(path_rel))
+        self.assertTrue(self.collection_index.update(Path("posts/third.html")))
+        self.assertFalse(self.collection_index.update(Path("posts/_partial.html")))
+        self.assertTrue(self.collection_index.remove(Path("posts/third.html")))
+
+    def test_listings_are_kept_until_the_index_changes(self):
+        self._write(
+            "posts/2026/index.html",
+            "{% for page in collection('..') %}{{ page.url }};{% endfor %}",
+        )
+        listing = self.collection_index.get(Path("posts"))
+        self.assertIs(self.collection_index.get(Path("posts")), listing)
+
+        html = self._template(set())("posts/2026/index.html").render()
+        self.assertEqual(html, "second.html;../first.html;")
+
+        self._write("posts/first.html", '+++\ntitle = "Renamed"\n+++\n')
+        self.assertIs(self.collection_index.get(Path("posts")), listing)
+        self.collection_index.update(Path("posts/first.html"))
+        self.assertEqual(
+            self.collection_index.get(Path("posts"))[-1][1], {"title": "Renamed"}
+        )
+
+    def test_cached_fragment_listing_a_collection_is_checked_by_generation(self):
+        self._write(
+            "index.html",
+            '{% cache "posts" %}{% for page in collection("posts") %}'
+            "{{ page.title }};{% endfor %}{% endcache %}",
+        )
+        self.assertEqual(self._template(set())("index.html").render(), "Second;First;")
+
+        with patch.object(CollectionIndex, "digest") as mock_digest:
+            html = self._template(set())("index.html").render()
+        mock_digest.assert_not_called()
+        self.assertEqual(html, "Second;First;")
+
+        self._write("posts/first.html", '+++\ntitle = "Renamed"\n+++\n')
+        self.collection_index.update(Path("posts/first.html"))
+        self.assertEqual(self._template(set())("index.html").render(), "Second;Renamed;")
+
+    def test_shared_index_follows_exclude_changes(self):
+        collection_index = get_collection_index(self.dir_src, [])
+        self.assertIs(get_collection_index(self.dir_src, []), collection_index)
+        self.assertIn(
+            Path("about.html"), [path for path, _meta in collection_index.get(Path("."))]
+        )
+
+        collection_index = get_collection_index(self.dir_src, [r"about\.html"])
+        self.assertNotIn(
+            Path("about.html"), [path for path, _meta in collection_index.get(Path("."))]
+        )
@@ -0,0 +1,62 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from engrave.template import get_template
+from engrave.util.data import SiteData
+
+
+class SiteDataTests(unittest.TestCase):
+    def setUp(self):
+        self.dir_src = Path(tempfile.mkdtemp())
+        self._write("data/nav.json", '[{"title": "Home", "url": "/"}]')
+        self._write("data/authors/jane.toml", 'name = "Jane"')
+        self._write("data/authors/omar.json", '{"name": "Omar"}')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_src, ignore_errors=True)
+
+    def _write(self, rel_path: str, content: str) -> None:
+        path = self.dir_src / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    def _render(self, source: str) -> tuple[str, set]:
+        self._write("index.html", source)
+        set_data_path = set()
+        template = get_template(
+            dir_src=self.dir_src,
+            data_dir="data",
+            data_dependency_collector=set_data_path.add,
+        )
+        return template("index.html").render(), set_data_path
+
+    def test_data_global_records_only_files_read(self):
+        html, set_data_path = self._render(
+            "{% for item in data.nav %}{{ item.title }}{% endfor %} {{ data.authors.jane.name }}"
+        )
+
+        self.assertEqual(html, "Home Jane")
+        self.assertEqual(
+            set_data_path, {Path("data/nav.json"), Path("data/authors/jane.toml")}
+        )
+
+    def test_iterating_a_directory_records_the_directory(self):
+        html, set_data_path = self._render(
+            "{% for name, author in data.authors.items() %}{{ author.name }};{% endfor %}"
+            "{{ 'bob' in data.authors }}"
+        )
+
+        self.assertEqual(html, "Jane;Omar;False")
+        self.assertIn(Path("data/authors"), set_data_path)
+
+    def test_changed_file_is_parsed_again(self):
+        site_data = SiteData(self.dir_src)
+        path_rel = Path("data/authors/omar.json")
+        self.assertEqual(site_data.load(path_rel), {"name": "Omar"})
+        self.assertIs(site_data.load(path_rel), site_data.load(path_rel))
+
+        self._write("data/authors/omar.json", '{"name": "Omar K."}')
+
+        self.assertEqual(site_data.load(path_rel), {"name": "Omar K."})
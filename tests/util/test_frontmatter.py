@@ -0,0 +1,67 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from engrave.core.build import run as build_run
+from engrave.template import get_template
+from engrave.util.dataclass import BuildConfig
+from engrave.util.frontmatter import get_front_matter, read_front_matter
+
+
+class FrontMatterTests(unittest.TestCase):
+    def setUp(self):
+        self.dir_root = Path(tempfile.mkdtemp())
+        self.dir_src = self.dir_root / "src"
+        self.dir_src.mkdir()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_root, ignore_errors=True)
+
+    def _write(self, rel_path: str, content: str) -> Path:
+        path = self.dir_src / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_reads_only_the_header(self):
+        path = self.dir_src / "post.html"
+        # The body is not valid UTF-8, so decoding it would fail.
+        path.write_bytes(b'+++\r\ntitle = "Post"\r\n+++\r\n\xff\xfe')
+
+        self.assertEqual(read_front_matter(path), {"title": "Post"})
+        self.assertEqual(read_front_matter(self._write("plain.html", "+++\nNo fence")), {})
+
+    def test_cached_front_matter_is_read_again_after_change(self):
+        path = self._write("post.html", '+++\ntitle = "First"\n+++\n')
+        meta = get_front_matter(path)
+        self.assertIs(get_front_matter(path), meta)
+
+        self._write("post.html", '+++\ntitle = "Second"\n+++\n')
+
+        self.assertEqual(get_front_matter(path), {"title": "Second"})
+
+    def test_markdown_include_strips_front_matter(self):
+        self._write("post.md", '+++\ntitle = "Post"\n+++\n# Heading')
+        self._write("index.html", '{{ markdown("post.md") }}')
+
+        html = get_template(dir_src=self.dir_src)("index.html").render()
+
+        self.assertEqual(html, "<h1>Heading</h1>\n")
+
+    def test_build_exposes_page_front_matter_to_layouts(self):
+        self._write("_layout.html", "<title>{{ page.title }}</title>{% block body %}{% endblock %}")
+        self._write(
+            "post.html",
+            '+++\ntitle = "Post"\n+++\n{% extends "_layout.html" %}'
+            "{% block body %}{{ page.url }}{% endblock %}",
+        )
+
+        build_run(
+            BuildConfig(dir_src=str(self.dir_src), dir_dest=str(self.dir_root / "dist"))
+        )
+
+        self.assertEqual(
+            (self.dir_root / "dist/post.html").read_text(encoding="utf-8"),
+            "<title>Post</title>post.html",
+        )
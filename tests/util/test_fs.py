@@ -0,0 +1,30 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from engrave.util.fs import atomic_path, write_text_atomic
+
+
+class AtomicWriteTests(unittest.TestCase):
+    def setUp(self):
+        self.dir_root = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_root, ignore_errors=True)
+
+    def test_failed_write_keeps_previous_file(self):
+        path = self.dir_root / "nested/index.json"
+        write_text_atomic(path, "old")
+
+        with self.assertRaises(RuntimeError):
+            with atomic_path(path) as path_tmp:
+                path_tmp.write_text("partial", encoding="utf-8")
+                raise RuntimeError("render failed")
+
+        self.assertEqual(path.read_text(encoding="utf-8"), "old")
+        self.assertEqual([child.name for child in path.parent.iterdir()], ["index.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import importlib.util
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from engrave.template import get_template
+from engrave.util.image import ImageProcessor
+
+
+HAS_PILLOW = importlib.util.find_spec("PIL") is not None
+
+
+class ImageProcessorTests(unittest.TestCase):
+    def setUp(self):
+        self.dir_root = Path(tempfile.mkdtemp())
+        self.dir_src = self.dir_root / "src"
+        self.dir_dest = self.dir_root / "dist"
+        (self.dir_src / "photos").mkdir(parents=True)
+        self.processor = ImageProcessor(
+            self.dir_root / "cache", [480, 960], ["avif", "webp"], 80
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_root, ignore_errors=True)
+
+    def _store_entry(self, path_rel: Path) -> None:
+        """Fill the cache entry of a source image as a previous build would."""
+        dir_entry = self.processor.entry_dir(self.processor.cache_key(self.dir_src / path_rel))
+        dir_entry.mkdir(parents=True)
+        list_variant = []
+        for width, height in [(480, 320), (960, 640)]:
+            for image_format in ["avif", "webp"]:
+                name = f"{width}.{image_format}"
+                (dir_entry / name).write_bytes(name.encode("utf-8"))
+                list_variant.append(
+                    {"file": name, "width": width, "height": height, "format": image_format}
+                )
+        (dir_entry / "meta.json").write_text(
+            json.dumps({"width": 1200, "height": 800, "variants": list_variant}),
+            encoding="utf-8",
+        )
+
+    def test_cache_hit_writes_variants_without_generating(self):
+        path_rel = Path("photos/cat.jpg")
+        (self.dir_src / path_rel).write_bytes(b"cat")
+        self._store_entry(path_rel)
+
+        dict_output = self.processor.run(self.dir_src, self.dir_dest, [path_rel], workers=1)
+
+        self.assertEqual(
+            dict_output[path_rel],
+            [
+                Path("photos/cat-480w.avif"),
+                Path("photos/cat-480w.webp"),
+                Path("photos/cat-960w.avif"),
+                Path("photos/cat-960w.webp"),
+            ],
+        )
+        self.assertEqual(
+            (self.dir_dest / "photos/cat-960w.webp").read_bytes(), b"960.webp"
+        )
+
+        self.assertEqual(
+            self.processor.remove(self.dir_dest, path_rel), dict_output[path_rel]
+        )
+        self.assertFalse((self.dir_dest / "photos/cat-480w.avif").exists())
+
+    def test_srcset_emits_picture_relative_to_page(self):
+        path_rel = Path("photos/cat.jpg")
+        (self.dir_src / path_rel).write_bytes(b"cat")
+        self._store_entry(path_rel)
+        (self.dir_src / "blog").mkdir()
+        (self.dir_src / "blog/post.html").write_text(
+            '{{ srcset("../photos/cat.jpg", alt="A cat", loading="lazy") }}',
+            encoding="utf-8",
+        )
+        set_template_path, set_image_path = set(), set()
+        template = get_template(
+            dir_src=self.dir_src,
+            template_dependency_collector=set_template_path.add,
+            image_dependency_collector=set_image_path.add,
+            image_processor=self.processor,
+        )
+
+        html = template("blog/post.html").render()
+
+        self.assertEqual(
+            html,
+            '<picture><source type="image/avif" srcset="../photos/cat-480w.avif 480w, '
+            '../photos/cat-960w.avif 960w" sizes="100vw">'
+            '<img src="../photos/cat-960w.webp" srcset="../photos/cat-480w.webp 480w, '
+            '../photos/cat-960w.webp 960w" sizes="100vw" width="960" height="640" '
+            'alt="A cat" loading="lazy"></picture>',
+        )
+        self.assertEqual(set_image_path, {path_rel})
+        self.assertNotIn(path_rel, set_template_path)
+
+    def test_srcset_falls_back_to_original_without_variants(self):
+        (self.dir_src / "photos/dog.png").write_bytes(b"dog")
+        (self.dir_src / "index.html").write_text(
+            '{{ srcset("photos/dog.png") }}', encoding="utf-8"
+        )
+        template = get_template(dir_src=self.dir_src, image_processor=self.processor)
+
+        self.assertEqual(
+            template("index.html").render(), '<img src="photos/dog.png" alt="">'
+        )
+
+    @unittest.skipUnless(HAS_PILLOW, "Pillow is not installed")
+    def test_generates_variants_no_wider_than_original(self):
+        from PIL import Image
+
+        path_rel = Path("photos/wide.png")
+        Image.new("RGB", (600, 300), "red").save(self.dir_src / path_rel)
+        processor = ImageProcessor(self.dir_root / "cache", [480, 960], ["png"], 80)
+
+        dict_output = processor.run(self.dir_src, self.dir_dest, [path_rel], workers=1)
+
+        self.assertEqual(dict_output[path_rel], [Path("photos/wide-480w.png")])
+        with Image.open(self.dir_dest / "photos/wide-480w.png") as image:
+            self.assertEqual(image.size, (480, 240))
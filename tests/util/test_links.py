@@ -0,0 +1,82 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from engrave.util.links import LinkChecker, resolve_link
+
+
+class ResolveLinkTests(unittest.TestCase):
+    def test_resolves_internal_links_and_skips_external_ones(self):
+        page = Path("docs/guide/intro.html")
+        cases = {
+            "setup.html#install": Path("docs/guide/setup.html"),
+            "../": Path("docs/index.html"),
+            "/assets/app%20v2.css?v=3": Path("assets/app v2.css"),
+            "/": Path("index.html"),
+            "../../../outside.html": Path("../outside.html"),
+            "https://example.org/": None,
+            "//cdn.example.org/lib.js": None,
+            "mailto:team@example.org": None,
+            "#top": None,
+            "": None,
+        }
+        for link, expected in cases.items():
+            with self.subTest(link=link):
+                self.assertEqual(resolve_link(page, link), expected)
+
+    def test_site_url_path_is_the_root_of_absolute_links(self):
+        page = Path("index.html")
+        site_url = "https://example.com/docs/"
+        self.assertEqual(
+            resolve_link(page, "https://example.com/docs/a.html", site_url), Path("a.html")
+        )
+        self.assertEqual(resolve_link(page, "/docs/b/", site_url), Path("b/index.html"))
+
+
+class LinkCheckerTests(unittest.TestCase):
+    def setUp(self):
+        self.dir_dest = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_dest, ignore_errors=True)
+
+    def _write(self, rel_path: str, content: str) -> None:
+        path = self.dir_dest / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+    def test_check_all_reports_broken_links_across_workers(self):
+        self._write("app.css", "")
+        self._write("section/index.html", "")
+        for index in range(130):
+            self._write(
+                f"pages/{index}.html",
+                '<link href="/app.css"><a href="../section">s</a>'
+                f'<img srcset="/img/{index}.png 1x, /app.css 2x">',
+            )
+
+        link_checker = LinkChecker(self.dir_dest)
+
+        self.assertEqual(link_checker.check_all(workers=2), 130)
+        self.assertEqual(link_checker.broken[Path("pages/7.html")], ["/img/7.png"])
+
+    def test_output_changes_revalidate_only_linking_pages(self):
+        self._write("index.html", '<a href="about.html">About</a>')
+        self._write("other.html", '<a href="index.html">Home</a>')
+        link_checker = LinkChecker(self.dir_dest)
+        self.assertEqual(link_checker.check_all(), 1)
+
+        self._write("about.html", "")
+        link_checker.add_output(Path("about.html"))
+        self.assertEqual(link_checker.dirty_pages, {Path("index.html")})
+        self.assertEqual(link_checker.report(), 0)
+
+        link_checker.remove(Path("index.html"))
+        self.assertEqual(link_checker.dirty_pages, {Path("other.html")})
+        self.assertEqual(link_checker.report(), 1)
+        self.assertEqual(link_checker.broken, {Path("other.html"): ["index.html"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
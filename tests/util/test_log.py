@@ -0,0 +1,60 @@
+import logging
+import logging.handlers
+import unittest
+from unittest.mock import patch
+
+from engrave.util.log import ProgressReporter, setup_root_logger, stop_queue_listener
+
+
+class SetupRootLoggerTests(unittest.TestCase):
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.previous_handlers = list(self.root.handlers)
+        self.previous_level = self.root.level
+
+    def tearDown(self):
+        stop_queue_listener()
+        self.root.handlers[:] = self.previous_handlers
+        self.root.setLevel(self.previous_level)
+
+    def test_repeated_setup_installs_a_single_queue_handler(self):
+        setup_root_logger("DEBUG")
+        setup_root_logger("WARNING")
+
+        queue_handlers = [
+            handler
+            for handler in self.root.handlers
+            if isinstance(handler, logging.handlers.QueueHandler)
+        ]
+        self.assertEqual(len(queue_handlers), 1)
+        self.assertEqual(self.root.level, logging.WARNING)
+
+
+class ProgressReporterTests(unittest.TestCase):
+    def test_advance_reports_counts_rate_and_eta_once_interval_elapses(self):
+        logger = logging.getLogger("engrave.tests.progress")
+
+        with patch("engrave.util.log.time.perf_counter", side_effect=[0.0, 1.0, 3.0]):
+            progress = ProgressReporter(4, logger=logger, interval=2.0)
+            with self.assertLogs(logger, level="INFO") as logs:
+                progress.advance("html")
+                progress.advance("copy")
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("2/4 files (copy: 1, html: 1)", logs.output[0])
+        self.assertIn("0.7 files/s", logs.output[0])
+        self.assertIn("ETA 3.0s", logs.output[0])
+
+    def test_finish_logs_summary(self):
+        logger = logging.getLogger("engrave.tests.progress")
+        progress = ProgressReporter(1, logger=logger, interval=60)
+        progress.advance("html")
+
+        with self.assertLogs(logger, level="INFO") as logs:
+            progress.finish()
+
+        self.assertIn("Build complete: 1 files (html: 1)", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from engrave.util.metrics import MetricsRegistry, _collect_template_cache_ratio
+
+
+class MetricsRegistryTests(unittest.TestCase):
+    def test_disabled_registry_records_nothing(self):
+        registry = MetricsRegistry()
+
+        registry.inc("engrave_test_total")
+        registry.observe("engrave_test_seconds", 0.5)
+        with registry.timer("engrave_test_seconds"):
+            pass
+
+        self.assertEqual(registry.counters, {})
+        self.assertEqual(registry.histograms, {})
+
+    def test_render_prometheus_emits_counters_and_cumulative_buckets(self):
+        registry = MetricsRegistry(enabled=True)
+        registry.describe("engrave_test_seconds", "Test latency.")
+
+        registry.inc("engrave_test_total", labels={"page": "index.html"})
+        registry.inc("engrave_test_total", labels={"page": "index.html"})
+        registry.observe("engrave_test_seconds", 0.002, buckets=(0.001, 0.01))
+        registry.observe("engrave_test_seconds", 0.005, buckets=(0.001, 0.01))
+        registry.observe("engrave_test_seconds", 3.0, buckets=(0.001, 0.01))
+
+        text = registry.render_prometheus()
+
+        self.assertIn('engrave_test_total{page="index.html"} 2', text)
+        self.assertIn("# HELP engrave_test_seconds Test latency.", text)
+        self.assertIn("# TYPE engrave_test_seconds histogram", text)
+        self.assertIn('engrave_test_seconds_bucket{le="0.001"} 0', text)
+        self.assertIn('engrave_test_seconds_bucket{le="0.01"} 2', text)
+        self.assertIn('engrave_test_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("engrave_test_seconds_count 3", text)
+
+    def test_dump_writes_exposition_file(self):
+        registry = MetricsRegistry(enabled=True)
+        registry.inc("engrave_test_total")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path_file = Path(temp_dir) / "metrics" / "engrave.prom"
+            registry.dump(path_file)
+
+            self.assertIn("engrave_test_total 1", path_file.read_text("utf-8"))
+            self.assertEqual(list(path_file.parent.iterdir()), [path_file])
+
+    def test_only_templates_report_a_cache_hit_ratio(self):
+        registry = MetricsRegistry(enabled=True)
+        registry.add_collector(_collect_template_cache_ratio)
+        for name in ("template_lookups", "template_lookups", "template_loads"):
+            registry.inc(f"engrave_{name}_total")
+        registry.inc("engrave_markdown_lookups_total")
+        registry.inc("engrave_markdown_loads_total")
+
+        text = registry.render_prometheus()
+
+        self.assertIn("engrave_template_cache_hit_ratio 0.5", text)
+        self.assertNotIn("engrave_markdown_cache_hit_ratio", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from engrave.util.profile import BuildProfiler
+
+
+class BuildProfilerTests(unittest.TestCase):
+    def test_disabled_profiler_records_no_spans(self):
+        profiler = BuildProfiler()
+
+        with profiler.span("index.html", "page"):
+            pass
+
+        self.assertEqual(profiler.spans, [])
+
+    def test_write_produces_sorted_report_and_trace_events(self):
+        profiler = BuildProfiler()
+        profiler.enable()
+        with profiler.span("fast.html", "page"):
+            pass
+        with profiler.span("slow.html", "page"):
+            with profiler.span("content.md", "markdown"):
+                sum(range(200_000))
+        profiler.disable()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path_report, path_trace = profiler.write(Path(temp_dir) / "profile")
+            report = path_report.read_text(encoding="utf-8")
+            trace = json.loads(path_trace.read_text(encoding="utf-8"))
+
+        self.assertLess(report.index("slow.html"), report.index("fast.html"))
+        self.assertIn("content.md", report)
+        self.assertEqual(
+            sorted((event["cat"], event["name"]) for event in trace["traceEvents"]),
+            [("markdown", "content.md"), ("page", "fast.html"), ("page", "slow.html")],
+        )
+        self.assertTrue(all(event["ph"] == "X" for event in trace["traceEvents"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
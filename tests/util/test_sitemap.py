@@ -0,0 +1,101 @@
+import re
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from engrave.template import RenderDependencies
+from engrave.util.sitemap import Sitemap
+
+
+class SitemapTests(unittest.TestCase):
+    def setUp(self):
+        self.dir_root = Path(tempfile.mkdtemp())
+        self.dir_src = self.dir_root / "src"
+        self.dir_dest = self.dir_root / "dist"
+        self.sitemap = Sitemap(self.dir_dest, "https://example.com", max_urls=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_root, ignore_errors=True)
+
+    def _add(self, name: str) -> None:
+        path = self.dir_src / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("<p></p>", encoding="utf-8")
+        self.sitemap.update(
+            self.dir_src,
+            self.dir_dest,
+            Path(name),
+            RenderDependencies(markdown_paths=set(), template_paths=set()),
+        )
+
+    def _locs(self, name: str) -> list:
+        text = (self.dir_dest / name).read_text(encoding="utf-8")
+        return re.findall(r"<loc>https://example.com/(.*?)</loc>", text)
+
+    def test_splits_into_index_and_rewrites_only_changed_chunks(self):
+        for name in ["a.html", "b.html", "c.html", "d.html"]:
+            self._add(name)
+        self.assertEqual(self.sitemap.save(), 3)
+        self.assertEqual(self._locs("sitemap.xml"), ["sitemap-1.xml", "sitemap-2.xml"])
+        self.assertEqual(self._locs("sitemap-2.xml"), ["c.html", "d.html"])
+
+        self._add("e.html")
+        written = [path for path, _text in self.sitemap.iter_files()]
+        self.assertEqual(written, [Path("sitemap.xml"), Path("sitemap-3.xml")])
+        self.sitemap.save()
+        self.assertEqual(self._locs("sitemap-3.xml"), ["e.html"])
+
+        for name in ["b.html", "c.html", "d.html", "e.html"]:
+            self.sitemap.remove(Path(name))
+        self.sitemap.save()
+        self.assertEqual(self._locs("sitemap.xml"), ["a.html"])
+        self.assertEqual(list(self.dir_dest.glob("sitemap-*.xml")), [])
+
+    def test_move_under_rekeys_pages(self):
+        self._add("blog/index.html")
+        self._add("blog/post.html")
+        self.sitemap.save()
+
+        self.sitemap.move_under(Path("blog"), Path("news"))
+        self.sitemap.save()
+
+        self.assertEqual(self._locs("sitemap.xml"), ["news/", "news/post.html"])
+
+    def test_feed_has_title_and_author(self):
+        self.sitemap.configure("https://example.com", ["blog"], 20)
+        (self.dir_dest / "blog").mkdir(parents=True)
+        (self.dir_dest / "blog/index.html").write_text(
+            "<title>Blog &amp; Notes</title>", encoding="utf-8"
+        )
+        self._add("blog/index.html")
+        self.sitemap.save()
+
+        feed = (self.dir_dest / "blog/feed.xml").read_text(encoding="utf-8")
+        self.assertIn("<title>Blog &amp; Notes</title>\n", feed)
+        self.assertIn("<author><name>example.com</name></author>", feed)
+
+        self.sitemap.configure("https://example.com", ["blog"], 20, "Posts", "Jane")
+        feed = self.sitemap.render_feed(Path("blog"))
+        self.assertIn("<title>Posts</title>\n", feed)
+        self.assertIn("<author><name>Jane</name></author>", feed)
+
+    def test_feed_without_pages_is_not_written(self):
+        self.sitemap.configure("https://example.com", ["blog"], 20)
+        self._add("index.html")
+        self.sitemap.save()
+
+        self.assertFalse((self.dir_dest / "blog/feed.xml").exists())
+        self.assertNotIn(Path("blog/feed.xml"), self.sitemap.list_files())
+
+        self._add("blog/post.html")
+        self.sitemap.save()
+        self.assertIn("<entry>", (self.dir_dest / "blog/feed.xml").read_text(encoding="utf-8"))
+
+        self.sitemap.remove(Path("blog/post.html"))
+        self.sitemap.save()
+        self.assertFalse((self.dir_dest / "blog/feed.xml").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()